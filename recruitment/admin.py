@@ -1,8 +1,168 @@
-from django.contrib import admin
+from django.contrib import admin, messages
 from django.contrib.auth.admin import UserAdmin
 from django.contrib.auth.models import User
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+from .matching import screen_pool
+from .models import Candidate, JobDescription, Match
+from .utils import score_stored_match, send_interview_emails, stored_jd_summary
 
 # Unregister the default User admin
 admin.site.unregister(User)
 # Register User with UserAdmin
-admin.site.register(User, UserAdmin)
\ No newline at end of file
+admin.site.register(User, UserAdmin)
+
+ACTION_BATCH_SIZE = 500
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator that uses PostgreSQL's planner estimate instead of COUNT(*) on large unfiltered tables."""
+
+    estimate_threshold = 10000
+
+    @cached_property
+    def count(self):
+        query = getattr(self.object_list, 'query', None)
+        if query is not None and not query.where and connections[self.object_list.db].vendor == 'postgresql':
+            with connections[self.object_list.db].cursor() as cursor:
+                cursor.execute(
+                    "SELECT reltuples::bigint FROM pg_class WHERE relname = %s",
+                    [self.object_list.model._meta.db_table],
+                )
+                row = cursor.fetchone()
+            if row and row[0] >= self.estimate_threshold:
+                return row[0]
+        return super().count
+
+
+class MatchScoreFilter(admin.SimpleListFilter):
+    """Filter on score bands; each band is a range scan on the indexed score column."""
+
+    title = 'match score'
+    parameter_name = 'score'
+    score_field = 'match_score'
+    bands = {
+        '90+': (90, None),
+        '70-89': (70, 90),
+        '50-69': (50, 70),
+        '<50': (None, 50),
+    }
+
+    def lookups(self, request, model_admin):
+        return [(band, band) for band in self.bands]
+
+    def queryset(self, request, queryset):
+        if self.value() not in self.bands:
+            return queryset
+        low, high = self.bands[self.value()]
+        if low is not None:
+            queryset = queryset.filter(**{f'{self.score_field}__gte': low})
+        if high is not None:
+            queryset = queryset.filter(**{f'{self.score_field}__lt': high})
+        return queryset
+
+
+class RecruitmentModelAdmin(admin.ModelAdmin):
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    list_per_page = 50
+    # Columns the changelist loads; the change form needs every field, and deferred ones cost a query each
+    changelist_fields = ()
+
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        if self.changelist_fields and request.resolver_match and request.resolver_match.url_name.endswith('_changelist'):
+            queryset = queryset.only(*self.changelist_fields)
+        return queryset
+
+    def _report_invitations(self, request, sent, failed):
+        if failed:
+            self.message_user(request, f"Sent {sent} interview invitations; {failed} failed.", messages.WARNING)
+        else:
+            self.message_user(request, f"Sent {sent} interview invitations.")
+
+
+@admin.register(JobDescription)
+class JobDescriptionAdmin(RecruitmentModelAdmin):
+    list_display = ('title', 'required_experience')
+    search_fields = ('title',)
+    filter_horizontal = ('must_have_skills',)
+    actions = ['screen_stored_pool']
+    changelist_fields = ('id', 'title', 'required_experience')
+
+    @admin.action(description='Screen stored candidates against selected job descriptions')
+    def screen_stored_pool(self, request, queryset):
+        scored = sum(screen_pool(job_description) for job_description in queryset)
+        self.message_user(request, f"Scored {scored} qualified candidates.")
+
+
+@admin.register(Candidate)
+class CandidateAdmin(RecruitmentModelAdmin):
+    list_display = ('name', 'email', 'job_title', 'match_score', 'is_shortlisted')
+    list_filter = ('is_shortlisted', 'job_title', MatchScoreFilter)
+    search_fields = ('name', 'email')
+    actions = ['send_interview_invitations']
+    changelist_fields = ('id', 'name', 'email', 'job_title', 'match_score', 'is_shortlisted')
+
+    @admin.action(description='Send interview invitations to selected candidates')
+    def send_interview_invitations(self, request, queryset):
+        recipients = queryset.values_list('email', 'name', 'job_title').iterator(chunk_size=ACTION_BATCH_SIZE)
+        sent, failed = send_interview_emails(recipients)
+        self._report_invitations(request, sent, failed)
+
+
+@admin.register(Match)
+class MatchAdmin(RecruitmentModelAdmin):
+    list_display = ('candidate_name', 'job_title', 'match_score')
+    list_filter = ('job_description', MatchScoreFilter)
+    list_select_related = ('candidate', 'job_description')
+    raw_id_fields = ('candidate', 'job_description')
+    actions = ['rescore_matches', 'send_interview_invitations']
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('candidate', 'job_description').only(
+            'id', 'match_score', 'candidate', 'job_description',
+            'candidate__name', 'candidate__email', 'job_description__title',
+        )
+
+    @admin.display(description='Candidate', ordering='candidate__name')
+    def candidate_name(self, obj):
+        return obj.candidate.name
+
+    @admin.display(description='Job', ordering='job_description__title')
+    def job_title(self, obj):
+        return obj.job_description.title
+
+    @admin.action(description='Rescore selected matches locally')
+    def rescore_matches(self, request, queryset):
+        matches = Match.objects.filter(pk__in=queryset.values('pk')).select_related(
+            'candidate', 'job_description'
+        ).only(
+            'id', 'match_score', 'candidate', 'job_description',
+            'candidate__cv_text', 'candidate__skills',
+            'job_description__title', 'job_description__summary', 'job_description__required_skills',
+        )
+        jd_summaries = {}  # Job description id -> summary, built once per JD
+        batch = []
+        updated = 0
+        for match in matches.iterator(chunk_size=ACTION_BATCH_SIZE):
+            if match.job_description_id not in jd_summaries:
+                jd_summaries[match.job_description_id] = stored_jd_summary(match.job_description)
+            match.match_score = score_stored_match(match.candidate, jd_summaries[match.job_description_id])
+            batch.append(match)
+            if len(batch) >= ACTION_BATCH_SIZE:
+                updated += Match.objects.bulk_update(batch, ['match_score'])
+                batch = []
+        if batch:
+            updated += Match.objects.bulk_update(batch, ['match_score'])
+        self.message_user(request, f"Rescored {updated} matches.")
+
+    @admin.action(description='Send interview invitations for selected matches')
+    def send_interview_invitations(self, request, queryset):
+        recipients = queryset.values_list(
+            'candidate__email', 'candidate__name', 'job_description__title'
+        ).iterator(chunk_size=ACTION_BATCH_SIZE)
+        sent, failed = send_interview_emails(recipients)
+        self._report_invitations(request, sent, failed)
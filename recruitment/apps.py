@@ -1,6 +1,28 @@
+import time
+
 from django.apps import AppConfig
 
+# Taken when Django imports the app configs, i.e. at the start of app loading
+_loading_started = time.monotonic()
+
 
 class RecruitmentConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'recruitment'
+
+    def ready(self):
+        import logging
+
+        from django.conf import settings
+        from django.db.backends.signals import connection_created
+
+        from .fields import register_sqlite_functions
+        from .warmup import FirstRequestTimer, start_background_warm_up
+
+        logging.getLogger(__name__).debug(
+            f"Recruitment app ready {(time.monotonic() - _loading_started) * 1000:.0f} ms after app loading started"
+        )
+        connection_created.connect(register_sqlite_functions, dispatch_uid='recruitment_sqlite_functions')
+        FirstRequestTimer(_loading_started).connect()
+        if settings.WARMUP_ON_STARTUP:
+            start_background_warm_up()
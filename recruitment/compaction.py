@@ -0,0 +1,166 @@
+import functools
+import logging
+import math
+import re
+import threading
+from collections import Counter
+
+logger = logging.getLogger(__name__)
+
+# Section headings in priority order; anything before the first heading is the
+# preamble (name, contact details, job title) and is always kept first.
+CV_SECTION_PRIORITY = (
+    ('skills', r'(technical\s+)?skills|core\s+competencies|technologies|tech\s+stack'),
+    ('experience', r'(work|professional|employment)?\s*experience|employment\s+history|work\s+history'),
+    ('education', r'education|academic\s+(background|qualifications)|qualifications'),
+    ('certifications', r'certifications?|licen[cs]es|courses'),
+    ('summary', r'(professional\s+)?summary|profile|objective|about\s+me'),
+    ('projects', r'projects|publications|achievements|awards'),
+    ('other', r'interests|hobbies|languages|references|declaration|personal\s+details'),
+)
+
+JD_SECTION_PRIORITY = (
+    ('requirements', r'requirements|qualifications|what\s+you\s+(need|bring)|must\s+have|skills'),
+    ('experience', r'experience'),
+    ('responsibilities', r'responsibilities|duties|what\s+you\s*(\'ll)?\s+do|role|the\s+job'),
+    ('nice_to_have', r'nice\s+to\s+have|preferred|bonus|good\s+to\s+have'),
+    ('about', r'about\s+(us|the\s+company)|who\s+we\s+are|company\s+overview'),
+    ('benefits', r'benefits|perks|what\s+we\s+offer|compensation'),
+    ('legal', r'equal\s+opportunity|eeo|disclaimer|privacy'),
+)
+
+PAGE_BREAK = '\f'  # Separates pages in extracted PDF text
+PAGE_NUMBER_RE = re.compile(r'^\s*(page\s*)?\d+\s*(of\s*\d+)?\s*$', re.IGNORECASE)
+PAGE_EDGE_LINES = 3  # Lines at the top and bottom of a page where headers and footers live
+MAX_HEADING_LENGTH = 40
+MIN_PARTIAL_TOKENS = 40
+
+_stats_lock = threading.Lock()
+_stats = {'documents': 0, 'original_tokens': 0, 'prompt_tokens': 0}
+
+
+def estimate_tokens(text):
+    """Estimate Gemini tokens locally (~4 characters per token for English text)."""
+    return math.ceil(len(text) / 4)
+
+
+def normalize_whitespace(text):
+    """Collapse PDF extraction whitespace and drop empty lines."""
+    lines = []
+    for line in text.splitlines():
+        line = re.sub(r'[ \t\u00a0]+', ' ', line).strip()
+        if line:
+            lines.append(line)
+    return lines
+
+
+def remove_repeated_lines(pages):
+    """Join pages of lines, dropping page numbers and running headers and footers.
+
+    Only lines at the top or bottom of a page are considered: a short line found
+    there on several pages is kept once, and lines repeated in the body of the
+    text (e.g. the same job title under two employers) are left alone.
+    """
+    edges = [set(page[:PAGE_EDGE_LINES] + page[-PAGE_EDGE_LINES:]) for page in pages]
+    counts = Counter(line for page_edges in edges for line in page_edges if len(line) <= 100)
+    seen = set()
+    kept = []
+    for page in pages:
+        for index, line in enumerate(page):
+            if index < PAGE_EDGE_LINES or index >= len(page) - PAGE_EDGE_LINES:
+                if PAGE_NUMBER_RE.match(line):
+                    continue
+                if counts.get(line, 0) > 1:
+                    if line in seen:
+                        continue
+                    seen.add(line)
+            kept.append(line)
+    return kept
+
+
+@functools.lru_cache(maxsize=None)
+def heading_patterns(section_priority):
+    """Compile the heading regexes of a section priority table once per process."""
+    return [
+        (name, re.compile(rf'^\W*({pattern})\W*$', re.IGNORECASE))
+        for name, pattern in section_priority
+    ]
+
+
+def split_sections(lines, section_priority):
+    """Split lines into (section name, lines) chunks on recognised headings."""
+    patterns = heading_patterns(tuple(section_priority))
+    sections = [('preamble', [])]
+    for line in lines:
+        name = None
+        if len(line) <= MAX_HEADING_LENGTH:
+            name = next((n for n, regex in patterns if regex.match(line)), None)
+        if name:
+            sections.append((name, [line]))
+        else:
+            sections[-1][1].append(line)
+    return [(name, body) for name, body in sections if body]
+
+
+def _truncate_lines(lines, budget):
+    """Keep leading lines of a section that fit in the token budget."""
+    kept = []
+    used = 0
+    for line in lines:
+        cost = estimate_tokens(line) + 1
+        if used + cost > budget:
+            # Cut the overflowing line at the character level rather than losing it
+            room = (budget - used - 1) * 4
+            if room > 0:
+                kept.append(line[:room])
+            break
+        kept.append(line)
+        used += cost
+    return kept
+
+
+def compact_text(text, token_budget, section_priority):
+    """Compact extracted text to fit a token budget, keeping high-signal sections first.
+
+    Returns the compacted text and a dict with the original and compacted token counts.
+    """
+    # Split pages first: splitlines() would treat the page break as a plain line break
+    lines = remove_repeated_lines([normalize_whitespace(page) for page in text.split(PAGE_BREAK)])
+    sections = split_sections(lines, section_priority)
+    priority = {'preamble': -1}
+    priority.update({name: rank for rank, (name, _) in enumerate(section_priority)})
+
+    selected = {}
+    remaining = token_budget
+    for index in sorted(range(len(sections)), key=lambda i: (priority[sections[i][0]], i)):
+        body = sections[index][1]
+        cost = estimate_tokens('\n'.join(body)) + 1
+        if cost <= remaining:
+            selected[index] = body
+            remaining -= cost
+        elif remaining >= MIN_PARTIAL_TOKENS:
+            # Keep the head of an oversized section; later, cheaper sections may still fit
+            partial = _truncate_lines(body, remaining)
+            if partial:
+                selected[index] = partial
+                remaining -= estimate_tokens('\n'.join(partial)) + 1
+
+    compacted = '\n'.join('\n'.join(selected[i]) for i in sorted(selected))
+    stats = {
+        'original_tokens': estimate_tokens(text),
+        'prompt_tokens': estimate_tokens(compacted),
+    }
+    with _stats_lock:
+        _stats['documents'] += 1
+        _stats['original_tokens'] += stats['original_tokens']
+        _stats['prompt_tokens'] += stats['prompt_tokens']
+    logger.debug("Compacted text from %s to %s tokens", stats['original_tokens'], stats['prompt_tokens'])
+    return compacted, stats
+
+
+def compaction_stats():
+    """Cumulative compaction totals for monitoring."""
+    with _stats_lock:
+        stats = dict(_stats)
+    stats['tokens_saved'] = stats['original_tokens'] - stats['prompt_tokens']
+    return stats
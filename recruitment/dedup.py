@@ -0,0 +1,128 @@
+import hashlib
+import logging
+import random
+import re
+import zlib
+from array import array
+from collections import defaultdict
+
+from django.conf import settings
+from django.db.models import Q
+
+from .models import Candidate, CandidateLSHBucket
+
+logger = logging.getLogger(__name__)
+
+NUM_PERMUTATIONS = 128
+LSH_BANDS = 16
+LSH_ROWS = NUM_PERMUTATIONS // LSH_BANDS  # Similarity threshold ~ (1/16)^(1/8) = 0.71
+SHINGLE_SIZE = 5
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+_rng = random.Random(0x5EED)
+_PERMUTATIONS = [
+    (_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+    for _ in range(NUM_PERMUTATIONS)
+]
+
+
+def _shingles(text):
+    """Hash word k-shingles of normalized text to 32-bit integers."""
+    words = re.findall(r'\w+', text.lower())
+    if len(words) < SHINGLE_SIZE:
+        return {zlib.crc32(' '.join(words).encode())} if words else set()
+    return {
+        zlib.crc32(' '.join(words[i:i + SHINGLE_SIZE]).encode())
+        for i in range(len(words) - SHINGLE_SIZE + 1)
+    }
+
+
+def minhash_signature(text):
+    """Compute the MinHash signature of a document, or None if it has no words."""
+    shingles = _shingles(text)
+    if not shingles:
+        return None
+    return [
+        min(((a * x + b) % _MERSENNE_PRIME) & _MAX_HASH for x in shingles)
+        for a, b in _PERMUTATIONS
+    ]
+
+
+def signature_to_bytes(signature):
+    return array('I', signature).tobytes()
+
+
+def signature_from_bytes(data):
+    signature = array('I')
+    signature.frombytes(bytes(data))
+    return signature.tolist()
+
+
+def estimate_similarity(sig_a, sig_b):
+    """Estimate Jaccard similarity from two MinHash signatures."""
+    return sum(1 for a, b in zip(sig_a, sig_b) if a == b) / NUM_PERMUTATIONS
+
+
+def lsh_buckets(signature):
+    """Return the (band, bucket) keys of a signature as signed 64-bit integers."""
+    buckets = []
+    for band in range(LSH_BANDS):
+        rows = signature[band * LSH_ROWS:(band + 1) * LSH_ROWS]
+        digest = hashlib.blake2b(array('I', rows).tobytes(), digest_size=8).digest()
+        buckets.append((band, int.from_bytes(digest, 'big', signed=True)))
+    return buckets
+
+
+class MinHashLSH:
+    """In-memory LSH index, used to catch near-duplicates within one upload batch."""
+
+    def __init__(self, threshold):
+        self.threshold = threshold
+        self.signatures = {}
+        self.buckets = defaultdict(set)
+
+    def query(self, signature):
+        """Return keys of indexed signatures at or above the similarity threshold."""
+        candidates = set()
+        for bucket in lsh_buckets(signature):
+            candidates.update(self.buckets.get(bucket, ()))
+        return [
+            key for key in candidates
+            if estimate_similarity(signature, self.signatures[key]) >= self.threshold
+        ]
+
+    def add(self, key, signature):
+        self.signatures[key] = signature
+        for bucket in lsh_buckets(signature):
+            self.buckets[bucket].add(key)
+
+
+def _duplicate_lookup(signature, job_title):
+    bucket_filter = Q()
+    for band, bucket in lsh_buckets(signature):
+        bucket_filter |= Q(band=band, bucket=bucket)
+    candidate_ids = CandidateLSHBucket.objects.filter(bucket_filter).values('candidate_id')
+    return Candidate.objects.filter(id__in=candidate_ids, job_title=job_title).only(
+        'id', 'name', 'email', 'match_score', 'is_shortlisted', 'minhash'
+    )
+
+
+async def afind_duplicate_candidate(signature, job_title):
+    """Find an already screened near-duplicate CV for the same job, via the LSH bucket index."""
+    best, best_score = None, settings.CV_DUPLICATE_THRESHOLD
+    async for candidate in _duplicate_lookup(signature, job_title):
+        if candidate.minhash is None:
+            continue
+        score = estimate_similarity(signature, signature_from_bytes(candidate.minhash))
+        if score >= best_score:
+            best, best_score = candidate, score
+    return best
+
+
+async def aindex_candidate(candidate, signature):
+    """Store a candidate's LSH buckets so later uploads can find it."""
+    await CandidateLSHBucket.objects.abulk_create([
+        CandidateLSHBucket(candidate=candidate, band=band, bucket=bucket)
+        for band, bucket in lsh_buckets(signature)
+    ])
@@ -0,0 +1,156 @@
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.handlers.asgi import ASGIRequest
+from django.http import FileResponse, HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import content_disposition_header, http_date, parse_http_date_safe
+
+DOWNLOAD_BLOCK_SIZE = 64 * 1024
+OFFLOAD_MODES = ('', 'x-accel-redirect', 'x-sendfile')
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+def file_etag(stat):
+    # Same format as nginx, so revalidation keeps working when downloads are offloaded
+    return f'"{int(stat.st_mtime):x}-{stat.st_size:x}"'
+
+
+def parse_range(header, size):
+    """Parse a single 'bytes=' range into inclusive (start, end) offsets.
+
+    Returns None when the header should be ignored (absent, malformed or
+    multiple ranges) and raises ValueError when the range is unsatisfiable.
+    """
+    match = RANGE_RE.match(header.strip()) if header else None
+    if not match or match.groups() == ('', ''):
+        return None
+    first, last = match.groups()
+    if not first:
+        # Suffix range: the last N bytes
+        if int(last) == 0 or size == 0:
+            raise ValueError(header)
+        return max(size - int(last), 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if last and int(last) < start:
+        return None
+    if start >= size:
+        raise ValueError(header)
+    return start, end
+
+
+def _if_range_matches(request, etag, last_modified):
+    if_range = request.headers.get('If-Range')
+    if not if_range:
+        return True
+    if if_range.startswith(('"', 'W/')):
+        # Weak validators never match If-Range
+        return if_range == etag
+    return parse_http_date_safe(if_range) == last_modified
+
+
+class RangeFile:
+    """Read-only view of `length` bytes of an open file, starting at `start`."""
+
+    def __init__(self, file, start, length):
+        file.seek(start)
+        self.file = file
+        self.remaining = length
+
+    def read(self, size=-1):
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size) if size else b''
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.file.close()
+
+
+async def aread_chunks(file, block_size=DOWNLOAD_BLOCK_SIZE):
+    """Read a file in blocks on worker threads for an async (ASGI) response."""
+    read = sync_to_async(file.read, thread_sensitive=False)
+    while True:
+        chunk = await read(block_size)
+        if not chunk:
+            break
+        yield chunk
+
+
+def _offload_response(path, name, filename, content_type, as_attachment):
+    mode = settings.CV_DOWNLOAD_OFFLOAD
+    response = HttpResponse(content_type=content_type)
+    response['Content-Disposition'] = content_disposition_header(as_attachment, filename)
+    if mode == 'x-accel-redirect':
+        response['X-Accel-Redirect'] = settings.CV_DOWNLOAD_ACCEL_PREFIX.rstrip('/') + '/' + quote(name)
+    else:
+        response['X-Sendfile'] = os.fsdecode(path)
+    return response
+
+
+def serve_file(request, path, name, as_attachment=False):
+    """Serve a stored file with caching validators and byte ranges.
+
+    path is the absolute file path and name its storage name (used for
+    X-Accel-Redirect). With CV_DOWNLOAD_OFFLOAD set, the proxy sends the bytes
+    and handles ranges; otherwise the file is streamed in blocks.
+    """
+    if settings.CV_DOWNLOAD_OFFLOAD not in OFFLOAD_MODES:
+        raise ImproperlyConfigured(
+            f"CV_DOWNLOAD_OFFLOAD must be one of {', '.join(repr(mode) for mode in OFFLOAD_MODES)}"
+        )
+    stat = os.stat(path)
+    etag = file_etag(stat)
+    last_modified = int(stat.st_mtime)
+    filename = os.path.basename(name)
+    content_type = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        if settings.CV_DOWNLOAD_OFFLOAD:
+            response = _offload_response(path, name, filename, content_type, as_attachment)
+        else:
+            response = _file_response(request, path, stat.st_size, etag, last_modified, filename, content_type, as_attachment)
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    response['Accept-Ranges'] = 'bytes'
+    patch_cache_control(response, private=True, max_age=settings.CV_DOWNLOAD_MAX_AGE)
+    return response
+
+
+def _file_response(request, path, size, etag, last_modified, filename, content_type, as_attachment):
+    try:
+        byte_range = parse_range(request.headers.get('Range'), size)
+    except ValueError:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+        return response
+    if byte_range is not None and not _if_range_matches(request, etag, last_modified):
+        byte_range = None
+    start, end = byte_range or (0, size - 1)
+    length = end - start + 1 if size else 0
+
+    if request.method == 'HEAD':
+        response = HttpResponse(content_type=content_type)
+    else:
+        file = open(path, 'rb')
+        if byte_range is not None:
+            file = RangeFile(file, start, length)
+        response = FileResponse(file, as_attachment=as_attachment, filename=filename, content_type=content_type)
+        response.block_size = DOWNLOAD_BLOCK_SIZE
+        if isinstance(request, ASGIRequest):
+            # A synchronous file iterator would be read into memory in full before an ASGI response starts;
+            # the file itself is still closed by the response
+            response.streaming_content = aread_chunks(file)
+    response['Content-Length'] = length
+    if byte_range is not None:
+        response.status_code = 206
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    return response
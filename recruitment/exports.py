@@ -0,0 +1,117 @@
+import csv
+import datetime
+import json
+import logging
+
+from asgiref.sync import sync_to_async
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+
+from .models import Candidate
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FIELDS = (
+    'id', 'name', 'email', 'job_title', 'match_score', 'is_shortlisted',
+    'experience', 'skills', 'education', 'certifications', 'created_at',
+)
+EXPORT_CHUNK_SIZE = 2000  # Rows fetched per database round trip
+EXPORT_BUFFER_SIZE = 64 * 1024  # Characters per chunk handed to the server
+# Spreadsheet apps run cells starting with these as formulas; CSV cells get a leading quote
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+EXPORT_FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'jsonl': 'application/x-ndjson; charset=utf-8',
+}
+
+
+def _start_of_day(day):
+    return timezone.make_aware(datetime.datetime.combine(day, datetime.time.min))
+
+
+def export_queryset(job_title=None, since=None, until=None, shortlisted=None):
+    """Filter candidates for export in SQL; since and until are inclusive dates.
+
+    Returns tuples rather than model instances, in primary key order.
+    """
+    candidates = Candidate.objects.all()
+    if job_title:
+        candidates = candidates.filter(job_title=job_title)
+    # Compare against datetimes rather than created_at__date so the index is used
+    if since:
+        candidates = candidates.filter(created_at__gte=_start_of_day(since))
+    if until:
+        candidates = candidates.filter(created_at__lt=_start_of_day(until + datetime.timedelta(days=1)))
+    if shortlisted is not None:
+        candidates = candidates.filter(is_shortlisted=shortlisted)
+    return candidates.order_by('id').values_list(*EXPORT_FIELDS)
+
+
+def _buffered(lines, size=EXPORT_BUFFER_SIZE):
+    """Join small lines into chunks of roughly size characters."""
+    buffer = []
+    buffered = 0
+    for line in lines:
+        buffer.append(line)
+        buffered += len(line)
+        if buffered >= size:
+            yield ''.join(buffer)
+            buffer = []
+            buffered = 0
+    if buffer:
+        yield ''.join(buffer)
+
+
+def _export_value(value):
+    if isinstance(value, datetime.datetime):
+        return value.isoformat()
+    return value
+
+
+def _csv_value(value):
+    value = _export_value(value)
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+class _Echo:
+    """File-like object whose write() hands the formatted line back to csv.writer's caller."""
+
+    def write(self, value):
+        return value
+
+
+def _csv_lines(rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(EXPORT_FIELDS)
+    for row in rows:
+        yield writer.writerow([_csv_value(value) for value in row])
+
+
+def _jsonl_lines(rows):
+    for row in rows:
+        yield json.dumps(dict(zip(EXPORT_FIELDS, row)), cls=DjangoJSONEncoder) + '\n'
+
+
+def export_chunks(queryset, export_format, chunk_size=EXPORT_CHUNK_SIZE):
+    """Yield the export as text chunks, holding at most one fetch of rows in memory."""
+    lines = {'csv': _csv_lines, 'jsonl': _jsonl_lines}[export_format]
+    rows = queryset.iterator(chunk_size=chunk_size)
+    yield from _buffered(lines(rows))
+    logger.info("Finished %s candidate export", export_format)
+
+
+async def aexport_chunks(chunks):
+    """Serve a synchronous chunk generator from an async (ASGI) response.
+
+    Each chunk is pulled on the request's database thread, so the streaming
+    cursor is never shared across threads and rows are never buffered in full.
+    """
+    finished = object()
+    pull = sync_to_async(next, thread_sensitive=True)
+    while True:
+        chunk = await pull(chunks, finished)
+        if chunk is finished:
+            break
+        yield chunk
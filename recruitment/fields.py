@@ -0,0 +1,79 @@
+import zlib
+
+from django.db import models, transaction
+
+COMPRESSION_LEVEL = 6
+
+
+def stores_compressed(connection):
+    # PostgreSQL already compresses large text values and moves them out of the
+    # table (TOAST), and its full-text trigger needs the plain text
+    return connection.vendor != 'postgresql'
+
+
+def inflate(value):
+    """Decode a stored CompressedTextField value; plain text from before compression passes through."""
+    if isinstance(value, (bytes, memoryview)):
+        return zlib.decompress(value).decode()
+    return value
+
+
+def register_sqlite_functions(sender, connection, **kwargs):
+    """connection_created receiver: lets SQLite triggers read compressed text as inflate(column)."""
+    if connection.vendor == 'sqlite':
+        connection.connection.create_function('inflate', 1, inflate, deterministic=True)
+
+
+class CompressedTextField(models.TextField):
+    """Text field stored zlib-compressed in a binary column; reads and writes str."""
+
+    def db_type(self, connection):
+        if stores_compressed(connection):
+            return connection.data_types['BinaryField']
+        return super().db_type(connection)
+
+    def get_db_prep_value(self, value, connection, prepared=False):
+        value = super().get_db_prep_value(value, connection, prepared)
+        if value is None or not stores_compressed(connection):
+            return value
+        return connection.Database.Binary(zlib.compress(value.encode(), COMPRESSION_LEVEL))
+
+    def from_db_value(self, value, expression, connection):
+        return inflate(value)
+
+
+def convert_stored_text(connection, table, column, compress=True, batch_size=500):
+    """Compress a column's plain-text values in place (or inflate compressed ones when compress is False).
+
+    Works on raw rows in id order, so it can be rerun after an interruption:
+    values already in the target form are skipped. Returns (rows converted,
+    bytes before, bytes after).
+    """
+    table, column = connection.ops.quote_name(table), connection.ops.quote_name(column)
+    converted = size_before = size_after = 0
+    last_id = 0
+    while True:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT id, {column} FROM {table} WHERE id > %s ORDER BY id LIMIT %s", [last_id, batch_size]
+            )
+            rows = cursor.fetchall()
+        if not rows:
+            return converted, size_before, size_after
+        last_id = rows[-1][0]
+        updates = []
+        for row_id, value in rows:
+            if compress and isinstance(value, str):
+                stored = zlib.compress(value.encode(), COMPRESSION_LEVEL)
+                updates.append((connection.Database.Binary(stored), row_id))
+                size_before += len(value.encode())
+                size_after += len(stored)
+            elif not compress and isinstance(value, (bytes, memoryview)):
+                text = inflate(value)
+                updates.append((text, row_id))
+                size_before += len(value)
+                size_after += len(text.encode())
+        if updates:
+            with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+                cursor.executemany(f"UPDATE {table} SET {column} = %s WHERE id = %s", updates)
+            converted += len(updates)
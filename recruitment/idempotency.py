@@ -0,0 +1,70 @@
+import hashlib
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError
+from django.utils import timezone
+
+from .models import ScreeningRequest
+
+logger = logging.getLogger(__name__)
+
+
+class IdempotencyConflict(Exception):
+    """The key is in use by a request that is still running, or was used with a different payload."""
+
+    def __init__(self, message, status_code):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def request_fingerprint(parts):
+    """Hash the parts that identify a request payload (strings or bytes) into a hex digest."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part if isinstance(part, bytes) else str(part).encode())
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+async def aclaim_key(user, key, fingerprint):
+    """Reserve an idempotency key for a new request.
+
+    Returns None when the caller should go ahead and process the request, or
+    the completed ScreeningRequest whose stored response should be replayed.
+    Raises IdempotencyConflict if the key is busy or belongs to another payload.
+    """
+    for _ in range(2):
+        try:
+            await ScreeningRequest.objects.acreate(user=user, idempotency_key=key, fingerprint=fingerprint)
+            return None
+        except IntegrityError:
+            pass
+        existing = await ScreeningRequest.objects.filter(user=user, idempotency_key=key).afirst()
+        if existing is None:
+            continue  # Released between our insert and lookup
+        if existing.fingerprint != fingerprint:
+            raise IdempotencyConflict('Idempotency key was already used with a different request', 422)
+        if existing.status_code is not None:
+            logger.info("Replaying screening request %s for user %s", key, user.pk)
+            return existing
+        stale_before = timezone.now() - timedelta(seconds=settings.SCREENING_IDEMPOTENCY_LOCK_TIMEOUT)
+        if existing.created_at >= stale_before:
+            raise IdempotencyConflict('A request with this idempotency key is still in progress', 409)
+        # The worker that claimed the key died; let this retry take it over
+        logger.warning("Taking over abandoned screening request %s for user %s", key, user.pk)
+        await ScreeningRequest.objects.filter(pk=existing.pk, status_code__isnull=True).adelete()
+    raise IdempotencyConflict('A request with this idempotency key is still in progress', 409)
+
+
+async def acomplete_key(user, key, status_code, response):
+    """Store the response for a claimed key so retries replay it."""
+    await ScreeningRequest.objects.filter(user=user, idempotency_key=key).aupdate(
+        status_code=status_code, response=response
+    )
+
+
+async def arelease_key(user, key):
+    """Drop an unfinished claim after a failure, so the client can retry."""
+    await ScreeningRequest.objects.filter(user=user, idempotency_key=key, status_code__isnull=True).adelete()
@@ -0,0 +1,224 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(Exception):
+    """Raised when the circuit breaker rejects a call without contacting Gemini."""
+
+
+def _wake(future):
+    if not future.done():
+        future.set_result(None)
+
+
+class AIMDLimiter:
+    """Additive-increase/multiplicative-decrease limit on in-flight LLM calls.
+
+    Every call completing within the latency target grows the limit by
+    1/limit (about +1 per full window of calls); a throttled call halves it.
+    Shared by threads and event loops, so sync and async callers see one limit.
+    """
+
+    def __init__(self, initial_limit, min_limit, max_limit, latency_target, decrease_factor=0.5):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_target = latency_target
+        self.decrease_factor = decrease_factor
+        self.limit = float(min(max(initial_limit, min_limit), max_limit))
+        self.in_flight = 0
+        self.throttled = 0
+        self.completed = 0
+        self.last_latency = None
+        self._cond = threading.Condition()
+        self._async_waiters = deque()
+
+    def _has_capacity(self):
+        return self.in_flight < int(self.limit)
+
+    def acquire(self):
+        """Block the calling thread until a slot is free."""
+        with self._cond:
+            while not self._has_capacity():
+                self._cond.wait()
+            self.in_flight += 1
+
+    async def acquire_async(self):
+        """Wait for a slot without blocking the event loop."""
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._cond:
+                if self._has_capacity():
+                    self.in_flight += 1
+                    return
+                waiter = (loop, loop.create_future())
+                self._async_waiters.append(waiter)
+            try:
+                await waiter[1]
+            except asyncio.CancelledError:
+                with self._cond:
+                    if waiter in self._async_waiters:
+                        self._async_waiters.remove(waiter)
+                    else:
+                        # release() already handed this waiter a slot; pass the wakeup on
+                        self._wake_async_waiters()
+                raise
+
+    def _wake_async_waiters(self):
+        # Called with self._cond held
+        free = int(self.limit) - self.in_flight
+        while free > 0 and self._async_waiters:
+            loop, future = self._async_waiters.popleft()
+            loop.call_soon_threadsafe(_wake, future)
+            free -= 1
+
+    def release(self, latency=None, throttled=False):
+        """Free a slot and adapt the limit from the call's outcome."""
+        with self._cond:
+            self.in_flight -= 1
+            self.completed += 1
+            self.last_latency = latency
+            if throttled:
+                self.throttled += 1
+                self.limit = max(self.min_limit, self.limit * self.decrease_factor)
+                logger.warning("LLM throttled; concurrency limit cut to %s", int(self.limit))
+            elif latency is not None and latency <= self.latency_target:
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            self._cond.notify_all()
+            self._wake_async_waiters()
+
+    def abandon(self):
+        """Free the slot of a call that never reached Gemini, without counting it."""
+        with self._cond:
+            self.in_flight -= 1
+            self._cond.notify_all()
+            self._wake_async_waiters()
+
+    def state(self):
+        with self._cond:
+            return {
+                'limit': int(self.limit),
+                'in_flight': self.in_flight,
+                'waiting_async': len(self._async_waiters),
+                'completed': self.completed,
+                'throttled': self.throttled,
+                'last_latency': self.last_latency,
+            }
+
+
+class CircuitBreaker:
+    """Fail fast once the recent LLM error rate crosses a threshold.
+
+    Closed: calls flow and outcomes are recorded in a rolling window.
+    Open: calls are rejected until reset_timeout has passed.
+    Half-open: a single trial call decides whether to close or re-open.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, error_rate_threshold, min_calls, window_size, reset_timeout):
+        self.error_rate_threshold = error_rate_threshold
+        self.min_calls = min_calls
+        self.reset_timeout = reset_timeout
+        self.outcomes = deque(maxlen=window_size)
+        self.status = self.CLOSED
+        self.opened_at = None
+        self.rejected = 0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def _error_rate(self):
+        if not self.outcomes:
+            return 0.0
+        return self.outcomes.count(False) / len(self.outcomes)
+
+    def allow(self):
+        """Return True if a call may proceed, moving open -> half-open after the timeout."""
+        with self._lock:
+            if self.status == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.status = self.HALF_OPEN
+                self._trial_in_flight = False
+            if self.status == self.CLOSED:
+                return True
+            if self.status == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            if self.status == self.HALF_OPEN:
+                logger.info("LLM circuit breaker closed")
+                self.status = self.CLOSED
+                self.outcomes.clear()
+            self.outcomes.append(True)
+
+    def record_failure(self):
+        with self._lock:
+            self.outcomes.append(False)
+            if self.status == self.HALF_OPEN or (
+                len(self.outcomes) >= self.min_calls and self._error_rate() >= self.error_rate_threshold
+            ):
+                if self.status != self.OPEN:
+                    logger.error("LLM circuit breaker opened (error rate %.0f%%)", self._error_rate() * 100)
+                self.status = self.OPEN
+                self.opened_at = time.monotonic()
+                self._trial_in_flight = False
+
+    def abandon(self):
+        """Forget an allowed call that finished without an outcome."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def state(self):
+        with self._lock:
+            return {
+                'status': self.status,
+                'error_rate': round(self._error_rate(), 3),
+                'window_calls': len(self.outcomes),
+                'rejected': self.rejected,
+            }
+
+
+_limiter = None
+_breaker = None
+_lock = threading.Lock()
+
+
+def get_llm_limiter():
+    """Return the process-wide AIMD limiter built from settings."""
+    global _limiter
+    if _limiter is None:
+        with _lock:
+            if _limiter is None:
+                _limiter = AIMDLimiter(
+                    settings.GEMINI_INITIAL_CONCURRENCY,
+                    settings.GEMINI_MIN_CONCURRENCY,
+                    settings.GEMINI_MAX_CONCURRENCY,
+                    settings.GEMINI_LATENCY_TARGET,
+                )
+    return _limiter
+
+
+def get_circuit_breaker():
+    """Return the process-wide LLM circuit breaker built from settings."""
+    global _breaker
+    if _breaker is None:
+        with _lock:
+            if _breaker is None:
+                _breaker = CircuitBreaker(
+                    settings.GEMINI_BREAKER_ERROR_RATE,
+                    settings.GEMINI_BREAKER_MIN_CALLS,
+                    settings.GEMINI_BREAKER_WINDOW,
+                    settings.GEMINI_BREAKER_RESET_TIMEOUT,
+                )
+    return _breaker
@@ -0,0 +1,305 @@
+import asyncio
+import json
+import logging
+import re
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+QUOTA_WINDOW_SECONDS = 60
+SERVER_ERROR_COOLDOWN_FACTOR = 0.2
+STATUS_PREFIX_RE = re.compile(r'^([1-5]\d\d) ')
+
+
+class PoolExhaustedError(Exception):
+    """Raised when every key/model combination is cooling down or failing.
+
+    last_error is the last upstream error, or None when no call was made
+    because every key was out of local per-minute quota.
+    """
+
+    def __init__(self, message, last_error=None):
+        super().__init__(message)
+        self.last_error = last_error
+
+
+def _status_code(exc):
+    """Best-effort HTTP status code of a Gemini SDK exception.
+
+    Uses the exception's code, else the "503 Service unavailable" style prefix
+    that google.api_core errors start with; numbers elsewhere in the message
+    (token counts, quota limits, request ids) are ignored.
+    """
+    code = getattr(exc, 'code', None)
+    if isinstance(code, int):
+        return code
+    match = STATUS_PREFIX_RE.match(str(exc))
+    return int(match.group(1)) if match else None
+
+
+def _is_auth_error(exc, status):
+    """True when Gemini rejected the key itself (invalid, revoked or not permitted)."""
+    return status in (401, 403) or (status == 400 and 'API_KEY_INVALID' in str(exc))
+
+
+class KeyState:
+    """Usage and health bookkeeping for a single API key."""
+
+    def __init__(self, api_key, requests_per_minute):
+        self.api_key = api_key
+        self.requests_per_minute = requests_per_minute
+        self.recent_requests = deque()
+        self.cooldown_until = {}  # model name -> monotonic timestamp
+        self.disabled_until = 0  # Every model, after the key itself was rejected
+        self.successes = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.last_error = ''
+        self._client = None
+        self._async_clients = {}  # event loop -> (client, closer)
+
+    @property
+    def label(self):
+        return f"...{self.api_key[-4:]}"
+
+    def remaining(self, now):
+        while self.recent_requests and now - self.recent_requests[0] > QUOTA_WINDOW_SECONDS:
+            self.recent_requests.popleft()
+        return self.requests_per_minute - len(self.recent_requests)
+
+    def is_available(self, model_name, now):
+        return (
+            self.disabled_until <= now
+            and self.cooldown_until.get(model_name, 0) <= now
+            and self.remaining(now) > 0
+        )
+
+    def client(self):
+        if self._client is None:
+            import google.ai.generativelanguage as glm
+            self._client = glm.GenerativeServiceClient(client_options={'api_key': self.api_key})
+        return self._client
+
+    async def async_client(self):
+        """Return this key's async client for the running event loop.
+
+        gRPC aio channels are bound to the loop that created them. Under WSGI,
+        async_to_sync runs every request in a new loop, so each channel is
+        closed when its loop shuts down instead of being cached forever.
+        """
+        loop = asyncio.get_running_loop()
+        entry = self._async_clients.get(loop)
+        if entry is None:
+            import google.ai.generativelanguage as glm
+            client = glm.GenerativeServiceAsyncClient(client_options={'api_key': self.api_key})
+            closer = self._close_on_loop_shutdown(loop, client)
+            entry = self._async_clients[loop] = (client, closer)
+            await closer.asend(None)
+        return entry[0]
+
+    async def _close_on_loop_shutdown(self, loop, client):
+        # Parked at the yield until the loop finalizes its async generators,
+        # which asyncio.run() and async_to_sync() both do before closing it
+        try:
+            yield
+        finally:
+            self._async_clients.pop(loop, None)
+            await client.transport.close()
+
+
+class GeminiPool:
+    """Spread Gemini calls over several API keys and an ordered list of models.
+
+    Models are tried in preference order. For each model the key with the most
+    remaining per-minute quota is used first; a 429 cools that key down for the
+    model, a 5xx cools it down briefly, and both fail over to the next key and
+    then to the next model. A rejected key (invalid, revoked or without
+    permission) is taken out of rotation for every model for auth_cooldown.
+    """
+
+    def __init__(self, api_keys, model_names, requests_per_minute=15, cooldown=60, auth_cooldown=3600):
+        if not api_keys:
+            raise ValueError("GeminiPool needs at least one API key")
+        if not model_names:
+            raise ValueError("GeminiPool needs at least one model name")
+        self.keys = [KeyState(key, requests_per_minute) for key in api_keys]
+        self.model_names = list(model_names)
+        self.cooldown = cooldown
+        self.auth_cooldown = auth_cooldown
+        self._lock = threading.Lock()
+
+    def _candidates(self):
+        """Yield (key_state, model_name) pairs in failover order, reserving quota for each."""
+        for model_name in self.model_names:
+            tried = set()
+            while True:
+                with self._lock:
+                    now = time.monotonic()
+                    available = [
+                        state for state in self.keys
+                        if id(state) not in tried and state.is_available(model_name, now)
+                    ]
+                    if not available:
+                        break
+                    state = max(available, key=lambda s: s.remaining(now))
+                    state.recent_requests.append(now)
+                tried.add(id(state))
+                yield state, model_name
+
+    def _record_success(self, state):
+        with self._lock:
+            state.successes += 1
+            state.consecutive_failures = 0
+
+    def _record_failure(self, state, model_name, exc):
+        """Update key health; returns True if the error should fail over."""
+        status = _status_code(exc)
+        auth_error = _is_auth_error(exc, status)
+        with self._lock:
+            state.failures += 1
+            state.consecutive_failures += 1
+            state.last_error = str(exc)[:200]
+            if auth_error:
+                state.disabled_until = time.monotonic() + self.auth_cooldown
+            elif status == 429:
+                state.cooldown_until[model_name] = time.monotonic() + self.cooldown
+            elif status is not None and status >= 500:
+                # Back off briefly so a flaky key stops winning on quota alone
+                state.cooldown_until[model_name] = time.monotonic() + self.cooldown * SERVER_ERROR_COOLDOWN_FACTOR
+        if auth_error:
+            logger.error("Gemini rejected key %s (%s); disabled for %ss", state.label, status, self.auth_cooldown)
+            return True
+        if status == 429 or (status is not None and status >= 500):
+            logger.warning("Gemini %s failed on key %s (%s); failing over", model_name, state.label, status)
+            return True
+        return False
+
+    def generate_content(self, prompt):
+        """Generate content on the best available key/model, failing over on auth errors, 429 and 5xx."""
+        # Imported on first use: the SDK takes most of a second to import
+        from google.generativeai import GenerativeModel
+        last_exc = None
+        for state, model_name in self._candidates():
+            model = GenerativeModel(model_name)
+            model._client = state.client()
+            try:
+                response = model.generate_content(prompt)
+            except Exception as e:
+                if not self._record_failure(state, model_name, e):
+                    raise
+                last_exc = e
+                continue
+            self._record_success(state)
+            return response
+        raise PoolExhaustedError(f"All Gemini keys and models exhausted: {last_exc}", last_exc)
+
+    async def generate_content_async(self, prompt):
+        """Async variant of generate_content."""
+        from google.generativeai import GenerativeModel
+        last_exc = None
+        for state, model_name in self._candidates():
+            model = GenerativeModel(model_name)
+            model._async_client = await state.async_client()
+            try:
+                response = await model.generate_content_async(prompt)
+            except Exception as e:
+                if not self._record_failure(state, model_name, e):
+                    raise
+                last_exc = e
+                continue
+            self._record_success(state)
+            return response
+        raise PoolExhaustedError(f"All Gemini keys and models exhausted: {last_exc}", last_exc)
+
+    def stats(self):
+        """Per-key usage and health snapshot for monitoring."""
+        with self._lock:
+            now = time.monotonic()
+            return [
+                {
+                    'key': state.label,
+                    'remaining_quota': state.remaining(now),
+                    'successes': state.successes,
+                    'failures': state.failures,
+                    'consecutive_failures': state.consecutive_failures,
+                    'disabled': state.disabled_until > now,
+                    'cooling_models': sorted(m for m, until in state.cooldown_until.items() if until > now),
+                    'last_error': state.last_error,
+                }
+                for state in self.keys
+            ]
+
+
+class _FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeGeminiPool:
+    """Drop-in GeminiPool for load tests: canned JSON after a simulated latency, no network calls.
+
+    CVs come back with the name and email found in the prompt and the CV text as
+    their summary, so scores and shortlisting still depend on the uploaded files.
+    """
+
+    def __init__(self, latency=0.5):
+        self.latency = latency
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def _respond(self, prompt):
+        with self._lock:
+            self.calls += 1
+        for marker, kind in (('CV text:', 'cv'), ('Job description:', 'jd')):
+            if marker in prompt:
+                text = prompt.split(marker, 1)[1].strip()
+                break
+        else:
+            return _FakeResponse('{}')
+        first_line = text.splitlines()[0].strip() if text else ''
+        if kind == 'jd':
+            return _FakeResponse(json.dumps({'job_title': first_line or 'Unknown Job Title', 'summary': text}))
+        email = re.search(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}', text)
+        return _FakeResponse(json.dumps({
+            'name': first_line,
+            'email': email.group(0) if email else '',
+            'summary': text,
+        }))
+
+    def generate_content(self, prompt):
+        time.sleep(self.latency)
+        return self._respond(prompt)
+
+    async def generate_content_async(self, prompt):
+        await asyncio.sleep(self.latency)
+        return self._respond(prompt)
+
+    def stats(self):
+        return [{'key': 'fake', 'calls': self.calls, 'latency': self.latency}]
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_gemini_pool():
+    """Return the process-wide pool built from settings."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None and settings.GEMINI_FAKE:
+                logger.warning("GEMINI_FAKE is set; Gemini calls return canned responses")
+                _pool = FakeGeminiPool(latency=settings.GEMINI_FAKE_LATENCY)
+            elif _pool is None:
+                _pool = GeminiPool(
+                    settings.GOOGLE_API_KEYS,
+                    settings.GEMINI_MODELS,
+                    requests_per_minute=settings.GEMINI_KEY_REQUESTS_PER_MINUTE,
+                    cooldown=settings.GEMINI_KEY_COOLDOWN,
+                    auth_cooldown=settings.GEMINI_KEY_AUTH_COOLDOWN,
+                )
+    return _pool
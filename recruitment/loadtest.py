@@ -0,0 +1,289 @@
+import http.client
+import http.cookiejar
+import itertools
+import logging
+import math
+import random
+import re
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+import uuid
+
+from .skills import SKILL_TAXONOMY
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MIX = {'upload': 1, 'shortlisted': 4, 'send_email': 1}
+PERCENTILES = (50, 90, 95, 99)
+LOADTEST_EMAIL_DOMAIN = 'loadtest.example.com'
+CSRF_FORM_RE = re.compile(rb'name="csrfmiddlewaretoken" value="([^"]+)"')
+CANDIDATE_EMAIL_RE = re.compile(rb'name="candidate_emails" value="([^"]+)"')
+
+
+def _pdf_escape(text):
+    return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def make_pdf(lines):
+    """Build a minimal one-page PDF with one line of Helvetica text per entry."""
+    stream = 'BT /F1 10 Tf 14 TL 50 800 Td ' + ' '.join(f'({_pdf_escape(line)}) Tj T*' for line in lines) + ' ET'
+    stream = stream.encode('latin-1', 'replace')
+    objects = [
+        b'<< /Type /Catalog /Pages 2 0 R >>',
+        b'<< /Type /Pages /Kids [3 0 R] /Count 1 >>',
+        b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] /Resources << /Font << /F1 4 0 R >> >> /Contents 5 0 R >>',
+        b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>',
+        b'<< /Length %d >>\nstream\n' % len(stream) + stream + b'\nendstream',
+    ]
+    pdf = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(pdf))
+        pdf += b'%d 0 obj\n' % number + body + b'\nendobj\n'
+    xref = len(pdf)
+    pdf += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+    pdf += b''.join(b'%010d 00000 n \n' % offset for offset in offsets)
+    pdf += b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref)
+    return bytes(pdf)
+
+
+class DocumentFactory:
+    """Generate synthetic JD and CV PDFs; every CV is unique so near-duplicate skipping does not kick in."""
+
+    job_title = 'Backend Engineer'
+
+    def __init__(self, seed=0):
+        self.run_id = uuid.uuid4().hex[:8]
+        self.skills = sorted(SKILL_TAXONOMY)
+        self.required = self.skills[:8]
+        self._counter = itertools.count(1)
+        self._seed = seed
+        self._lock = threading.Lock()
+
+    def jd(self):
+        return make_pdf([
+            self.job_title,
+            'Requirements',
+            f"Skills: {', '.join(self.required)}",
+            'Experience: 3+ years building web applications',
+            'Qualifications: B.Tech in Computer Science',
+        ])
+
+    def email(self, number):
+        return f'candidate{number}.{self.run_id}@{LOADTEST_EMAIL_DOMAIN}'
+
+    def email_suffix(self):
+        """Ending shared by every CV email of this run, for cleaning up the candidates it created."""
+        return f'.{self.run_id}@{LOADTEST_EMAIL_DOMAIN}'
+
+    def cv(self):
+        with self._lock:
+            number = next(self._counter)
+        rng = random.Random(f'{self._seed}-{self.run_id}-{number}')
+        skills = rng.sample(self.required, rng.randint(2, len(self.required)))
+        skills += rng.sample(self.skills, 4)
+        projects = ' '.join(f'{rng.choice(self.skills)}-{rng.randrange(10 ** 6)}' for _ in range(12))
+        return make_pdf([
+            f'Loadtest Candidate {self.run_id} {number}',
+            self.email(number),
+            'Skills',
+            ', '.join(skills),
+            'Experience',
+            f'{rng.randint(1, 10)} years building web applications',
+            'Projects',
+            projects,
+            'Education',
+            'B.Tech in Computer Science',
+        ])
+
+
+class LoadTestResults:
+    """Thread-safe latency and error samples per endpoint.
+
+    Only requests started in the steady-state window (after ramp-up, before the
+    deadline) are summarized, so throughput is not diluted by sessions still
+    starting up.
+    """
+
+    def __init__(self):
+        self.samples = {}
+        self._lock = threading.Lock()
+        self.started = self.finished = None
+        self.steady_from = self.deadline = None
+
+    def record(self, name, started, latency, ok, status):
+        with self._lock:
+            self.samples.setdefault(name, []).append((started, latency, ok, str(status)))
+
+    @staticmethod
+    def _percentile(latencies, percentile):
+        # Nearest-rank percentile on sorted samples
+        return latencies[max(0, math.ceil(percentile / 100 * len(latencies)) - 1)]
+
+    def _summarize(self, samples, elapsed):
+        latencies = sorted(latency for _, latency, _, _ in samples)
+        errors = sum(1 for _, _, ok, _ in samples if not ok)
+        summary = {
+            'requests': len(samples),
+            'errors': errors,
+            'error_rate': errors / len(samples) if samples else 0.0,
+            'rps': len(samples) / elapsed if elapsed else 0.0,
+        }
+        for percentile in PERCENTILES:
+            summary[f'p{percentile}_ms'] = self._percentile(latencies, percentile) * 1000 if latencies else None
+        summary['max_ms'] = latencies[-1] * 1000 if latencies else None
+        return summary
+
+    def summary(self):
+        """Per-endpoint and overall throughput, latency percentiles and error rates over the steady-state window."""
+        window_start = self.steady_from if self.steady_from is not None else self.started
+        window_end = min(self.deadline or math.inf, self.finished or time.monotonic())
+        elapsed = max(window_end - window_start, 0.0)
+        with self._lock:
+            samples = {
+                name: [sample for sample in values if window_start <= sample[0] < window_end]
+                for name, values in self.samples.items()
+            }
+        endpoints = {}
+        for name, values in sorted(samples.items()):
+            if not values:
+                continue
+            endpoints[name] = self._summarize(values, elapsed)
+            statuses = {}
+            for _, _, _, status in values:
+                statuses[status] = statuses.get(status, 0) + 1
+            endpoints[name]['statuses'] = statuses
+        return {
+            'duration_s': elapsed,
+            'endpoints': endpoints,
+            'total': self._summarize([sample for values in samples.values() for sample in values], elapsed),
+        }
+
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    """Report redirects as responses so each timed request is a single round trip."""
+
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        return None
+
+
+def _multipart(fields, files):
+    boundary = uuid.uuid4().hex
+    parts = []
+    for name, value in fields:
+        parts.append(
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode()
+        )
+    for name, filename, content in files:
+        parts.append(
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"; filename="{filename}"\r\n'
+            'Content-Type: application/pdf\r\n\r\n'.encode() + content + b'\r\n'
+        )
+    parts.append(f'--{boundary}--\r\n'.encode())
+    return b''.join(parts), f'multipart/form-data; boundary={boundary}'
+
+
+class VirtualUser:
+    """One recruiter session: logs in, then runs the weighted request mix until the deadline."""
+
+    def __init__(self, base_url, username, password, results, documents,
+                 cvs_per_upload=5, mix=None, think_time=0.0, timeout=120):
+        self.base_url = base_url.rstrip('/')
+        self.username = username
+        self.password = password
+        self.results = results
+        self.documents = documents
+        self.cvs_per_upload = cvs_per_upload
+        self.mix = mix or DEFAULT_MIX
+        self.think_time = think_time
+        self.timeout = timeout
+        self.cookies = http.cookiejar.CookieJar()
+        self.opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(self.cookies), _NoRedirect)
+        self.rng = random.Random(username)
+
+    def _csrf_token(self):
+        return next((cookie.value for cookie in self.cookies if cookie.name == 'csrftoken'), '')
+
+    def request(self, name, path, data=None, content_type=None, expect=(200,), check=None):
+        """Time one request and record it; returns the response body (empty on failure)."""
+        headers = {'Content-Type': content_type} if content_type else {}
+        if data is not None:
+            headers['X-CSRFToken'] = self._csrf_token()
+        request = urllib.request.Request(self.base_url + path, data=data, headers=headers)
+        status, body = None, b''
+        started = time.monotonic()
+        try:
+            with self.opener.open(request, timeout=self.timeout) as response:
+                status, body = response.status, response.read()
+        except urllib.error.HTTPError as e:
+            status, body = e.code, e.read()
+        except (urllib.error.URLError, http.client.HTTPException, OSError) as e:
+            status = type(e).__name__
+        latency = time.monotonic() - started
+        ok = status in expect and (check is None or check(body))
+        self.results.record(name, started, latency, ok, status)
+        return body if ok else b''
+
+    def login(self):
+        self.request('login_page', '/login/')
+        body = urllib.parse.urlencode({
+            'username': self.username,
+            'password': self.password,
+            'csrfmiddlewaretoken': self._csrf_token(),
+        }).encode()
+        self.request('login', '/login/', body, 'application/x-www-form-urlencoded', expect=(302,))
+
+    def upload(self):
+        files = [('jd_file', 'jd.pdf', self.documents.jd())]
+        files += [('cv_files', f'cv{index}.pdf', self.documents.cv()) for index in range(self.cvs_per_upload)]
+        body, content_type = _multipart([('csrfmiddlewaretoken', self._csrf_token())], files)
+        self.request('upload', '/', body, content_type, check=lambda page: b'class="error"' not in page)
+
+    def shortlisted(self):
+        self.request('shortlisted', '/shortlisted/')
+
+    def send_email(self):
+        page = self.request('send_email_page', '/send-email/')
+        emails = [match.decode() for match in CANDIDATE_EMAIL_RE.findall(page)][:3]
+        if not emails:
+            return
+        fields = [('subject', 'Load test'), ('message', 'Load test message'), ('csrfmiddlewaretoken', self._csrf_token())]
+        fields += [('candidate_emails', email) for email in emails]
+        body = urllib.parse.urlencode(fields).encode()
+        self.request('send_email', '/send-email/', body, 'application/x-www-form-urlencoded', expect=(302,))
+
+    def run(self, deadline):
+        self.login()
+        actions = [getattr(self, name) for name in self.mix]
+        weights = list(self.mix.values())
+        while time.monotonic() < deadline:
+            self.rng.choices(actions, weights)[0]()
+            if self.think_time:
+                time.sleep(self.rng.uniform(0, 2 * self.think_time))
+
+
+def run_load_test(base_url, credentials, duration, ramp_up=0.0, documents=None, **user_options):
+    """Drive one VirtualUser thread per (username, password) pair against base_url."""
+    results = LoadTestResults()
+    documents = documents or DocumentFactory()
+    users = [
+        VirtualUser(base_url, username, password, results, documents, **user_options)
+        for username, password in credentials
+    ]
+    results.started = time.monotonic()
+    results.steady_from = results.started + ramp_up
+    results.deadline = deadline = results.steady_from + duration
+    threads = []
+    for index, user in enumerate(users):
+        thread = threading.Thread(target=user.run, args=(deadline,), name=f'loadtest-{index}', daemon=True)
+        threads.append(thread)
+        thread.start()
+        if ramp_up and len(users) > 1:
+            time.sleep(ramp_up / len(users))
+    for thread in threads:
+        thread.join()
+    results.finished = time.monotonic()
+    return results
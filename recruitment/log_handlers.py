@@ -0,0 +1,133 @@
+# Handlers, filters and formatters referenced from settings.LOGGING. This module is
+# imported while Django configures logging, before the app registry is ready, so it
+# must not import models.
+import atexit
+import copy
+import datetime
+import json
+import logging
+import queue
+import random
+import sys
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
+
+# LogRecord attributes that are not user supplied `extra` fields
+_RECORD_ATTRIBUTES = frozenset(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+_stats_lock = threading.Lock()
+_stats = {'records': 0, 'sampled_out': 0, 'caller_seconds': 0.0}
+
+
+class JSONFormatter(logging.Formatter):
+    """Format records as one JSON object per line, including `extra` fields."""
+
+    def format(self, record):
+        entry = {
+            'time': datetime.datetime.fromtimestamp(record.created, datetime.timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exception'] = record.exc_text
+        if record.stack_info:
+            entry['stack'] = record.stack_info
+        return json.dumps(entry, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """Keep only a fraction of low-level records, per logger name prefix.
+
+    rates maps logger names to the share of records to keep, as a dict or a
+    'logger=rate,logger=rate' string; the longest matching prefix wins and
+    unlisted loggers are kept in full. Only records at or below max_level
+    are sampled.
+    """
+
+    def __init__(self, rates=None, max_level=logging.DEBUG):
+        super().__init__()
+        if isinstance(rates, str):
+            rates = {
+                name.strip(): float(rate)
+                for name, _, rate in (part.partition('=') for part in rates.split(',') if part.strip())
+            }
+        self.rates = sorted((rates or {}).items(), key=lambda item: len(item[0]), reverse=True)
+        self.max_level = max_level if isinstance(max_level, int) else logging.getLevelName(max_level)
+
+    def _rate(self, name):
+        for prefix, rate in self.rates:
+            if name == prefix or name.startswith(prefix + '.'):
+                return rate
+        return 1.0
+
+    def filter(self, record):
+        if record.levelno > self.max_level:
+            return True
+        rate = self._rate(record.name)
+        if rate >= 1 or random.random() < rate:
+            return True
+        with _stats_lock:
+            _stats['sampled_out'] += 1
+        return False
+
+
+class QueueStreamHandler(QueueHandler):
+    """Hand records to a background thread that writes them to a stream.
+
+    The calling thread only merges the message arguments and enqueues the
+    record; formatting and stream I/O happen in a QueueListener thread.
+    """
+
+    def __init__(self, stream=None):
+        super().__init__(queue.SimpleQueue())
+        self.target = logging.StreamHandler(stream or sys.stderr)
+        self.listener = QueueListener(self.queue, self.target, respect_handler_level=True)
+        self.listener.start()
+        atexit.register(self.close)
+
+    def setFormatter(self, fmt):
+        # The formatter runs in the listener thread, on the stream handler
+        self.target.setFormatter(fmt)
+
+    def prepare(self, record):
+        # Merge arguments now: they may be mutated after the call returns
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def emit(self, record):
+        started = time.perf_counter()
+        super().emit(record)
+        elapsed = time.perf_counter() - started
+        with _stats_lock:
+            _stats['records'] += 1
+            _stats['caller_seconds'] += elapsed
+
+    def close(self):
+        listener, self.listener = self.listener, None
+        if listener is not None:
+            # Flushes queued records before returning
+            listener.stop()
+            self.target.close()
+        super().close()
+
+
+def logging_stats():
+    """Records handed to the queue, records dropped by sampling, and time spent doing so on request threads."""
+    with _stats_lock:
+        stats = dict(_stats)
+    stats['caller_us_per_record'] = (
+        stats['caller_seconds'] / stats['records'] * 1e6 if stats['records'] else 0.0
+    )
+    return stats
@@ -0,0 +1,40 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from recruitment.fields import convert_stored_text, stores_compressed
+from recruitment.models import Candidate
+
+
+class Command(BaseCommand):
+    help = (
+        "Compress the CV text of candidates stored before cv_text became a compressed field. "
+        "Rows already compressed are skipped, so the command can be rerun after an interruption."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help="Rows read and updated per transaction")
+        parser.add_argument('--database', default='default')
+        parser.add_argument('--vacuum', action='store_true',
+                            help="Run VACUUM on SQLite afterwards so the database file shrinks")
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+        if not stores_compressed(connection):
+            self.stdout.write(
+                f"{connection.vendor} keeps cv_text as text and compresses large values itself; nothing to do"
+            )
+            return
+        started = time.monotonic()
+        converted, size_before, size_after = convert_stored_text(
+            connection, Candidate._meta.db_table, 'cv_text', batch_size=options['batch_size']
+        )
+        ratio = f" ({size_before / size_after:.1f}x smaller)" if size_after else ''
+        self.stdout.write(
+            f"Compressed {converted} CV texts in {time.monotonic() - started:.1f}s: "
+            f"{size_before:,} -> {size_after:,} bytes{ratio}"
+        )
+        if options['vacuum'] and connection.vendor == 'sqlite':
+            with connection.cursor() as cursor:
+                cursor.execute('VACUUM')
@@ -0,0 +1,44 @@
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from recruitment.exports import EXPORT_CHUNK_SIZE, EXPORT_FORMATS, export_chunks, export_queryset
+
+
+def _date(value):
+    try:
+        return datetime.date.fromisoformat(value)
+    except ValueError:
+        raise CommandError(f"Invalid date {value!r}, expected YYYY-MM-DD")
+
+
+class Command(BaseCommand):
+    help = "Stream screened candidates as CSV or JSONL to stdout or a file."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--format', dest='export_format', choices=sorted(EXPORT_FORMATS), default='csv')
+        parser.add_argument('--job-title', help="Only candidates screened for this job title")
+        parser.add_argument('--since', type=_date, help="Created on or after this date (YYYY-MM-DD)")
+        parser.add_argument('--until', type=_date, help="Created on or before this date (YYYY-MM-DD)")
+        shortlist = parser.add_mutually_exclusive_group()
+        shortlist.add_argument('--shortlisted', dest='shortlisted', action='store_true', default=None)
+        shortlist.add_argument('--not-shortlisted', dest='shortlisted', action='store_false')
+        parser.add_argument('--output', '-o', help="Write to this file instead of stdout")
+        parser.add_argument('--chunk-size', type=int, default=EXPORT_CHUNK_SIZE, help="Rows fetched per query")
+
+    def handle(self, *args, **options):
+        queryset = export_queryset(
+            job_title=options['job_title'],
+            since=options['since'],
+            until=options['until'],
+            shortlisted=options['shortlisted'],
+        )
+        chunks = export_chunks(queryset, options['export_format'], chunk_size=options['chunk_size'])
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8', newline='') as output:
+                for chunk in chunks:
+                    output.write(chunk)
+            self.stderr.write(f"Exported candidates to {options['output']}")
+        else:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending='')
@@ -0,0 +1,227 @@
+import json
+import os
+import secrets
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from recruitment.loadtest import DEFAULT_MIX, PERCENTILES, DocumentFactory, run_load_test
+from recruitment.models import Candidate
+
+
+def _mix(value):
+    mix = {}
+    for part in value.split(','):
+        name, _, weight = part.partition('=')
+        if name.strip() not in DEFAULT_MIX:
+            raise CommandError(f"Unknown action {name!r}; choose from {', '.join(DEFAULT_MIX)}")
+        try:
+            mix[name.strip()] = float(weight)
+        except ValueError:
+            raise CommandError(f"Invalid weight in {part!r}, expected action=weight")
+    return mix
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+class Command(BaseCommand):
+    help = (
+        "Load test the full Django stack over HTTP with concurrent recruiter sessions "
+        "(login, JD+CV uploads, shortlisted page, custom emails). Use --serve to start a "
+        "local gunicorn (WSGI) or uvicorn (ASGI) server with the fake Gemini pool and locmem "
+        "email backend on a throwaway database and media directory, or --url to target a "
+        "server started with GEMINI_FAKE=True and a locmem EMAIL_BACKEND that shares this "
+        "database; the candidates and accounts a --url run creates are deleted afterwards."
+    )
+
+    def add_arguments(self, parser):
+        target = parser.add_mutually_exclusive_group(required=True)
+        target.add_argument('--serve', choices=['wsgi', 'asgi'], help="Start a local server of this kind")
+        target.add_argument('--url', help="Base URL of an already running deployment")
+        parser.add_argument('--users', type=int, default=10, help="Concurrent recruiter sessions")
+        parser.add_argument('--duration', type=float, default=60, help="Seconds of steady load that are reported")
+        parser.add_argument('--ramp-up', type=float, default=5,
+                            help="Seconds over which sessions start; requests started then are not reported")
+        parser.add_argument('--cvs-per-upload', type=int, default=5)
+        parser.add_argument('--mix', type=_mix, default=DEFAULT_MIX,
+                            help="Weighted request mix, e.g. upload=1,shortlisted=4,send_email=1")
+        parser.add_argument('--think-time', type=float, default=0.0, help="Mean pause between requests")
+        parser.add_argument('--fake-latency', type=float, default=settings.GEMINI_FAKE_LATENCY,
+                            help="Simulated Gemini latency for --serve")
+        parser.add_argument('--workers', type=int, default=1, help="Server worker processes for --serve")
+        parser.add_argument('--threads', type=int, default=8,
+                            help="Threads per gunicorn worker for --serve wsgi")
+        parser.add_argument('--keep-data', action='store_true',
+                            help="Keep the candidates and accounts a --url run created")
+        parser.add_argument('--json', dest='json_path', help="Also write the report as JSON to this file")
+
+    def _create_users(self, count):
+        """Create or reset the loadtest accounts with a fresh password for this run."""
+        password = secrets.token_urlsafe(16)
+        credentials = []
+        for index in range(count):
+            user, _ = User.objects.get_or_create(username=f'loadtest-{index}')
+            user.set_password(password)
+            user.save(update_fields=['password'])
+            credentials.append((user.username, password))
+        return credentials
+
+    def _create_database(self, workdir):
+        """Create a throwaway copy of the schema for --serve; returns the original database name."""
+        test_settings = connection.settings_dict.setdefault('TEST', {})
+        if connection.vendor == 'sqlite':
+            test_settings['NAME'] = os.path.join(workdir, 'db.sqlite3')
+        else:
+            test_settings['NAME'] = f"{connection.settings_dict['NAME']}_loadtest_{secrets.token_hex(4)}"
+        return connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+
+    def _start_server(self, kind, fake_latency, workers, threads, media_root):
+        port = _free_port()
+        env = {
+            **os.environ,
+            'DJANGO_SETTINGS_MODULE': 'recruitment_system.loadtest_settings',
+            'LOADTEST_BASE_SETTINGS': settings.SETTINGS_MODULE,
+            'LOADTEST_DATABASES': json.dumps({'default': connection.settings_dict}, default=str),
+            'LOADTEST_MEDIA_ROOT': media_root,
+            'GEMINI_FAKE': 'True',
+            'GEMINI_FAKE_LATENCY': str(fake_latency),
+            'EMAIL_BACKEND': 'django.core.mail.backends.locmem.EmailBackend',
+        }
+        # Both kinds run a production server so their reports can be compared
+        server_module = 'gunicorn' if kind == 'wsgi' else 'uvicorn'
+        try:
+            __import__(server_module)
+        except ImportError:
+            raise CommandError(
+                f"--serve {kind} needs {server_module}; install it or start a {kind.upper()} server and pass --url"
+            )
+        if kind == 'wsgi':
+            wsgi_module = settings.WSGI_APPLICATION.replace('wsgi.application', 'wsgi:application')
+            command = [
+                sys.executable, '-m', 'gunicorn', wsgi_module, '--bind', f'127.0.0.1:{port}',
+                '--workers', str(workers), '--worker-class', 'gthread', '--threads', str(threads),
+                '--timeout', '120', '--log-level', 'warning',
+            ]
+        else:
+            asgi_module = settings.WSGI_APPLICATION.replace('wsgi.application', 'asgi:application')
+            command = [
+                sys.executable, '-m', 'uvicorn', asgi_module, '--host', '127.0.0.1', '--port', str(port),
+                '--workers', str(workers), '--log-level', 'warning',
+            ]
+        server = subprocess.Popen(command, cwd=settings.BASE_DIR, env=env,
+                                  stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        base_url = f'http://127.0.0.1:{port}'
+        deadline = time.monotonic() + 30
+        while time.monotonic() < deadline:
+            if server.poll() is not None:
+                raise CommandError(f"{kind} server exited with status {server.returncode}")
+            try:
+                urllib.request.urlopen(base_url + '/login/', timeout=2).close()
+                return server, base_url
+            except (urllib.error.URLError, OSError):
+                time.sleep(0.2)
+        server.terminate()
+        raise CommandError(f"{kind} server did not start within 30 seconds")
+
+    def _delete_run_data(self, documents, credentials):
+        """Delete the candidates (and their CV files) uploaded by a --url run and the loadtest accounts."""
+        candidates = Candidate.objects.filter(email__endswith=documents.email_suffix())
+        for name in candidates.exclude(cv_file='').values_list('cv_file', flat=True).iterator():
+            default_storage.delete(name)
+        _, deleted = candidates.delete()
+        User.objects.filter(username__in=[username for username, _ in credentials]).delete()
+        self.stderr.write(
+            f"Deleted {deleted.get(Candidate._meta.label, 0)} loadtest candidates and {len(credentials)} accounts"
+        )
+
+    def _report(self, label, summary):
+        header = f"{'endpoint':<16}{'requests':>9}{'errors':>8}{'err %':>7}{'rps':>8}"
+        header += ''.join(f"{f'p{p} ms':>9}" for p in PERCENTILES) + f"{'max ms':>9}"
+        self.stdout.write(f"\n{label}: {summary['duration_s']:.1f}s")
+        self.stdout.write(header)
+        rows = list(summary['endpoints'].items()) + [('TOTAL', summary['total'])]
+        for name, stats in rows:
+            line = f"{name:<16}{stats['requests']:>9}{stats['errors']:>8}{stats['error_rate'] * 100:>7.1f}{stats['rps']:>8.2f}"
+            for key in [f'p{p}_ms' for p in PERCENTILES] + ['max_ms']:
+                line += f"{stats[key]:>9.0f}" if stats[key] is not None else f"{'-':>9}"
+            self.stdout.write(line)
+        for name, stats in summary['endpoints'].items():
+            failures = {status: count for status, count in stats['statuses'].items() if status not in ('200', '302')}
+            if failures:
+                self.stderr.write(f"{name} failures by status: {failures}")
+
+    def handle(self, *args, **options):
+        if options['users'] < 1:
+            raise CommandError("--users must be at least 1")
+        documents = DocumentFactory()
+        workdir = old_database_name = server = None
+        try:
+            if options['serve']:
+                workdir = tempfile.mkdtemp(prefix='loadtest-')
+                old_database_name = self._create_database(workdir)
+            credentials = self._create_users(options['users'])
+            if options['serve']:
+                server, base_url = self._start_server(
+                    options['serve'], options['fake_latency'], options['workers'], options['threads'],
+                    os.path.join(workdir, 'media'),
+                )
+                label = f"{options['serve']} server at {base_url}"
+            else:
+                base_url = options['url']
+                label = base_url
+            self.stderr.write(
+                f"Running {options['users']} sessions against {label} for "
+                f"{options['ramp_up']}s ramp-up + {options['duration']}s"
+            )
+            try:
+                results = run_load_test(
+                    base_url,
+                    credentials,
+                    options['duration'],
+                    ramp_up=options['ramp_up'],
+                    documents=documents,
+                    cvs_per_upload=options['cvs_per_upload'],
+                    mix=options['mix'],
+                    think_time=options['think_time'],
+                )
+            finally:
+                if options['url'] and not options['keep_data']:
+                    self._delete_run_data(documents, credentials)
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait(timeout=10)
+            if old_database_name is not None:
+                connection.creation.destroy_test_db(old_database_name, verbosity=0)
+            if workdir is not None:
+                shutil.rmtree(workdir, ignore_errors=True)
+        summary = results.summary()
+        self._report(label, summary)
+        if options['json_path']:
+            report = {
+                'target': label,
+                'server': options['serve'] or 'external',
+                'users': options['users'],
+                'ramp_up_s': options['ramp_up'],
+                'cvs_per_upload': options['cvs_per_upload'],
+                'mix': options['mix'],
+                'fake_latency_s': options['fake_latency'] if options['serve'] else None,
+                **summary,
+            }
+            with open(options['json_path'], 'w') as output:
+                json.dump(report, output, indent=2)
@@ -0,0 +1,36 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from recruitment.matching import POOL_BATCH_SIZE, qualified_candidates, screen_pool
+from recruitment.models import Candidate, JobDescription
+
+
+class Command(BaseCommand):
+    help = (
+        "Score the stored candidate pool against a job description. Candidates below the JD's "
+        "minimum experience or missing a must-have skill are filtered out in SQL before scoring."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('job_description_id', type=int)
+        parser.add_argument('--batch-size', type=int, default=POOL_BATCH_SIZE)
+        parser.add_argument('--dry-run', action='store_true',
+                            help="Only report how many candidates pass the pre-filters")
+
+    def handle(self, *args, **options):
+        job_description = JobDescription.objects.filter(pk=options['job_description_id']).first()
+        if job_description is None:
+            raise CommandError(f"Job description {options['job_description_id']} does not exist")
+        must_have = sorted(job_description.must_have_skills.values_list('name', flat=True))
+        self.stderr.write(
+            f"{job_description.title}: at least {job_description.required_experience:g} years, "
+            f"must have: {', '.join(must_have) or 'nothing'}"
+        )
+        if options['dry_run']:
+            qualified = qualified_candidates(job_description).count()
+            self.stdout.write(f"{qualified} of {Candidate.objects.count()} candidates pass the pre-filters")
+            return
+        started = time.monotonic()
+        scored = screen_pool(job_description, batch_size=options['batch_size'])
+        self.stdout.write(f"Scored {scored} qualified candidates in {time.monotonic() - started:.2f}s")
@@ -0,0 +1,23 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from recruitment.apps import _loading_started
+from recruitment.warmup import warm_up
+
+
+class Command(BaseCommand):
+    help = "Run the startup warm-up (SDK imports, Gemini clients, templates, regexes, DB) and report timings."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--skip-database', action='store_true')
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{'app loading':<22}{(time.monotonic() - _loading_started) * 1000:>8.0f} ms")
+        timings = warm_up(database=not options['skip_database'])
+        for name, seconds, error in timings:
+            line = f"{name:<22}{seconds * 1000:>8.0f} ms"
+            if error:
+                line += f"  FAILED: {error}"
+            self.stdout.write(line)
+        self.stdout.write(f"{'total warm-up':<22}{sum(seconds for _, seconds, _ in timings) * 1000:>8.0f} ms")
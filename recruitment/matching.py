@@ -0,0 +1,75 @@
+import logging
+
+from django.db import transaction
+from django.db.models import Count
+
+from .models import Candidate, Match, Skill
+from .utils import score_stored_match, stored_jd_summary
+
+logger = logging.getLogger(__name__)
+
+POOL_BATCH_SIZE = 500
+
+async def askill_ids(names):
+    """Return Skill ids for canonical skill names, creating missing rows.
+
+    Ids are looked up on every call rather than cached, so a deleted Skill or a
+    rolled-back insert can never leave a stale id behind.
+    """
+    ids = dict([pair async for pair in Skill.objects.filter(name__in=names).values_list('name', 'id')])
+    missing = sorted(set(names) - ids.keys())
+    if missing:
+        await Skill.objects.abulk_create([Skill(name=name) for name in missing], ignore_conflicts=True)
+        ids.update([pair async for pair in Skill.objects.filter(name__in=missing).values_list('name', 'id')])
+    return [ids[name] for name in names]
+
+
+def qualified_candidates(job_description, must_have_ids=None):
+    """Candidates meeting the JD's minimum experience and having every must-have skill.
+
+    Both filters run in SQL on indexed columns: the skill filter groups the
+    candidate/skill join table rows for the must-have skills only.
+    """
+    if must_have_ids is None:
+        must_have_ids = list(job_description.must_have_skills.values_list('id', flat=True))
+    # The default manager defers cv_text, and only() cannot undo that, so scoring would fetch it row by row
+    candidates = Candidate._base_manager.all()
+    if job_description.required_experience:
+        candidates = candidates.filter(experience__gte=job_description.required_experience)
+    if must_have_ids:
+        through = Candidate.normalized_skills.through
+        with_all_skills = through.objects.filter(skill_id__in=must_have_ids).values('candidate_id').annotate(
+            matched=Count('skill_id')
+        ).filter(matched=len(must_have_ids)).values('candidate_id')
+        candidates = candidates.filter(id__in=with_all_skills)
+    return candidates
+
+
+def screen_pool(job_description, batch_size=POOL_BATCH_SIZE):
+    """Score the stored candidates that pass the SQL pre-filters against a JD and store Match rows.
+
+    Replaces earlier matches for the JD; returns the number of candidates scored.
+    """
+    candidates = qualified_candidates(job_description).only('id', 'cv_text', 'skills').order_by('id')
+    jd_summary = stored_jd_summary(job_description)
+    scored = 0
+    with transaction.atomic():
+        Match.objects.filter(job_description=job_description).delete()
+        batch = []
+        for candidate in candidates.iterator(chunk_size=batch_size):
+            batch.append(Match(
+                job_description=job_description,
+                candidate=candidate,
+                match_score=score_stored_match(candidate, jd_summary),
+            ))
+            if len(batch) >= batch_size:
+                Match.objects.bulk_create(batch)
+                scored += len(batch)
+                batch = []
+        if batch:
+            Match.objects.bulk_create(batch)
+            scored += len(batch)
+    logger.info(
+        "Screened stored pool for job description %s: %s qualified candidates scored", job_description.id, scored
+    )
+    return scored
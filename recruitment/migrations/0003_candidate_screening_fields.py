@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recruitment', '0002_alter_jobdescription_required_qualifications_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='candidate',
+            name='cv_file',
+            field=models.FileField(blank=True, upload_to='cvs/'),
+        ),
+        migrations.AddField(
+            model_name='candidate',
+            name='is_shortlisted',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='candidate',
+            name='job_title',
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='candidate',
+            name='match_score',
+            field=models.FloatField(default=0.0),
+        ),
+        migrations.AlterField(
+            model_name='candidate',
+            name='experience',
+            field=models.FloatField(default=0.0),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:54
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recruitment', '0003_candidate_screening_fields'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='candidate',
+            name='minhash',
+            field=models.BinaryField(blank=True, null=True),
+        ),
+        migrations.CreateModel(
+            name='CandidateLSHBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('band', models.PositiveSmallIntegerField()),
+                ('bucket', models.BigIntegerField()),
+                ('candidate', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='lsh_buckets', to='recruitment.candidate')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['band', 'bucket'], name='recruitment_band_1c06ef_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recruitment', '0004_candidate_minhash'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='candidate',
+            name='is_shortlisted',
+            field=models.BooleanField(db_index=True, default=False),
+        ),
+        migrations.AlterField(
+            model_name='candidate',
+            name='job_title',
+            field=models.CharField(blank=True, db_index=True, max_length=255),
+        ),
+        migrations.AlterField(
+            model_name='candidate',
+            name='match_score',
+            field=models.FloatField(db_index=True, default=0.0),
+        ),
+        migrations.AlterField(
+            model_name='match',
+            name='match_score',
+            field=models.FloatField(db_index=True),
+        ),
+    ]
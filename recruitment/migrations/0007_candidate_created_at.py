@@ -0,0 +1,28 @@
+import django.utils.timezone
+from django.db import migrations, models
+
+from recruitment.search import install_search_index
+
+
+def reinstall_search_index(apps, schema_editor):
+    # SQLite rebuilds the candidate table to add a column with a default,
+    # which drops the full-text triggers
+    install_search_index(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recruitment', '0006_candidate_search_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(migrations.RunPython.noop, reinstall_search_index),
+        migrations.AddField(
+            model_name='candidate',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, db_index=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.RunPython(reinstall_search_index, migrations.RunPython.noop),
+    ]
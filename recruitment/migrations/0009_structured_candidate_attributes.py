@@ -0,0 +1,72 @@
+# Generated by Django 5.2.18 on 2026-10-18 22:25
+
+from django.db import migrations, models
+
+from recruitment.search import install_search_index
+from recruitment.skills import extract_skills
+
+BACKFILL_BATCH_SIZE = 1000
+
+
+def reinstall_search_index(apps, schema_editor):
+    # SQLite rebuilds the candidate table to index experience, which drops the
+    # full-text triggers
+    install_search_index(schema_editor)
+
+
+def backfill_normalized_skills(apps, schema_editor):
+    """Link existing candidates to Skill rows from their comma-separated skills."""
+    Candidate = apps.get_model('recruitment', 'Candidate')
+    Skill = apps.get_model('recruitment', 'Skill')
+    Through = Candidate.normalized_skills.through
+    db_alias = schema_editor.connection.alias
+    candidates = Candidate.objects.using(db_alias).exclude(skills='').values_list('id', 'skills')
+    skill_ids = {}
+    links = []
+    for candidate_id, skills in candidates.iterator(chunk_size=BACKFILL_BATCH_SIZE):
+        names = extract_skills(skills)
+        missing = [name for name in names if name not in skill_ids]
+        if missing:
+            Skill.objects.using(db_alias).bulk_create([Skill(name=name) for name in missing], ignore_conflicts=True)
+            skill_ids.update(Skill.objects.using(db_alias).filter(name__in=missing).values_list('name', 'id'))
+        links.extend(Through(candidate_id=candidate_id, skill_id=skill_ids[name]) for name in names)
+        if len(links) >= BACKFILL_BATCH_SIZE:
+            Through.objects.using(db_alias).bulk_create(links, ignore_conflicts=True)
+            links = []
+    if links:
+        Through.objects.using(db_alias).bulk_create(links, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recruitment', '0008_screening_request'),
+    ]
+
+    operations = [
+        migrations.RunPython(migrations.RunPython.noop, reinstall_search_index),
+        migrations.CreateModel(
+            name='Skill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+            ],
+        ),
+        migrations.AlterField(
+            model_name='candidate',
+            name='experience',
+            field=models.FloatField(db_index=True, default=0.0),
+        ),
+        migrations.AddField(
+            model_name='candidate',
+            name='normalized_skills',
+            field=models.ManyToManyField(blank=True, related_name='candidates', to='recruitment.skill'),
+        ),
+        migrations.AddField(
+            model_name='jobdescription',
+            name='must_have_skills',
+            field=models.ManyToManyField(blank=True, related_name='required_by', to='recruitment.skill'),
+        ),
+        migrations.RunPython(backfill_normalized_skills, migrations.RunPython.noop),
+        migrations.RunPython(reinstall_search_index, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-18 22:32
+
+import recruitment.fields
+from django.db import migrations
+
+from recruitment.fields import convert_stored_text, stores_compressed
+from recruitment.search import install_search_index
+
+
+def reinstall_search_index(apps, schema_editor):
+    # SQLite rebuilds the candidate table to change the cv_text column type,
+    # which drops the full-text triggers; the new ones inflate cv_text
+    install_search_index(schema_editor)
+
+
+def inflate_cv_text(apps, schema_editor):
+    # Existing rows are compressed by the compress_cv_text command, so going
+    # back only has to turn compressed values into text again
+    if stores_compressed(schema_editor.connection):
+        convert_stored_text(schema_editor.connection, 'recruitment_candidate', 'cv_text', compress=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recruitment', '0009_structured_candidate_attributes'),
+    ]
+
+    operations = [
+        migrations.RunPython(migrations.RunPython.noop, reinstall_search_index),
+        migrations.RunPython(migrations.RunPython.noop, inflate_cv_text),
+        migrations.AlterField(
+            model_name='candidate',
+            name='cv_text',
+            field=recruitment.fields.CompressedTextField(),
+        ),
+        migrations.RunPython(reinstall_search_index, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,85 @@
+# Generated by Django 5.2.18 on 2026-10-18 22:52
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+import django.db.models.deletion
+from django.db import migrations, models
+
+from recruitment.search import install_search_index, uninstall_search_index
+
+# The tsvector column added to the candidate table by 0006 on PostgreSQL, kept
+# here as it was so that unapplying this migration restores it
+LEGACY_POSTGRES_INSTALL_SQL = [
+    "ALTER TABLE recruitment_candidate ADD COLUMN IF NOT EXISTS search_vector tsvector",
+    """
+    CREATE OR REPLACE FUNCTION recruitment_candidate_search_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('english', coalesce(NEW.name, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(NEW.skills, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(NEW.job_title, '')), 'B') ||
+            setweight(to_tsvector('english', coalesce(NEW.education, '') || ' ' || coalesce(NEW.certifications, '')), 'B') ||
+            setweight(to_tsvector('english', coalesce(NEW.cv_text, '')), 'C');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS recruitment_candidate_search_trigger ON recruitment_candidate",
+    """
+    CREATE TRIGGER recruitment_candidate_search_trigger
+    BEFORE INSERT OR UPDATE OF name, skills, job_title, education, certifications, cv_text
+    ON recruitment_candidate FOR EACH ROW EXECUTE FUNCTION recruitment_candidate_search_update()
+    """,
+    "UPDATE recruitment_candidate SET name = name",
+    "CREATE INDEX IF NOT EXISTS recruitment_candidate_search_idx ON recruitment_candidate USING GIN (search_vector)",
+]
+
+LEGACY_POSTGRES_UNINSTALL_SQL = [
+    "DROP INDEX IF EXISTS recruitment_candidate_search_idx",
+    "DROP TRIGGER IF EXISTS recruitment_candidate_search_trigger ON recruitment_candidate",
+    "DROP FUNCTION IF EXISTS recruitment_candidate_search_update()",
+    "ALTER TABLE recruitment_candidate DROP COLUMN IF EXISTS search_vector",
+]
+
+
+def _run_on_postgresql(statements):
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor == 'postgresql':
+            for statement in statements:
+                schema_editor.execute(statement)
+    return run
+
+
+def install(apps, schema_editor):
+    # On SQLite this replaces the update trigger with one limited to the indexed columns
+    install_search_index(schema_editor)
+
+
+def uninstall(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        uninstall_search_index(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recruitment', '0010_compressed_cv_text'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            _run_on_postgresql(LEGACY_POSTGRES_UNINSTALL_SQL), _run_on_postgresql(LEGACY_POSTGRES_INSTALL_SQL)
+        ),
+        migrations.CreateModel(
+            name='CandidateSearchVector',
+            fields=[
+                ('candidate', models.OneToOneField(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search_document', serialize=False, to='recruitment.candidate')),
+                ('search_vector', django.contrib.postgres.search.SearchVectorField()),
+            ],
+            options={
+                'required_db_vendor': 'postgresql',
+                'indexes': [django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='recruitment_search_gin_idx')],
+            },
+        ),
+        migrations.RunPython(install, uninstall),
+    ]
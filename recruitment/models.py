@@ -1,5 +1,14 @@
 from django.db import models
 from django.contrib.auth.models import User
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
+from .fields import CompressedTextField
+
+class Skill(models.Model):
+       name = models.CharField(max_length=100, unique=True)  # Canonical taxonomy name
+
+       def __str__(self):
+           return self.name
 
 class JobDescription(models.Model):
        title = models.CharField(max_length=255)
@@ -8,26 +17,89 @@ class JobDescription(models.Model):
        required_skills = models.TextField()  # Comma-separated
        required_experience = models.FloatField()  # In years
        required_qualifications = models.TextField()
+       must_have_skills = models.ManyToManyField(Skill, blank=True, related_name='required_by')
 
        def __str__(self):
            return self.title
 
+class CandidateManager(models.Manager):
+       """Leave the CV text, by far the largest column, out of queries.
+
+       only('cv_text', ...) cannot undo this: Django drops already deferred fields
+       from only(), so code that needs the text must query Candidate._base_manager.
+       """
+
+       def get_queryset(self):
+           return super().get_queryset().defer('cv_text')
+
 class Candidate(models.Model):
        name = models.CharField(max_length=255)
        email = models.EmailField()
-       cv_text = models.TextField()
+       cv_text = CompressedTextField()  # Deferred by default
        education = models.TextField()
        skills = models.TextField()  # Comma-separated
-       experience = models.FloatField()  # In years
+       normalized_skills = models.ManyToManyField(Skill, blank=True, related_name='candidates')
+       experience = models.FloatField(default=0.0, db_index=True)  # In years
        certifications = models.TextField()
+       cv_file = models.FileField(upload_to='cvs/', blank=True)
+       job_title = models.CharField(max_length=255, blank=True, db_index=True)
+       match_score = models.FloatField(default=0.0, db_index=True)
+       is_shortlisted = models.BooleanField(default=False, db_index=True)
+       minhash = models.BinaryField(null=True, blank=True, editable=False)  # MinHash signature of cv_text
+       created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+       objects = CandidateManager()
 
        def __str__(self):
            return self.name
 
+class CandidateSearchVector(models.Model):
+       """PostgreSQL full-text document of a candidate, written only by the trigger in search.py."""
+       # No FK constraint or ORM cascade: the table exists on PostgreSQL only and the trigger removes rows
+       candidate = models.OneToOneField(
+           Candidate, on_delete=models.DO_NOTHING, db_constraint=False, primary_key=True, related_name='search_document'
+       )
+       search_vector = SearchVectorField()
+
+       class Meta:
+           required_db_vendor = 'postgresql'
+           indexes = [GinIndex(fields=['search_vector'], name='recruitment_search_gin_idx')]
+
+       def __str__(self):
+           return f"Search document of candidate {self.candidate_id}"
+
+class CandidateLSHBucket(models.Model):
+       candidate = models.ForeignKey(Candidate, on_delete=models.CASCADE, related_name='lsh_buckets')
+       band = models.PositiveSmallIntegerField()
+       bucket = models.BigIntegerField()
+
+       class Meta:
+           indexes = [models.Index(fields=['band', 'bucket'])]
+
+       def __str__(self):
+           return f"{self.candidate_id} band {self.band}"
+
+class ScreeningRequest(models.Model):
+       """Stored outcome of a batch screening API call, keyed by the client's idempotency key."""
+       user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='screening_requests')
+       idempotency_key = models.CharField(max_length=255)
+       fingerprint = models.CharField(max_length=64)  # SHA-256 of the request payload
+       status_code = models.PositiveSmallIntegerField(null=True, blank=True)  # None while in progress
+       response = models.JSONField(null=True, blank=True)
+       created_at = models.DateTimeField(auto_now_add=True)
+
+       class Meta:
+           constraints = [
+               models.UniqueConstraint(fields=['user', 'idempotency_key'], name='unique_screening_request_key'),
+           ]
+
+       def __str__(self):
+           return f"{self.user_id}: {self.idempotency_key}"
+
 class Match(models.Model):
        job_description = models.ForeignKey(JobDescription, on_delete=models.CASCADE)
        candidate = models.ForeignKey(Candidate, on_delete=models.CASCADE)
-       match_score = models.FloatField()
+       match_score = models.FloatField(db_index=True)
 
        def __str__(self):
            return f"{self.candidate.name} - {self.job_description.title} ({self.match_score})"
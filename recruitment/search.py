@@ -0,0 +1,216 @@
+import logging
+import re
+
+from django.core.paginator import Paginator
+from django.db import connection
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db.models import F, FloatField, Q
+from django.db.models.expressions import RawSQL
+
+from .models import Candidate, CandidateSearchVector
+
+logger = logging.getLogger(__name__)
+
+SEARCH_RESULT_FIELDS = ('id', 'name', 'email', 'job_title', 'match_score', 'is_shortlisted', 'cv_file')
+
+# PostgreSQL: a trigger keeps one CandidateSearchVector row (tsvector plus GIN
+# index) per candidate, so the ORM and migrations know the column while regular
+# Candidate queries never load it.
+POSTGRES_INSTALL_SQL = [
+    """
+    CREATE OR REPLACE FUNCTION recruitment_candidate_search_update() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'DELETE' THEN
+            DELETE FROM recruitment_candidatesearchvector WHERE candidate_id = OLD.id;
+            RETURN OLD;
+        END IF;
+        INSERT INTO recruitment_candidatesearchvector (candidate_id, search_vector) VALUES (
+            NEW.id,
+            setweight(to_tsvector('english', coalesce(NEW.name, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(NEW.skills, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(NEW.job_title, '')), 'B') ||
+            setweight(to_tsvector('english', coalesce(NEW.education, '') || ' ' || coalesce(NEW.certifications, '')), 'B') ||
+            setweight(to_tsvector('english', coalesce(NEW.cv_text, '')), 'C')
+        )
+        ON CONFLICT (candidate_id) DO UPDATE SET search_vector = EXCLUDED.search_vector;
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS recruitment_candidate_search_trigger ON recruitment_candidate",
+    """
+    CREATE TRIGGER recruitment_candidate_search_trigger
+    AFTER INSERT OR DELETE OR UPDATE OF name, skills, job_title, education, certifications, cv_text
+    ON recruitment_candidate FOR EACH ROW EXECUTE FUNCTION recruitment_candidate_search_update()
+    """,
+    "UPDATE recruitment_candidate SET name = name WHERE id NOT IN (SELECT candidate_id FROM recruitment_candidatesearchvector)",
+]
+
+POSTGRES_UNINSTALL_SQL = [
+    "DROP TRIGGER IF EXISTS recruitment_candidate_search_trigger ON recruitment_candidate",
+    "DROP FUNCTION IF EXISTS recruitment_candidate_search_update()",
+]
+
+# SQLite (local and test runs): an external-content FTS5 table kept in sync by triggers.
+# cv_text is stored compressed, so triggers read it through the inflate() function
+# registered on each SQLite connection, and the index is rebuilt from it the same way
+FTS_COLUMNS = 'name, skills, job_title, education, certifications, cv_text'
+FTS_VALUES = 'name, skills, job_title, education, certifications, inflate(cv_text)'
+FTS_NEW = 'new.name, new.skills, new.job_title, new.education, new.certifications, inflate(new.cv_text)'
+FTS_OLD = FTS_NEW.replace('new.', 'old.')
+FTS_WEIGHTS = '10.0, 10.0, 5.0, 5.0, 5.0, 1.0'
+
+SQLITE_INSTALL_SQL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS recruitment_candidate_fts USING fts5(
+        {FTS_COLUMNS}, content='recruitment_candidate', content_rowid='id', tokenize='porter unicode61'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS recruitment_candidate_fts_ai AFTER INSERT ON recruitment_candidate BEGIN
+        INSERT INTO recruitment_candidate_fts(rowid, {FTS_COLUMNS}) VALUES (new.id, {FTS_NEW});
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS recruitment_candidate_fts_ad AFTER DELETE ON recruitment_candidate BEGIN
+        INSERT INTO recruitment_candidate_fts(recruitment_candidate_fts, rowid, {FTS_COLUMNS})
+        VALUES ('delete', old.id, {FTS_OLD});
+    END
+    """,
+    # Replaced rather than kept, so databases with the older any-column trigger pick up the column list
+    "DROP TRIGGER IF EXISTS recruitment_candidate_fts_au",
+    f"""
+    CREATE TRIGGER recruitment_candidate_fts_au AFTER UPDATE OF {FTS_COLUMNS} ON recruitment_candidate BEGIN
+        INSERT INTO recruitment_candidate_fts(recruitment_candidate_fts, rowid, {FTS_COLUMNS})
+        VALUES ('delete', old.id, {FTS_OLD});
+        INSERT INTO recruitment_candidate_fts(rowid, {FTS_COLUMNS}) VALUES (new.id, {FTS_NEW});
+    END
+    """,
+    "INSERT INTO recruitment_candidate_fts(recruitment_candidate_fts) VALUES ('delete-all')",
+    f"INSERT INTO recruitment_candidate_fts(rowid, {FTS_COLUMNS}) SELECT id, {FTS_VALUES} FROM recruitment_candidate",
+]
+
+SQLITE_UNINSTALL_SQL = [
+    "DROP TRIGGER IF EXISTS recruitment_candidate_fts_ai",
+    "DROP TRIGGER IF EXISTS recruitment_candidate_fts_ad",
+    "DROP TRIGGER IF EXISTS recruitment_candidate_fts_au",
+    "DROP TABLE IF EXISTS recruitment_candidate_fts",
+]
+
+
+def install_search_index(schema_editor):
+    """Create the backend's full-text index over Candidate text fields.
+
+    Idempotent, so migrations that make SQLite rebuild the candidate table
+    (which drops its triggers) can call it again. On PostgreSQL it waits for
+    the CandidateSearchVector table, which migration 0011 creates.
+    """
+    vendor = schema_editor.connection.vendor
+    statements = {'postgresql': POSTGRES_INSTALL_SQL, 'sqlite': SQLITE_INSTALL_SQL}.get(vendor)
+    if statements is None:
+        logger.warning("No full-text search index for database backend %s", vendor)
+        return
+    if vendor == 'postgresql':
+        with schema_editor.connection.cursor() as cursor:
+            tables = schema_editor.connection.introspection.table_names(cursor)
+        if CandidateSearchVector._meta.db_table not in tables:
+            return
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def uninstall_search_index(schema_editor):
+    """Drop the full-text index created by install_search_index."""
+    vendor = schema_editor.connection.vendor
+    for statement in {'postgresql': POSTGRES_UNINSTALL_SQL, 'sqlite': SQLITE_UNINSTALL_SQL}.get(vendor, []):
+        schema_editor.execute(statement)
+
+
+def _fts5_query(query):
+    """Turn free text into a safe FTS5 query: every word must match, as a prefix."""
+    words = re.findall(r'\w+', query)
+    return ' '.join(f'"{word}"*' for word in words)
+
+
+def _matching_candidates(query):
+    """Filter candidates matching a free-text query and annotate a relevance rank."""
+    candidates = Candidate.objects.all()
+    if connection.vendor == 'postgresql':
+        tsquery = SearchQuery(query, config='english', search_type='websearch')
+        return candidates.filter(search_document__search_vector=tsquery).annotate(
+            rank=SearchRank(F('search_document__search_vector'), tsquery)
+        )
+    # Unindexed fallback for other backends; cv_text is compressed there, so only the plain text fields are searched
+    return candidates.filter(
+        Q(name__icontains=query) | Q(skills__icontains=query) | Q(education__icontains=query)
+        | Q(certifications__icontains=query)
+    ).annotate(rank=RawSQL("0", [], output_field=FloatField()))
+
+
+class _FTS5Results:
+    """Paginator-compatible sequence over an FTS5 join; pages are fetched with LIMIT/OFFSET.
+
+    CROSS JOIN pins the FTS table as the outer loop; otherwise SQLite may scan
+    candidates by job title and re-run MATCH for every row.
+    """
+
+    def __init__(self, fts_query, filters, params):
+        self.fts_query = fts_query
+        self.where = ''.join(f' AND {condition}' for condition in filters)
+        self.params = params
+
+    def count(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT COUNT(*) FROM recruitment_candidate_fts "
+                "CROSS JOIN recruitment_candidate ON recruitment_candidate.id = recruitment_candidate_fts.rowid "
+                f"WHERE recruitment_candidate_fts MATCH %s{self.where}",
+                [self.fts_query, *self.params],
+            )
+            return cursor.fetchone()[0]
+
+    def __getitem__(self, page):
+        columns = ', '.join(f'recruitment_candidate.{field}' for field in SEARCH_RESULT_FIELDS)
+        return list(Candidate.objects.raw(
+            f"SELECT {columns}, -bm25(recruitment_candidate_fts, {FTS_WEIGHTS}) AS rank "
+            "FROM recruitment_candidate_fts "
+            "CROSS JOIN recruitment_candidate ON recruitment_candidate.id = recruitment_candidate_fts.rowid "
+            f"WHERE recruitment_candidate_fts MATCH %s{self.where} "
+            "ORDER BY rank DESC, recruitment_candidate.match_score DESC, recruitment_candidate.id "
+            "LIMIT %s OFFSET %s",
+            [self.fts_query, *self.params, page.stop - page.start, page.start],
+        ))
+
+
+def _sqlite_search(query, job_title, min_score, max_score):
+    filters, params = [], []
+    if job_title:
+        filters.append('recruitment_candidate.job_title = %s')
+        params.append(job_title)
+    if min_score is not None:
+        filters.append('recruitment_candidate.match_score >= %s')
+        params.append(min_score)
+    if max_score is not None:
+        filters.append('recruitment_candidate.match_score <= %s')
+        params.append(max_score)
+    fts_query = _fts5_query(query)
+    if not fts_query:
+        return Candidate.objects.none()
+    return _FTS5Results(fts_query, filters, params)
+
+
+def search_candidates(query, job_title=None, min_score=None, max_score=None, page=1, page_size=20):
+    """Rank candidates by full-text relevance, filtered by job title and score, one page at a time."""
+    if connection.vendor == 'sqlite':
+        # FTS5 ranking needs a join on the FTS table, which the ORM cannot express
+        results = _sqlite_search(query, job_title, min_score, max_score)
+        return Paginator(results, page_size).get_page(page)
+    candidates = _matching_candidates(query)
+    if job_title:
+        candidates = candidates.filter(job_title=job_title)
+    if min_score is not None:
+        candidates = candidates.filter(match_score__gte=min_score)
+    if max_score is not None:
+        candidates = candidates.filter(match_score__lte=max_score)
+    candidates = candidates.only(*SEARCH_RESULT_FIELDS).order_by('-rank', '-match_score', 'id')
+    return Paginator(candidates, page_size).get_page(page)
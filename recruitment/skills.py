@@ -0,0 +1,175 @@
+import functools
+import logging
+import re
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+# Canonical skill name -> synonyms and spellings seen in CVs and JDs.
+# Matching is case-insensitive and on word boundaries. Terms that are also
+# everyday words ("react quickly", "a swift learner") and canonical names of
+# one or two characters (C, R, Go) only match as list items: see LIST_ONLY_TERMS.
+SKILL_TAXONOMY = {
+    'Python': ['python', 'python3'],
+    'Java': ['java', 'core java', 'j2ee', 'java ee'],
+    'JavaScript': ['javascript', 'js', 'ecmascript', 'es6'],
+    'TypeScript': ['typescript'],
+    'C': ['c language', 'ansi c'],
+    'C++': ['c++', 'cpp'],
+    'C#': ['c#', 'csharp', 'c sharp'],
+    'Go': ['golang'],
+    'Rust': ['rust'],
+    'Ruby': ['ruby'],
+    'PHP': ['php'],
+    'Kotlin': ['kotlin'],
+    'Swift': ['swift'],
+    'Scala': ['scala'],
+    'R': ['r programming', 'r language'],
+    'SQL': ['sql', 't-sql', 'pl/sql', 'plsql'],
+    'HTML': ['html', 'html5'],
+    'CSS': ['css', 'css3', 'sass', 'scss'],
+    'Django': ['django', 'django rest framework', 'drf'],
+    'Flask': ['flask'],
+    'FastAPI': ['fastapi'],
+    'Spring Boot': ['spring boot', 'springboot', 'spring framework'],
+    'Node.js': ['node.js', 'nodejs', 'node js', 'express.js', 'expressjs'],
+    'React': ['react', 'react.js', 'reactjs', 'react native'],
+    'Angular': ['angular', 'angularjs', 'angular.js'],
+    'Vue.js': ['vue', 'vue.js', 'vuejs'],
+    '.NET': ['.net', 'dotnet', 'asp.net', '.net core'],
+    'PostgreSQL': ['postgresql', 'postgres'],
+    'MySQL': ['mysql'],
+    'MongoDB': ['mongodb', 'mongo'],
+    'Redis': ['redis'],
+    'Oracle Database': ['oracle db', 'oracle database'],
+    'Kafka': ['kafka', 'apache kafka'],
+    'Spark': ['spark', 'apache spark', 'pyspark'],
+    'Hadoop': ['hadoop', 'hdfs', 'mapreduce'],
+    'AWS': ['aws', 'amazon web services', 'ec2', 'aws lambda'],
+    'Azure': ['azure', 'microsoft azure', 'azure devops'],
+    'Google Cloud': ['gcp', 'google cloud', 'google cloud platform'],
+    'Docker': ['docker', 'containerization'],
+    'Kubernetes': ['kubernetes', 'k8s'],
+    'Terraform': ['terraform'],
+    'Linux': ['linux', 'unix', 'bash', 'shell scripting'],
+    'Git': ['git', 'github', 'gitlab', 'bitbucket'],
+    'CI/CD': ['ci/cd', 'continuous integration', 'continuous delivery', 'jenkins', 'github actions'],
+    'REST APIs': ['restful', 'rest api', 'rest apis', 'restful apis'],
+    'GraphQL': ['graphql'],
+    'Microservices': ['microservices', 'microservice architecture'],
+    'Machine Learning': ['machine learning', 'ml', 'scikit-learn', 'sklearn'],
+    'Deep Learning': ['deep learning', 'neural networks', 'cnn', 'rnn', 'lstm'],
+    'TensorFlow': ['tensorflow', 'keras'],
+    'PyTorch': ['pytorch'],
+    'NLP': ['nlp', 'natural language processing'],
+    'Computer Vision': ['computer vision', 'opencv'],
+    'Data Analysis': ['data analysis', 'data analytics', 'pandas', 'numpy'],
+    'Data Visualization': ['data visualization', 'tableau', 'power bi', 'matplotlib'],
+    'Statistics': ['statistics', 'statistical analysis'],
+    'Cybersecurity': ['cybersecurity', 'cyber security', 'information security', 'penetration testing', 'network security'],
+    'Android': ['android', 'android development'],
+    'iOS': ['ios', 'ios development'],
+    'Flutter': ['flutter', 'dart'],
+    'Agile': ['agile', 'scrum', 'kanban', 'jira'],
+    'Project Management': ['project management', 'pmp'],
+    'Testing': ['unit testing', 'pytest', 'junit', 'selenium', 'test automation', 'qa'],
+    'Blockchain': ['blockchain', 'solidity', 'ethereum'],
+    'UI/UX Design': ['ui/ux', 'ux design', 'ui design', 'figma'],
+    'Communication': ['communication skills', 'communication'],
+    'Leadership': ['leadership', 'team leadership', 'team lead'],
+}
+
+# Lower-cased terms that only count between list separators or conjunctions,
+# as in "Skills: Python, React" or "Rust and Go", and never inside prose
+LIST_ONLY_TERMS = frozenset({'c', 'r', 'go', 'react', 'swift', 'rust', 'spark', 'ml', 'qa', 'communication'})
+LIST_ITEM_BEFORE_RE = re.compile(r'(?:^|[\n,;|/:(\[•·*+&-]|\band|\bor)[ \t]*$')
+LIST_ITEM_AFTER_RE = re.compile(r'^[ \t]*(?:$|[\n,;|/:)\]•·&.]|and\b|or\b)')
+LIST_CONTEXT_CHARS = 16  # How far around a list-only term its separators are looked for
+
+
+class SkillMatcher:
+    """Aho-Corasick automaton over taxonomy synonyms, matching in one linear pass."""
+
+    def __init__(self, taxonomy, list_only=LIST_ONLY_TERMS):
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]  # node -> [(pattern length, canonical name, list only)]
+        for canonical, synonyms in taxonomy.items():
+            patterns = {synonym.lower() for synonym in synonyms}
+            if len(canonical) > 2 or canonical.lower() in list_only:
+                patterns.add(canonical.lower())
+            for pattern in patterns:
+                self._add(pattern, canonical, pattern in list_only)
+        self._build_failure_links()
+
+    def _add(self, pattern, canonical, list_only):
+        node = 0
+        for char in pattern:
+            if char not in self.goto[node]:
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append([])
+                self.goto[node][char] = len(self.goto) - 1
+            node = self.goto[node][char]
+        self.output[node].append((len(pattern), canonical, list_only))
+
+    def _build_failure_links(self):
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self.goto[node].items():
+                queue.append(child)
+                fallback = self.fail[node]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(char, 0)
+                if self.fail[child] == child:
+                    self.fail[child] = 0
+                self.output[child] = self.output[child] + self.output[self.fail[child]]
+
+    def extract(self, text):
+        """Return the set of canonical skills mentioned in text."""
+        text = text.lower()
+        found = set()
+        node = 0
+        for end, char in enumerate(text):
+            while node and char not in self.goto[node]:
+                node = self.fail[node]
+            node = self.goto[node].get(char, 0)
+            for length, canonical, list_only in self.output[node]:
+                if canonical in found:
+                    continue
+                start = end - length + 1
+                # Only accept whole words: "java" must not match inside "javascript"
+                if start > 0 and text[start - 1].isalnum():
+                    continue
+                if end + 1 < len(text) and text[end + 1].isalnum():
+                    continue
+                if list_only and not self._is_list_item(text, start, end + 1):
+                    continue
+                found.add(canonical)
+        return found
+
+    @staticmethod
+    def _is_list_item(text, start, stop):
+        before = text[max(0, start - LIST_CONTEXT_CHARS):start]
+        after = text[stop:stop + LIST_CONTEXT_CHARS]
+        return bool(LIST_ITEM_BEFORE_RE.search(before) and LIST_ITEM_AFTER_RE.match(after))
+
+
+@functools.lru_cache(maxsize=1)
+def get_skill_matcher():
+    """Return the process-wide matcher, compiled on first use."""
+    return SkillMatcher(SKILL_TAXONOMY)
+
+
+def extract_skills(text):
+    """Extract normalized skill names from free text (CV, JD or comma-separated fields)."""
+    if not text:
+        return set()
+    return get_skill_matcher().extract(text)
+
+
+def format_skills(skills):
+    """Serialize a skill set into the comma-separated model field format."""
+    return ', '.join(sorted(skills))
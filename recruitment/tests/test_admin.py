@@ -0,0 +1,69 @@
+from django.contrib.auth.models import User
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from recruitment.models import Candidate, JobDescription
+from recruitment.utils import send_interview_emails
+
+
+class RefusingBackend(EmailBackend):
+    """locmem backend that refuses addresses at refused.example.com."""
+
+    def send_messages(self, messages):
+        if any(address.endswith('@refused.example.com') for message in messages for address in message.to):
+            raise OSError("Recipient refused")
+        return super().send_messages(messages)
+
+
+class JobDescriptionAdminTests(TestCase):
+    def setUp(self):
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'secret'))
+        self.job_description = JobDescription.objects.create(
+            title='Backend Developer', original_text='Full JD text', summary='python django developer',
+            required_skills='Python, Django', required_experience=2, required_qualifications='B.Tech',
+        )
+
+    def job_description_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return [query['sql'] for query in queries if 'FROM "recruitment_jobdescription"' in query['sql']]
+
+    def test_change_form_loads_the_job_description_in_one_query(self):
+        url = reverse('admin:recruitment_jobdescription_change', args=[self.job_description.pk])
+        self.assertEqual(len(self.job_description_queries(url)), 1)
+
+    def test_changelist_leaves_the_long_text_fields_out(self):
+        queries = self.job_description_queries(reverse('admin:recruitment_jobdescription_changelist'))
+        self.assertTrue(queries)
+        self.assertFalse(any('"original_text"' in sql for sql in queries))
+
+
+@override_settings(EMAIL_BACKEND='recruitment.tests.test_admin.RefusingBackend')
+class SendInterviewEmailsTests(TestCase):
+    def test_counts_sent_and_failed_messages(self):
+        sent, failed = send_interview_emails([
+            ('ann@example.com', 'Ann', 'Backend Developer'),
+            ('ben@refused.example.com', 'Ben', 'Backend Developer'),
+            ('cid@example.com', 'Cid', 'Backend Developer'),
+        ])
+        self.assertEqual((sent, failed), (2, 1))
+        self.assertEqual([message.to for message in mail.outbox], [['ann@example.com'], ['cid@example.com']])
+
+    def test_admin_action_reports_a_partial_send(self):
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'secret'))
+        candidates = [
+            Candidate.objects.create(
+                name=name, email=email, cv_text='', education='', skills='', certifications='', job_title='Backend',
+            )
+            for name, email in (('Ann', 'ann@example.com'), ('Ben', 'ben@refused.example.com'))
+        ]
+        response = self.client.post(reverse('admin:recruitment_candidate_changelist'), {
+            'action': 'send_interview_invitations',
+            '_selected_action': [candidate.pk for candidate in candidates],
+        }, follow=True)
+        self.assertContains(response, 'Sent 1 interview invitations; 1 failed.')
@@ -0,0 +1,111 @@
+import asyncio
+import base64
+import shutil
+import tempfile
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import AsyncRequestFactory, TransactionTestCase, override_settings
+
+from recruitment.llm_limits import CircuitOpenError
+from recruitment.loadtest import make_pdf
+from recruitment.models import Candidate, JobDescription, ScreeningRequest
+from recruitment.views import api_screen
+
+AUTHORIZATION = 'Basic ' + base64.b64encode(b'ats:secret').decode()
+
+
+def cv_upload(name):
+    return SimpleUploadedFile(
+        f'{name.lower()}.pdf', make_pdf([name, f'{name.lower()}@example.com', 'Skills', 'Python, Django']),
+        content_type='application/pdf',
+    )
+
+
+async def extracted_cv(text):
+    name, email = text.split()[:2]
+    return {'name': name, 'email': email, 'summary': text, 'skills': {'Python', 'Django'}}
+
+
+class ScreeningAPITests(TransactionTestCase):
+    # Idempotency claims rely on IntegrityError, which would break a wrapping test transaction
+
+    def setUp(self):
+        User.objects.create_user('ats', password='secret')
+        self.job_description = JobDescription.objects.create(
+            title='Backend Developer', original_text='', summary='python django developer',
+            required_skills='Python, Django', required_experience=0, required_qualifications='',
+        )
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        for target in ('recruitment.views.send_interview_email', 'recruitment.views.extract_cv_data_from_text_async'):
+            patcher = mock.patch(target, side_effect=extracted_cv if target.endswith('_async') else None)
+            setattr(self, target.rsplit('.', 1)[1], patcher.start())
+            self.addCleanup(patcher.stop)
+
+    async def screen(self, *names, key='batch-1'):
+        return await self.async_client.post(
+            '/api/screen/',
+            {'job_description_id': self.job_description.id, 'cv_files': [cv_upload(name) for name in names]},
+            headers={'Authorization': AUTHORIZATION, 'Idempotency-Key': key},
+        )
+
+    async def test_retry_replays_the_stored_response_without_llm_calls(self):
+        first = await self.screen('Ann', 'Bob')
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual([row['status'] for row in first.json()['results']], ['screened', 'screened'])
+        replay = await self.screen('Ann', 'Bob')
+        self.assertEqual(replay.status_code, 200)
+        self.assertEqual(replay['Idempotent-Replayed'], 'true')
+        self.assertEqual(replay.json(), first.json())
+        self.assertEqual(self.extract_cv_data_from_text_async.call_count, 2)
+        self.assertEqual(await Candidate.objects.acount(), 2)
+
+    async def test_reused_key_with_other_cvs_is_rejected(self):
+        await self.screen('Ann')
+        response = await self.screen('Bob')
+        self.assertEqual(response.status_code, 422)
+
+    async def test_transient_gemini_failure_is_503_and_not_stored(self):
+        async def breaker_open_for_bob(text):
+            if text.startswith('Bob'):
+                raise CircuitOpenError('open')
+            return await extracted_cv(text)
+
+        self.extract_cv_data_from_text_async.side_effect = breaker_open_for_bob
+        response = await self.screen('Ann', 'Bob')
+        self.assertEqual(response.status_code, 503)
+        self.assertIn('Retry-After', response)
+        self.assertEqual([row['status'] for row in response.json()['results']], ['screened', 'failed'])
+        self.assertFalse(await ScreeningRequest.objects.aexists())
+
+        # The retry screens the failed CV; the one saved earlier is recognised as a duplicate
+        self.extract_cv_data_from_text_async.side_effect = extracted_cv
+        retry = await self.screen('Ann', 'Bob')
+        self.assertEqual(retry.status_code, 200)
+        self.assertEqual([row['status'] for row in retry.json()['results']], ['duplicate', 'screened'])
+        self.assertEqual(await Candidate.objects.acount(), 2)
+
+    async def test_cancelled_request_releases_its_key(self):
+        started = asyncio.Event()
+
+        async def hang(text):
+            started.set()
+            await asyncio.Event().wait()
+
+        self.extract_cv_data_from_text_async.side_effect = hang
+        request = AsyncRequestFactory().post(
+            '/api/screen/', {'job_description_id': self.job_description.id, 'cv_files': [cv_upload('Ann')]},
+            headers={'Authorization': AUTHORIZATION, 'Idempotency-Key': 'batch-1'},
+        )
+        task = asyncio.ensure_future(api_screen(request))
+        await started.wait()
+        self.assertTrue(await ScreeningRequest.objects.aexists())
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+        self.assertFalse(await ScreeningRequest.objects.aexists())
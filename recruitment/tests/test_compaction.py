@@ -0,0 +1,34 @@
+from django.test import SimpleTestCase
+
+from recruitment.compaction import CV_SECTION_PRIORITY, PAGE_BREAK, compact_text, remove_repeated_lines
+
+
+class RemoveRepeatedLinesTests(SimpleTestCase):
+    def test_running_header_and_page_numbers_are_dropped_at_page_boundaries(self):
+        pages = [
+            ['Jane Doe - Curriculum Vitae', 'Experience', 'Developer at Acme', 'Page 1 of 2'],
+            ['Jane Doe - Curriculum Vitae', 'Education', 'B.Tech in CS', 'Page 2 of 2'],
+        ]
+        self.assertEqual(remove_repeated_lines(pages), [
+            'Jane Doe - Curriculum Vitae', 'Experience', 'Developer at Acme', 'Education', 'B.Tech in CS',
+        ])
+
+    def test_lines_repeated_in_the_body_are_kept(self):
+        body = ['Jane Doe', 'Experience'] + [f'Detail {i}' for i in range(4)]
+        page = body[:3] + ['Software Engineer', 'Built APIs', 'Software Engineer', 'Led a team'] + body[3:]
+        self.assertEqual(remove_repeated_lines([page]), page)
+
+    def test_numbers_in_the_body_are_kept(self):
+        page = ['Jane Doe', 'Summary', 'Intro', 'Years of experience', '5', 'Skills', 'Python', 'Django']
+        self.assertEqual(remove_repeated_lines([page]), page)
+
+    def test_compact_text_splits_pdf_pages(self):
+        text = PAGE_BREAK.join([
+            'ACME RESUME\nJane Doe\nSkills\nPython\nline a\nline b\n1',
+            'ACME RESUME\nExperience\nDeveloper\nline c\nline d\n2',
+        ])
+        compacted, _ = compact_text(text, 1000, CV_SECTION_PRIORITY)
+        self.assertEqual(compacted.count('ACME RESUME'), 1)
+        self.assertNotIn(PAGE_BREAK, compacted)
+        self.assertNotIn('\n1\n', f'\n{compacted}\n')
+        self.assertIn('Developer', compacted)
@@ -0,0 +1,63 @@
+import random
+
+from django.test import SimpleTestCase, TestCase
+
+from recruitment.dedup import (
+    MinHashLSH, afind_duplicate_candidate, aindex_candidate, estimate_similarity, minhash_signature,
+    signature_from_bytes, signature_to_bytes,
+)
+from recruitment.models import Candidate
+
+_words = random.Random(1)
+CV_TEXT = ' '.join(_words.choice(['python', 'django', 'built', 'api', 'team', 'data', 'led', 'cloud', 'aws',
+                                  'tests', 'design', 'service', 'users', 'scale', 'sql', 'react'])
+                   for _ in range(400))
+# Same CV with one edited line: most shingles are shared
+NEAR_DUPLICATE = CV_TEXT.replace(CV_TEXT[:60], 'Jane Doe, updated phone number 555 0100 ', 1)
+OTHER_CV = ' '.join(random.Random(2).choice(['java', 'spring', 'kotlin', 'android', 'mobile', 'gradle', 'ui',
+                                             'release', 'store', 'apps', 'firebase', 'testing'])
+                    for _ in range(400))
+
+
+class MinHashTests(SimpleTestCase):
+    def test_signature_of_empty_text_is_none(self):
+        self.assertIsNone(minhash_signature('  ...  '))
+
+    def test_similarity_tracks_shared_content(self):
+        signature = minhash_signature(CV_TEXT)
+        self.assertEqual(estimate_similarity(signature, minhash_signature(CV_TEXT.upper())), 1.0)
+        self.assertGreater(estimate_similarity(signature, minhash_signature(NEAR_DUPLICATE)), 0.8)
+        self.assertLess(estimate_similarity(signature, minhash_signature(OTHER_CV)), 0.1)
+
+    def test_signature_bytes_round_trip(self):
+        signature = minhash_signature(CV_TEXT)
+        self.assertEqual(signature_from_bytes(memoryview(signature_to_bytes(signature))), signature)
+
+    def test_lsh_index_finds_only_near_duplicates(self):
+        index = MinHashLSH(threshold=0.8)
+        index.add('original.pdf', minhash_signature(CV_TEXT))
+        index.add('other.pdf', minhash_signature(OTHER_CV))
+        self.assertEqual(index.query(minhash_signature(NEAR_DUPLICATE)), ['original.pdf'])
+        self.assertEqual(index.query(minhash_signature('An unrelated cover letter about gardening')), [])
+
+
+class StoredDuplicateTests(TestCase):
+    async def store(self, text, job_title='Backend Developer', email='jane@example.com'):
+        signature = minhash_signature(text)
+        candidate = await Candidate.objects.acreate(
+            name='Jane Doe', email=email, cv_text=text, education='', skills='', certifications='',
+            job_title=job_title, minhash=signature_to_bytes(signature),
+        )
+        await aindex_candidate(candidate, signature)
+        return candidate
+
+    async def test_finds_stored_near_duplicate_for_the_same_job(self):
+        original = await self.store(CV_TEXT)
+        await self.store(OTHER_CV, email='john@example.com')
+        duplicate = await afind_duplicate_candidate(minhash_signature(NEAR_DUPLICATE), 'Backend Developer')
+        self.assertEqual(duplicate.id, original.id)
+
+    async def test_ignores_other_jobs_and_different_cvs(self):
+        await self.store(CV_TEXT, job_title='Data Engineer')
+        self.assertIsNone(await afind_duplicate_candidate(minhash_signature(NEAR_DUPLICATE), 'Backend Developer'))
+        self.assertIsNone(await afind_duplicate_candidate(minhash_signature(OTHER_CV), 'Data Engineer'))
@@ -0,0 +1,120 @@
+import os
+import shutil
+import tempfile
+
+from django.contrib.auth.models import User
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from recruitment.downloads import file_etag, parse_range, serve_file
+from recruitment.models import Candidate
+
+CONTENT = bytes(range(256)) * 4
+
+
+class ParseRangeTests(SimpleTestCase):
+    def test_byte_ranges(self):
+        self.assertEqual(parse_range('bytes=0-99', 1024), (0, 99))
+        self.assertEqual(parse_range('bytes=1000-', 1024), (1000, 1023))
+        self.assertEqual(parse_range('bytes=1000-5000', 1024), (1000, 1023))
+        self.assertEqual(parse_range('bytes=-100', 1024), (924, 1023))
+        self.assertEqual(parse_range('bytes=-5000', 1024), (0, 1023))
+
+    def test_ignored_headers(self):
+        for header in (None, '', 'bytes=-', 'bytes=5-1', 'items=0-1', 'bytes=0-1,5-9'):
+            with self.subTest(header=header):
+                self.assertIsNone(parse_range(header, 1024))
+
+    def test_unsatisfiable_ranges(self):
+        for header, size in (('bytes=1024-', 1024), ('bytes=-0', 1024), ('bytes=-10', 0)):
+            with self.subTest(header=header, size=size), self.assertRaises(ValueError):
+                parse_range(header, size)
+
+
+@override_settings(CV_DOWNLOAD_OFFLOAD='', CV_DOWNLOAD_MAX_AGE=60)
+class ServeFileTests(SimpleTestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.path = os.path.join(self.directory, 'cv.pdf')
+        with open(self.path, 'wb') as file:
+            file.write(CONTENT)
+        self.etag = file_etag(os.stat(self.path))
+        self.factory = RequestFactory()
+
+    def serve(self, method='get', **headers):
+        request = getattr(self.factory, method)('/cv/', headers=headers)
+        response = serve_file(request, self.path, 'cvs/cv.pdf')
+        self.addCleanup(response.close)
+        return response
+
+    def test_full_file_with_validators(self):
+        response = self.serve()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), CONTENT)
+        self.assertEqual(response['Content-Length'], str(len(CONTENT)))
+        self.assertEqual(response['ETag'], self.etag)
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertIn('private', response['Cache-Control'])
+        self.assertRegex(self.etag, r'^"[0-9a-f]+-400"$')
+
+    def test_partial_content(self):
+        response = self.serve(Range='bytes=10-19')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(b''.join(response.streaming_content), CONTENT[10:20])
+        self.assertEqual(response['Content-Range'], f'bytes 10-19/{len(CONTENT)}')
+        self.assertEqual(response['Content-Length'], '10')
+
+    def test_unsatisfiable_range(self):
+        response = self.serve(Range=f'bytes={len(CONTENT)}-')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], f'bytes */{len(CONTENT)}')
+
+    def test_if_none_match_returns_not_modified(self):
+        response = self.serve(If_None_Match=self.etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_stale_if_range_sends_the_whole_file(self):
+        response = self.serve(Range='bytes=10-19', If_Range='"stale"')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), CONTENT)
+
+    def test_head_has_headers_and_no_body(self):
+        response = self.serve('head', Range='bytes=0-9')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response.content, b'')
+        self.assertEqual(response['Content-Length'], '10')
+
+    @override_settings(CV_DOWNLOAD_OFFLOAD='x-accel-redirect', CV_DOWNLOAD_ACCEL_PREFIX='/protected-media/')
+    def test_offload_hands_the_file_to_the_proxy(self):
+        response = self.serve(Range='bytes=10-19')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['X-Accel-Redirect'], '/protected-media/cvs/cv.pdf')
+        self.assertEqual(response.content, b'')
+
+
+class DownloadCVViewTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        os.mkdir(os.path.join(self.media_root, 'cvs'))
+        with open(os.path.join(self.media_root, 'cvs', 'jane.pdf'), 'wb') as file:
+            file.write(CONTENT)
+        self.candidate = Candidate.objects.create(
+            name='Jane Doe', email='jane@example.com', cv_text='', cv_file='cvs/jane.pdf',
+        )
+        self.url = reverse('recruitment:download_cv', args=[self.candidate.id])
+
+    def test_requires_login(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 302)
+
+    def test_serves_the_cv_and_404s_missing_files(self):
+        self.client.force_login(User.objects.create_user('recruiter'))
+        with self.settings(MEDIA_ROOT=self.media_root, CV_DOWNLOAD_OFFLOAD=''):
+            response = self.client.get(self.url)
+            self.addCleanup(response.close)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(b''.join(response.streaming_content), CONTENT)
+            os.remove(os.path.join(self.media_root, 'cvs', 'jane.pdf'))
+            self.assertEqual(self.client.get(self.url).status_code, 404)
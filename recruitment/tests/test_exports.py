@@ -0,0 +1,33 @@
+import csv
+import io
+import json
+
+from django.test import TestCase
+
+from recruitment.exports import export_chunks, export_queryset
+from recruitment.models import Candidate
+
+
+class ExportTests(TestCase):
+    def setUp(self):
+        Candidate.objects.create(
+            name='=HYPERLINK("http://evil.example","click")', email='a@example.com', cv_text='',
+            skills='+SUM(1,2)', education='-2+3', certifications='@cmd', job_title='Backend Developer',
+            match_score=71.5,
+        )
+
+    def export(self, export_format):
+        return ''.join(export_chunks(export_queryset(), export_format))
+
+    def test_csv_cells_cannot_start_formulas(self):
+        rows = list(csv.DictReader(io.StringIO(self.export('csv'))))
+        self.assertEqual(len(rows), 1)
+        row = rows[0]
+        self.assertEqual(row['name'], '\'=HYPERLINK("http://evil.example","click")')
+        self.assertEqual((row['skills'], row['education'], row['certifications']), ("'+SUM(1,2)", "'-2+3", "'@cmd"))
+        self.assertEqual((row['email'], row['match_score']), ('a@example.com', '71.5'))
+
+    def test_jsonl_keeps_values_as_stored(self):
+        row = json.loads(self.export('jsonl'))
+        self.assertEqual(row['name'], '=HYPERLINK("http://evil.example","click")')
+        self.assertEqual(row['match_score'], 71.5)
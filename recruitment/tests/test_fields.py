@@ -0,0 +1,100 @@
+import zlib
+from importlib import import_module
+from io import StringIO
+from types import SimpleNamespace
+from unittest import skipUnless
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+
+from recruitment.fields import convert_stored_text, stores_compressed
+from recruitment.models import Candidate
+from recruitment.search import search_candidates
+
+CV_TEXT = 'Jürgen Weiß — built Kafka pipelines and Django services. ' * 20
+
+compressed_storage = skipUnless(stores_compressed(connection), "cv_text is stored as plain text on this backend")
+
+
+def make_candidate(name, cv_text=CV_TEXT):
+    return Candidate.objects.create(
+        name=name, email=f'{name.lower()}@example.com', cv_text=cv_text, education='', skills='', certifications='',
+    )
+
+
+def stored_value(candidate):
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT cv_text FROM recruitment_candidate WHERE id = %s", [candidate.id])
+        return cursor.fetchone()[0]
+
+
+def store_plain_text(candidate, text):
+    """Write cv_text the way rows were stored before compression."""
+    with connection.cursor() as cursor:
+        cursor.execute("UPDATE recruitment_candidate SET cv_text = %s WHERE id = %s", [text, candidate.id])
+
+
+def cv_text(candidate):
+    return Candidate._base_manager.get(pk=candidate.pk).cv_text
+
+
+class CompressedTextFieldTests(TestCase):
+    def test_round_trips_text(self):
+        candidate = make_candidate('Ann')
+        self.assertEqual(cv_text(candidate), CV_TEXT)
+
+    @compressed_storage
+    def test_stores_a_zlib_blob(self):
+        value = bytes(stored_value(make_candidate('Ann')))
+        self.assertEqual(zlib.decompress(value).decode(), CV_TEXT)
+        self.assertLess(len(value), len(CV_TEXT.encode()))
+
+    @compressed_storage
+    def test_reads_legacy_plain_text_rows(self):
+        candidate = make_candidate('Ann')
+        store_plain_text(candidate, 'Plain legacy text about Elixir')
+        self.assertEqual(cv_text(candidate), 'Plain legacy text about Elixir')
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT inflate(cv_text) FROM recruitment_candidate WHERE id = %s", [candidate.id])
+            self.assertEqual(cursor.fetchone()[0], 'Plain legacy text about Elixir')
+        self.assertEqual([row.name for row in search_candidates('elixir').object_list], ['Ann'])
+        self.assertEqual(search_candidates('kafka').paginator.count, 0)
+
+
+@compressed_storage
+class CompressCVTextCommandTests(TestCase):
+    def compress(self):
+        output = StringIO()
+        call_command('compress_cv_text', batch_size=2, stdout=output)
+        return output.getvalue()
+
+    def test_compresses_legacy_rows_once_and_keeps_search_in_sync(self):
+        candidates = [make_candidate(name) for name in ('Ann', 'Ben', 'Cid')]
+        for candidate in candidates[:2]:
+            store_plain_text(candidate, f'{candidate.name} maintains Elixir services')
+
+        self.assertIn('Compressed 2 CV texts', self.compress())
+        self.assertIn('Compressed 0 CV texts', self.compress())
+
+        for candidate in candidates[:2]:
+            self.assertIsInstance(stored_value(candidate), bytes)
+            self.assertEqual(cv_text(candidate), f'{candidate.name} maintains Elixir services')
+        self.assertEqual(sorted(row.name for row in search_candidates('elixir').object_list), ['Ann', 'Ben'])
+        self.assertEqual([row.name for row in search_candidates('kafka').object_list], ['Cid'])
+
+    def test_inflating_converts_back_to_plain_text(self):
+        candidates = [make_candidate(name) for name in ('Ann', 'Ben')]
+        converted, _, _ = convert_stored_text(connection, 'recruitment_candidate', 'cv_text', compress=False)
+        self.assertEqual(converted, 2)
+        for candidate in candidates:
+            self.assertEqual(stored_value(candidate), CV_TEXT)
+            self.assertEqual(cv_text(candidate), CV_TEXT)
+        self.assertEqual(search_candidates('kafka').paginator.count, 2)
+
+    def test_reverse_migration_inflates_stored_text(self):
+        candidate = make_candidate('Ann')
+        migration = import_module('recruitment.migrations.0010_compressed_cv_text')
+        # The RunPython step only needs the editor's connection
+        migration.inflate_cv_text(None, SimpleNamespace(connection=connection))
+        self.assertEqual(stored_value(candidate), CV_TEXT)
@@ -0,0 +1,50 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.test import TransactionTestCase, override_settings
+from django.utils import timezone
+
+from recruitment.idempotency import IdempotencyConflict, aclaim_key, acomplete_key, arelease_key
+from recruitment.models import ScreeningRequest
+
+
+class ClaimKeyTests(TransactionTestCase):
+    # Claims rely on the unique constraint raising IntegrityError, which would break a wrapping test transaction
+
+    def setUp(self):
+        self.user = User.objects.create_user('ats', password='secret')
+
+    async def test_first_claim_goes_ahead_and_completed_key_replays(self):
+        self.assertIsNone(await aclaim_key(self.user, 'key-1', 'fp'))
+        await acomplete_key(self.user, 'key-1', 200, {'results': []})
+        stored = await aclaim_key(self.user, 'key-1', 'fp')
+        self.assertEqual((stored.status_code, stored.response), (200, {'results': []}))
+
+    async def test_reuse_with_another_payload_is_rejected(self):
+        await aclaim_key(self.user, 'key-1', 'fp')
+        with self.assertRaises(IdempotencyConflict) as conflict:
+            await aclaim_key(self.user, 'key-1', 'other-fp')
+        self.assertEqual(conflict.exception.status_code, 422)
+
+    async def test_key_in_progress_is_a_conflict(self):
+        await aclaim_key(self.user, 'key-1', 'fp')
+        with self.assertRaises(IdempotencyConflict) as conflict:
+            await aclaim_key(self.user, 'key-1', 'fp')
+        self.assertEqual(conflict.exception.status_code, 409)
+
+    @override_settings(SCREENING_IDEMPOTENCY_LOCK_TIMEOUT=60)
+    async def test_stale_claim_is_taken_over(self):
+        await aclaim_key(self.user, 'key-1', 'fp')
+        await ScreeningRequest.objects.aupdate(created_at=timezone.now() - timedelta(seconds=61))
+        self.assertIsNone(await aclaim_key(self.user, 'key-1', 'fp'))
+        self.assertEqual(await ScreeningRequest.objects.acount(), 1)
+
+    async def test_released_key_can_be_claimed_again(self):
+        await aclaim_key(self.user, 'key-1', 'fp')
+        await arelease_key(self.user, 'key-1')
+        self.assertIsNone(await aclaim_key(self.user, 'key-1', 'fp'))
+
+    async def test_keys_are_per_user(self):
+        other = await User.objects.acreate_user('other', password='secret')
+        await aclaim_key(self.user, 'key-1', 'fp')
+        self.assertIsNone(await aclaim_key(other, 'key-1', 'other-fp'))
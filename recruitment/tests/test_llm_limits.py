@@ -0,0 +1,149 @@
+import asyncio
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from recruitment.llm_limits import AIMDLimiter, CircuitBreaker, CircuitOpenError
+from recruitment.llm_pool import PoolExhaustedError
+from recruitment.utils import _finish_llm_call, make_api_call
+
+
+class UpstreamError(Exception):
+    def __init__(self, code):
+        super().__init__(f"{code} upstream error")
+        self.code = code
+
+
+class AIMDLimiterTests(SimpleTestCase):
+    def test_fast_calls_grow_the_limit_additively(self):
+        limiter = AIMDLimiter(initial_limit=4, min_limit=1, max_limit=8, latency_target=1.0)
+        for _ in range(4):
+            limiter.acquire()
+        for _ in range(4):
+            limiter.release(latency=0.1)
+        self.assertEqual(limiter.state()['limit'], 4)
+        self.assertAlmostEqual(limiter.limit, 5.0, delta=0.1)
+
+    def test_slow_calls_keep_the_limit(self):
+        limiter = AIMDLimiter(initial_limit=4, min_limit=1, max_limit=8, latency_target=1.0)
+        limiter.acquire()
+        limiter.release(latency=2.0)
+        self.assertEqual(limiter.limit, 4)
+
+    def test_throttled_call_halves_the_limit_down_to_the_minimum(self):
+        limiter = AIMDLimiter(initial_limit=8, min_limit=3, max_limit=8, latency_target=1.0)
+        limiter.acquire()
+        limiter.release(throttled=True)
+        self.assertEqual(limiter.state()['limit'], 4)
+        limiter.acquire()
+        limiter.release(throttled=True)
+        self.assertEqual(limiter.state()['limit'], 3)
+        self.assertEqual(limiter.state()['throttled'], 2)
+
+    def test_limit_never_exceeds_the_maximum(self):
+        limiter = AIMDLimiter(initial_limit=2, min_limit=1, max_limit=2, latency_target=1.0)
+        for _ in range(10):
+            limiter.acquire()
+            limiter.release(latency=0.1)
+        self.assertEqual(limiter.limit, 2)
+
+    async def test_cancelled_waiter_that_was_woken_passes_the_slot_on(self):
+        limiter = AIMDLimiter(initial_limit=1, min_limit=1, max_limit=1, latency_target=1.0)
+        await limiter.acquire_async()
+        first = asyncio.create_task(limiter.acquire_async())
+        second = asyncio.create_task(limiter.acquire_async())
+        await asyncio.sleep(0)
+        self.assertEqual(limiter.state()['waiting_async'], 2)
+        limiter.release(latency=0.1)
+        first.cancel()
+        await asyncio.wait_for(second, timeout=1)
+        self.assertTrue(first.cancelled())
+        self.assertEqual(limiter.state()['in_flight'], 1)
+
+    def test_breaker_rejected_call_is_not_counted_as_completed(self):
+        limiter = AIMDLimiter(initial_limit=2, min_limit=1, max_limit=2, latency_target=1.0)
+        breaker = CircuitBreaker(error_rate_threshold=0.5, min_calls=1, window_size=10, reset_timeout=30)
+        breaker.record_failure()
+        with mock.patch('recruitment.utils.get_llm_limiter', return_value=limiter), \
+                mock.patch('recruitment.utils.get_circuit_breaker', return_value=breaker):
+            with self.assertRaises(CircuitOpenError):
+                make_api_call('prompt')
+        self.assertEqual((limiter.state()['in_flight'], limiter.state()['completed']), (0, 0))
+
+
+class CircuitBreakerTests(SimpleTestCase):
+    def make_breaker(self):
+        return CircuitBreaker(error_rate_threshold=0.5, min_calls=4, window_size=10, reset_timeout=30)
+
+    def test_opens_once_the_error_rate_crosses_the_threshold(self):
+        breaker = self.make_breaker()
+        breaker.record_success()
+        breaker.record_failure()
+        breaker.record_failure()
+        self.assertEqual(breaker.state()['status'], CircuitBreaker.CLOSED)
+        breaker.record_failure()
+        self.assertEqual(breaker.state()['status'], CircuitBreaker.OPEN)
+        self.assertFalse(breaker.allow())
+        self.assertEqual(breaker.state()['rejected'], 1)
+
+    def open_breaker(self, breaker):
+        for _ in range(4):
+            breaker.record_failure()
+        self.assertEqual(breaker.status, CircuitBreaker.OPEN)
+
+    def test_half_open_trial_success_closes(self):
+        breaker = self.make_breaker()
+        self.open_breaker(breaker)
+        with mock.patch('recruitment.llm_limits.time.monotonic', return_value=breaker.opened_at + 31):
+            self.assertTrue(breaker.allow())
+            self.assertEqual(breaker.status, CircuitBreaker.HALF_OPEN)
+            # Only one trial call at a time
+            self.assertFalse(breaker.allow())
+            breaker.record_success()
+        self.assertEqual(breaker.state(), {'status': 'closed', 'error_rate': 0.0, 'window_calls': 1, 'rejected': 1})
+
+    def test_half_open_trial_failure_reopens(self):
+        breaker = self.make_breaker()
+        self.open_breaker(breaker)
+        with mock.patch('recruitment.llm_limits.time.monotonic', return_value=breaker.opened_at + 31):
+            self.assertTrue(breaker.allow())
+            breaker.record_failure()
+        self.assertEqual(breaker.status, CircuitBreaker.OPEN)
+        self.assertFalse(breaker.allow())
+
+    def test_abandoned_trial_lets_another_call_through(self):
+        breaker = self.make_breaker()
+        self.open_breaker(breaker)
+        with mock.patch('recruitment.llm_limits.time.monotonic', return_value=breaker.opened_at + 31):
+            self.assertTrue(breaker.allow())
+            breaker.abandon()
+            self.assertTrue(breaker.allow())
+
+
+class FinishLLMCallTests(SimpleTestCase):
+    def finish(self, exc=None):
+        limiter = AIMDLimiter(initial_limit=8, min_limit=1, max_limit=8, latency_target=10.0)
+        breaker = CircuitBreaker(error_rate_threshold=0.5, min_calls=1, window_size=10, reset_timeout=30)
+        limiter.acquire()
+        self.assertTrue(breaker.allow())
+        _finish_llm_call(limiter, breaker, started=0, exc=exc)
+        return limiter.state(), breaker.state()
+
+    def test_local_quota_exhaustion_throttles_without_feeding_the_breaker(self):
+        limiter, breaker = self.finish(PoolExhaustedError("All Gemini keys and models exhausted: None"))
+        self.assertEqual(limiter['limit'], 4)
+        self.assertEqual((breaker['status'], breaker['window_calls']), ('closed', 0))
+
+    def test_exhaustion_on_429s_throttles_without_feeding_the_breaker(self):
+        limiter, breaker = self.finish(PoolExhaustedError("exhausted", UpstreamError(429)))
+        self.assertEqual(limiter['limit'], 4)
+        self.assertEqual(breaker['window_calls'], 0)
+
+    def test_exhaustion_on_server_errors_is_a_breaker_failure(self):
+        limiter, breaker = self.finish(PoolExhaustedError("exhausted", UpstreamError(503)))
+        self.assertEqual(limiter['limit'], 8)
+        self.assertEqual(breaker['status'], 'open')
+
+    def test_client_error_counts_as_reachable(self):
+        limiter, breaker = self.finish(UpstreamError(400))
+        self.assertEqual((breaker['status'], breaker['window_calls'], breaker['error_rate']), ('closed', 1, 0.0))
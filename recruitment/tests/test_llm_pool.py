@@ -0,0 +1,26 @@
+from django.test import SimpleTestCase
+
+from recruitment.llm_pool import _status_code
+
+
+class CodedError(Exception):
+    def __init__(self, message, code):
+        super().__init__(message)
+        self.code = code
+
+
+class StatusCodeTests(SimpleTestCase):
+    def test_uses_the_exception_code(self):
+        self.assertEqual(_status_code(CodedError("Resource has been exhausted", 429)), 429)
+
+    def test_reads_a_leading_status_prefix(self):
+        self.assertEqual(_status_code(Exception("503 The service is currently unavailable.")), 503)
+
+    def test_ignores_numbers_elsewhere_in_the_message(self):
+        for message, status in (
+            ("400 Request contains 5030 tokens, limit is 4290", 400),
+            ("Invalid argument: request id 500-429-xyz", None),
+            ("Quota of 429 requests per minute reached", None),
+        ):
+            with self.subTest(message=message):
+                self.assertEqual(_status_code(Exception(message)), status)
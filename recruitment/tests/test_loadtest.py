@@ -0,0 +1,59 @@
+import io
+
+from django.conf import settings
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase
+
+from recruitment.dedup import MinHashLSH, minhash_signature
+from recruitment.loadtest import DocumentFactory, LoadTestResults
+from recruitment.management.commands.loadtest import _mix
+from recruitment.utils import extract_pdf_text
+
+
+class LoadTestResultsTests(SimpleTestCase):
+    def test_summary_only_counts_requests_started_in_the_steady_window(self):
+        results = LoadTestResults()
+        results.started, results.steady_from, results.deadline, results.finished = 0.0, 5.0, 15.0, 16.0
+        results.record('login', 0.5, 0.2, True, 302)
+        results.record('shortlisted', 4.9, 0.1, True, 200)
+        for second in range(5, 15):
+            results.record('shortlisted', second + 0.5, 0.1, True, 200)
+        results.record('shortlisted', 14.8, 0.3, False, 500)
+        results.record('shortlisted', 15.2, 0.1, True, 200)
+
+        summary = results.summary()
+
+        self.assertEqual(summary['duration_s'], 10.0)
+        self.assertNotIn('login', summary['endpoints'])
+        shortlisted = summary['endpoints']['shortlisted']
+        self.assertEqual(shortlisted['requests'], 11)
+        self.assertEqual(shortlisted['errors'], 1)
+        self.assertAlmostEqual(shortlisted['rps'], 1.1)
+        self.assertEqual(shortlisted['statuses'], {'200': 10, '500': 1})
+
+
+class MixOptionTests(SimpleTestCase):
+    def test_parses_weights(self):
+        self.assertEqual(_mix('upload=1, shortlisted=2.5'), {'upload': 1.0, 'shortlisted': 2.5})
+
+    def test_rejects_unknown_actions_and_bad_weights(self):
+        for value in ('download=1', 'upload', 'upload=x'):
+            with self.subTest(value=value), self.assertRaises(CommandError):
+                _mix(value)
+
+
+class DocumentFactoryTests(SimpleTestCase):
+    def test_pdfs_are_readable_by_the_extractor(self):
+        documents = DocumentFactory()
+        text = extract_pdf_text(io.BytesIO(documents.cv()))
+        self.assertIn(documents.email(1), text)
+        self.assertIn('B.Tech in Computer Science', text)
+        self.assertIn(documents.job_title, extract_pdf_text(io.BytesIO(documents.jd())))
+
+    def test_cvs_are_not_near_duplicates(self):
+        documents = DocumentFactory()
+        index = MinHashLSH(settings.CV_DUPLICATE_THRESHOLD)
+        for number in range(50):
+            signature = minhash_signature(extract_pdf_text(io.BytesIO(documents.cv())))
+            self.assertEqual(index.query(signature), [])
+            index.add(number, signature)
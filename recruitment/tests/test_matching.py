@@ -0,0 +1,76 @@
+from unittest import mock
+
+from django.contrib.admin.sites import site
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from recruitment.matching import askill_ids, screen_pool
+from recruitment.models import Candidate, JobDescription, Match, Skill
+
+
+def make_job_description(title, required_skills='Python, Django'):
+    return JobDescription.objects.create(
+        title=title, original_text='', summary=f'{title} building python django services',
+        required_skills=required_skills, required_experience=0, required_qualifications='',
+    )
+
+
+def make_candidate(number, skills='Python, Django'):
+    return Candidate.objects.create(
+        name=f'Candidate {number}', email=f'c{number}@example.com', education='', certifications='',
+        skills=skills, cv_text='Built python django services for payments', job_title='Backend Developer',
+    )
+
+
+class RescoreMatchesTests(TestCase):
+    def rescore(self, matches):
+        model_admin = site._registry[Match]
+        with mock.patch.object(model_admin, 'message_user'), CaptureQueriesContext(connection) as queries:
+            model_admin.rescore_matches(None, Match.objects.filter(pk__in=[match.pk for match in matches]))
+        return len(queries)
+
+    def make_matches(self, count, job_descriptions):
+        return [
+            Match.objects.create(
+                candidate=make_candidate(f'{job_description.pk}-{number}'), job_description=job_description,
+                match_score=0,
+            )
+            for number in range(count) for job_description in job_descriptions
+        ]
+
+    def test_query_count_does_not_grow_with_matches(self):
+        job_descriptions = [make_job_description('Backend Developer'), make_job_description('API Engineer')]
+        few = self.rescore(self.make_matches(1, job_descriptions))
+        many = self.rescore(self.make_matches(5, job_descriptions))
+        self.assertEqual(few, many)
+        self.assertFalse(Match.objects.filter(match_score=0).exists())
+
+
+class ScreenPoolTests(TestCase):
+    def screen(self, job_description):
+        with CaptureQueriesContext(connection) as queries:
+            scored = screen_pool(job_description)
+        return scored, len(queries)
+
+    def test_query_count_does_not_grow_with_the_pool(self):
+        job_description = make_job_description('Backend Developer')
+        for number in range(2):
+            make_candidate(number)
+        few = self.screen(job_description)
+        for number in range(2, 6):
+            make_candidate(number)
+        many = self.screen(job_description)
+        self.assertEqual((few[0], many[0]), (2, 6))
+        self.assertEqual(few[1], many[1])
+        self.assertEqual(Match.objects.filter(job_description=job_description, match_score__gt=0).count(), 6)
+
+
+class SkillIdsTests(TestCase):
+    async def test_creates_missing_skills_and_never_returns_stale_ids(self):
+        ids = await askill_ids(['django', 'python'])
+        self.assertEqual(ids, [skill.id async for skill in Skill.objects.filter(name__in=['django', 'python']).order_by('name')])
+        await Skill.objects.filter(name='python').adelete()
+        django_id, python_id = await askill_ids(['django', 'python'])
+        self.assertEqual(django_id, ids[0])
+        self.assertTrue(await Skill.objects.filter(pk=python_id, name='python').aexists())
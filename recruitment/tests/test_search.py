@@ -0,0 +1,48 @@
+from django.test import TestCase
+
+from recruitment.models import Candidate
+from recruitment.search import search_candidates
+
+
+def make_candidate(name, skills='', cv_text='', job_title='Backend Developer', match_score=50.0):
+    return Candidate.objects.create(
+        name=name, email=f'{name.split()[0].lower()}@example.com', skills=skills, cv_text=cv_text,
+        education='B.Tech', certifications='', job_title=job_title, match_score=match_score,
+    )
+
+
+def names(page):
+    return [candidate.name for candidate in page.object_list]
+
+
+class SearchCandidatesTests(TestCase):
+    def test_ranks_skill_matches_above_cv_text_mentions(self):
+        make_candidate('Ann Lee', cv_text='Wrote some Kafka consumers once', match_score=90)
+        make_candidate('Bob Roy', skills='Kafka, Python', match_score=10)
+        make_candidate('Cid Fox', skills='Java')
+        page = search_candidates('kafka')
+        self.assertEqual(names(page), ['Bob Roy', 'Ann Lee'])
+        self.assertEqual(page.paginator.count, 2)
+
+    def test_filters_by_job_title_and_score(self):
+        make_candidate('Ann Lee', skills='Python', match_score=80)
+        make_candidate('Bob Roy', skills='Python', match_score=20)
+        make_candidate('Cid Fox', skills='Python', job_title='Data Engineer', match_score=90)
+        self.assertEqual(names(search_candidates('python', job_title='Backend Developer', min_score=50)), ['Ann Lee'])
+        self.assertEqual(names(search_candidates('python', max_score=50)), ['Bob Roy'])
+
+    def test_index_follows_updates_and_deletes(self):
+        candidate = make_candidate('Ann Lee', skills='Haskell')
+        candidate.skills = 'Erlang'
+        candidate.save()
+        self.assertEqual(names(search_candidates('haskell')), [])
+        self.assertEqual(names(search_candidates('erlang')), ['Ann Lee'])
+        candidate.match_score = 75
+        candidate.save(update_fields=['match_score'])
+        self.assertEqual(names(search_candidates('erlang', min_score=70)), ['Ann Lee'])
+        candidate.delete()
+        self.assertEqual(names(search_candidates('erlang')), [])
+
+    def test_searches_compressed_cv_text(self):
+        make_candidate('Ann Lee', cv_text='Maintained Terraform modules for the payments platform')
+        self.assertEqual(names(search_candidates('terraform payments')), ['Ann Lee'])
@@ -0,0 +1,30 @@
+from django.test import SimpleTestCase
+
+from recruitment.skills import SKILL_TAXONOMY, extract_skills, format_skills
+
+
+class ExtractSkillsTests(SimpleTestCase):
+    def test_matches_whole_words_only(self):
+        self.assertEqual(extract_skills('JavaScript developer'), {'JavaScript'})
+        self.assertEqual(extract_skills('Java and JavaScript'), {'Java', 'JavaScript'})
+        self.assertEqual(extract_skills('pythonic code, mysqlclient'), set())
+
+    def test_synonyms_map_to_canonical_names(self):
+        self.assertEqual(
+            extract_skills('Worked with golang, k8s, postgres and DRF'),
+            {'Go', 'Kubernetes', 'PostgreSQL', 'Django'},
+        )
+        self.assertEqual(extract_skills('C#, .NET core and C++'), {'C#', '.NET', 'C++'})
+
+    def test_everyday_words_do_not_match_in_prose(self):
+        self.assertEqual(extract_skills('I react quickly, swift learner, rust-free'), set())
+        self.assertEqual(extract_skills('Happy to go the extra mile; the QA team praised my communication'), set())
+
+    def test_everyday_words_match_as_list_items(self):
+        self.assertEqual(extract_skills('Python, React'), {'Python', 'React'})
+        self.assertEqual(extract_skills('Skills: Rust and Go\n- Swift\n- ML'), {'Rust', 'Go', 'Swift', 'Machine Learning'})
+        self.assertEqual(extract_skills('Languages: C, R'), {'C', 'R'})
+
+    def test_stored_skill_list_round_trips(self):
+        skills = set(SKILL_TAXONOMY)
+        self.assertEqual(extract_skills(format_skills(skills)), skills)
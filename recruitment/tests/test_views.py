@@ -0,0 +1,50 @@
+from django.contrib.auth.models import User
+from django.core import mail
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from recruitment.models import Candidate
+
+
+def make_candidate(name, is_shortlisted=True):
+    return Candidate.objects.create(
+        name=name, email=f'{name.lower()}@example.com', cv_text='', education='', skills='', certifications='',
+        match_score=80 if is_shortlisted else 40, is_shortlisted=is_shortlisted,
+    )
+
+
+@override_settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend')
+class SendCustomEmailTests(TestCase):
+    def setUp(self):
+        self.url = reverse('recruitment:send_custom_email')
+        for name in ('Ann', 'Ben'):
+            make_candidate(name)
+        make_candidate('Cid', is_shortlisted=False)
+
+    def test_requires_login(self):
+        for name in ('send_custom_email', 'shortlisted_candidates'):
+            with self.subTest(name=name):
+                self.assertEqual(self.client.get(reverse(f'recruitment:{name}')).status_code, 302)
+
+    def test_form_lists_the_shortlisted_candidates(self):
+        self.client.force_login(User.objects.create_user('recruiter'))
+        response = self.client.get(self.url)
+        self.assertContains(response, 'value="ann@example.com"')
+        self.assertNotContains(response, 'cid@example.com')
+
+    def test_post_only_reaches_the_selected_shortlisted_candidates(self):
+        self.client.force_login(User.objects.create_user('recruiter'))
+        response = self.client.post(self.url, {
+            'subject': 'Next steps',
+            'message': 'Please share your availability.',
+            'candidate_emails': ['ann@example.com', 'cid@example.com'],
+        })
+        self.assertRedirects(response, self.url)
+        self.assertEqual([message.to for message in mail.outbox], [['ann@example.com']])
+        self.assertIn('Dear Ann', mail.outbox[0].body)
+
+    def test_post_without_recipients_sends_nothing(self):
+        self.client.force_login(User.objects.create_user('recruiter'))
+        response = self.client.post(self.url, {'subject': 'Next steps', 'message': 'Hello'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(mail.outbox, [])
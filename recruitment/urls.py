@@ -1,8 +1,6 @@
 from django.contrib import admin
 from django.urls import path
 from recruitment import views
-from django.conf import settings
-from django.conf.urls.static import static
 from recruitment.views import CustomLoginView
 
 
@@ -14,5 +12,10 @@ urlpatterns = [
     path('login/', CustomLoginView.as_view(template_name='recruitment/login.html'), name='login'),
     path('logout/', views.user_logout, name='logout'),
     path('shortlisted/', views.shortlisted_candidates, name='shortlisted_candidates'),
+    path('search/', views.candidate_search, name='candidate_search'),
+    path('api/screen/', views.api_screen, name='api_screen'),
+    path('export/<str:export_format>/', views.export_candidates, name='export_candidates'),
+    path('candidates/<int:candidate_id>/cv/', views.download_cv, name='download_cv'),
     path('send-email/', views.send_custom_email, name='send_custom_email'),
-] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
\ No newline at end of file
+    path('llm-status/', views.llm_status, name='llm_status'),
+]
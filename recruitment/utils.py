@@ -1,7 +1,11 @@
 import os
-import PyPDF2
-from google.generativeai import GenerativeModel, list_models, configure
-from django.core.mail import send_mail
+import asyncio
+from asgiref.sync import sync_to_async
+from .llm_pool import get_gemini_pool, PoolExhaustedError, _status_code
+from .llm_limits import get_llm_limiter, get_circuit_breaker, CircuitOpenError
+from .compaction import compact_text, CV_SECTION_PRIORITY, JD_SECTION_PRIORITY, PAGE_BREAK
+from .skills import extract_skills
+from django.core.mail import send_mail, EmailMessage, get_connection
 from django.conf import settings
 from django.template.loader import render_to_string
 import logging
@@ -13,6 +17,9 @@ from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_excep
 # Configure logging
 logger = logging.getLogger(__name__)
 
+EMAIL_RE = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
+YEARS_RE = re.compile(r'(\d+(?:\.\d+)?)\s*\+?\s*(?:years?|yrs?)\b', re.IGNORECASE)
+
 class QuotaExceededError(Exception):
     pass
 
@@ -22,30 +29,27 @@ retry_on_quota_exceeded = retry(
     retry=retry_if_exception_type(QuotaExceededError)
 )
 
-def validate_api_key():
-    """Validate Google API key configuration."""
-    try:
-        configure(api_key=settings.GOOGLE_API_KEY)
-        models = list_models()
-        logger.debug(f"Available models: {[m.name for m in models if 'generateContent' in m.supported_generation_methods]}")
-        return True
-    except Exception as e:
-        logger.error(f"Invalid Google API key or connectivity issue: {str(e)}")
-        return False
-
 def get_available_model():
-    """Fetch an available Gemini model for content generation."""
+    """Fetch the most preferred configured Gemini model that supports content generation."""
+    # The Gemini SDK and PyPDF2 are imported where used; they dominate process startup
+    from google.generativeai import list_models, configure
     try:
         configure(api_key=settings.GOOGLE_API_KEY)
-        models = list_models()
-        for model in models:
-            if 'generateContent' in model.supported_generation_methods:
-                logger.debug(f"Available model: {model.name}")
-                return model.name.split('/')[-1]
+        available = [
+            model.name.split('/')[-1] for model in list_models()
+            if 'generateContent' in model.supported_generation_methods
+        ]
+        for model_name in settings.GEMINI_MODELS:
+            if model_name in available:
+                logger.debug("Available model: %s", model_name)
+                return model_name
+        if available:
+            logger.debug("No configured model available, using: %s", available[0])
+            return available[0]
         logger.error("No models supporting generateContent found")
         return None
     except Exception as e:
-        logger.error(f"Error listing models: {str(e)}")
+        logger.error("Error listing models: %s", e)
         return None
 
 def clean_json_response(text):
@@ -72,124 +76,283 @@ def clean_json_response(text):
     text = re.sub(r"'([^']*)'", r'"\1"', text)
 
     # Log the cleaned response for debugging
-    logger.debug(f"Cleaned JSON response: {text[:100]}...")
+    logger.debug("Cleaned JSON response: %s...", text[:100])
     return text
 
+def _finish_llm_call(limiter, breaker, started, exc=None):
+    """Feed a call's outcome to the concurrency limiter and circuit breaker.
+
+    Running out of quota (locally or on 429s) only slows the limiter down:
+    it says nothing about Gemini's health, so the breaker does not count it.
+    """
+    error = exc.last_error if isinstance(exc, PoolExhaustedError) else exc
+    if isinstance(exc, PoolExhaustedError) and error is None:
+        status = 429  # Every key was out of local per-minute quota
+    else:
+        status = _status_code(error) if error is not None else None
+    throttled = status == 429
+    if throttled:
+        breaker.abandon()
+    elif error is not None and (status is None or status >= 500):
+        breaker.record_failure()
+    else:
+        # Client errors (4xx) still prove the upstream is reachable
+        breaker.record_success()
+    latency = time.monotonic() - started if exc is None else None
+    limiter.release(latency=latency, throttled=throttled)
+
+@retry_on_quota_exceeded
+def make_api_call(prompt):
+    """Make an API call through the key/model pool with retry logic for quota errors."""
+    limiter = get_llm_limiter()
+    limiter.acquire()
+    # Check the breaker after queueing so waiting calls see an outage too
+    breaker = get_circuit_breaker()
+    if not breaker.allow():
+        limiter.abandon()
+        raise CircuitOpenError("Gemini circuit breaker is open")
+    started = time.monotonic()
+    try:
+        response = get_gemini_pool().generate_content(prompt)
+    except PoolExhaustedError as e:
+        _finish_llm_call(limiter, breaker, started, e)
+        raise QuotaExceededError(f"Quota exceeded: {str(e)}")
+    except Exception as e:
+        _finish_llm_call(limiter, breaker, started, e)
+        raise
+    _finish_llm_call(limiter, breaker, started)
+    return response
+
 @retry_on_quota_exceeded
-def make_api_call(model, prompt):
-    """Make an API call with retry logic for quota errors."""
+async def make_api_call_async(prompt):
+    """Make a non-blocking API call, bounded by the adaptive concurrency limiter."""
+    limiter = get_llm_limiter()
+    await limiter.acquire_async()
+    # Check the breaker after queueing so waiting calls see an outage too
+    breaker = get_circuit_breaker()
+    if not breaker.allow():
+        limiter.abandon()
+        raise CircuitOpenError("Gemini circuit breaker is open")
+    started = time.monotonic()
     try:
-        response = model.generate_content(prompt)
-        return response
+        response = await get_gemini_pool().generate_content_async(prompt)
+    except PoolExhaustedError as e:
+        _finish_llm_call(limiter, breaker, started, e)
+        raise QuotaExceededError(f"Quota exceeded: {str(e)}")
+    except asyncio.CancelledError:
+        # A cancelled request says nothing about upstream health
+        breaker.abandon()
+        limiter.release()
+        raise
     except Exception as e:
-        if "429" in str(e):
-            raise QuotaExceededError(f"Quota exceeded: {str(e)}")
+        _finish_llm_call(limiter, breaker, started, e)
         raise
+    _finish_llm_call(limiter, breaker, started)
+    return response
+
+def extract_pdf_text(pdf_file):
+    """Extract the text of every page of a PDF file, with pages separated by PAGE_BREAK."""
+    import PyPDF2
+    pdf_reader = PyPDF2.PdfReader(pdf_file)
+    return PAGE_BREAK.join(page.extract_text() or "" for page in pdf_reader.pages)
+
+def build_cv_prompt(text):
+    """Build the Gemini prompt for structured CV extraction from token-budgeted CV text."""
+    compacted, stats = compact_text(text, settings.CV_PROMPT_TOKEN_BUDGET, CV_SECTION_PRIORITY)
+    logger.info(
+        "CV prompt text: %s of %s estimated tokens", stats['prompt_tokens'], stats['original_tokens'], extra=stats
+    )
+    return (
+        "Extract the following from this CV in a structured format: "
+        "Name, Email, Skills, Experience, Education, Certifications. "
+        "Also give total professional experience in years as a number, and education and certifications as short strings. "
+        "Return as a valid JSON object without markdown wrappers. Ensure all string values use double quotes and escape any single quotes within strings. Example: "
+        "{\"name\": \"John Doe\", \"email\": \"john.doe@example.com\", \"experience_years\": 3, \"education\": \"B.Tech in CS\", \"certifications\": \"AWS Certified Developer\", \"summary\": \"Skills: Python, Django; Experience: 3 years as a developer; Education: B.Tech in CS; Certifications: AWS Certified Developer\"} "
+        f"CV text: {compacted}"
+    )
+
+def build_jd_prompt(text):
+    """Build the Gemini prompt for JD summarization from token-budgeted JD text."""
+    compacted, stats = compact_text(text, settings.JD_PROMPT_TOKEN_BUDGET, JD_SECTION_PRIORITY)
+    logger.info(
+        "JD prompt text: %s of %s estimated tokens", stats['prompt_tokens'], stats['original_tokens'], extra=stats
+    )
+    return (
+        "Summarize this job description into a concise string of key requirements and extract the job title. "
+        "Also give the minimum years of experience as a number (0 if not stated), the skills the JD marks as mandatory, and the required qualifications. "
+        "Return as a valid JSON object without markdown wrappers. Ensure all string values use double quotes and escape any single quotes within strings. Example: "
+        "{\"job_title\": \"Software Engineer\", \"required_experience_years\": 3, \"must_have_skills\": [\"Python\", \"Django\"], \"required_qualifications\": \"B.Tech\", \"summary\": \"Skills: Python, Django; Experience: 3+ years; Qualifications: B.Tech; Responsibilities: Develop web applications\"} "
+        f"Job description: {compacted}"
+    )
+
+def parse_years(value, text=''):
+    """Read a years-of-experience value from the model output, falling back to the largest 'N years' in the text."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return max(float(value), 0.0)
+    match = YEARS_RE.search(str(value or ''))
+    if match:
+        return float(match.group(1))
+    years = [float(found) for found in YEARS_RE.findall(text or '')]
+    return max(years) if years else 0.0
+
+def _as_text(value):
+    """Join list values from the model output into the comma-separated text stored on models."""
+    if isinstance(value, (list, tuple)):
+        return ', '.join(str(item) for item in value if item)
+    return str(value or '')
+
+def parse_cv_response(result, text):
+    """Parse a Gemini CV extraction response, falling back to the email found in the text.
+
+    Skills are extracted locally from the CV text with the skill taxonomy.
+    """
+    try:
+        cleaned_result = clean_json_response(result)
+        data = json.loads(cleaned_result)
+        if not data.get('email'):
+            email_match = EMAIL_RE.search(text)
+            if email_match:
+                data['email'] = email_match.group(0)
+        data['skills'] = extract_skills(text)
+        data['experience'] = parse_years(data.get('experience_years'), text)
+        data['education'] = _as_text(data.get('education'))
+        data['certifications'] = _as_text(data.get('certifications'))
+        return data
+    except json.JSONDecodeError as e:
+        logger.error("Invalid JSON response: %s. Raw response: %s", e, result)
+        return {}
+
+def parse_jd_response(result, text):
+    """Parse a Gemini JD summarization response, adding locally extracted skills."""
+    try:
+        cleaned_result = clean_json_response(result)
+        data = json.loads(cleaned_result)
+        data['skills'] = extract_skills(text)
+        data['required_experience'] = parse_years(data.get('required_experience_years'))
+        # Only taxonomy skills can be pre-filtered on; others stay in the summary for scoring
+        data['must_have_skills'] = extract_skills(_as_text(data.get('must_have_skills')))
+        data['required_qualifications'] = _as_text(data.get('required_qualifications'))
+        return data
+    except json.JSONDecodeError as e:
+        logger.error("Cleaned JSON is invalid: %s. Cleaned response: %s", e, result)
+        return {}
 
 def extract_cv_data(cv_file):
     """Extract name, email, skills, experience, education, and certifications from a CV PDF."""
     try:
-        pdf_reader = PyPDF2.PdfReader(cv_file)
-        text = ""
-        for page in pdf_reader.pages:
-            extracted = page.extract_text() or ""
-            text += extracted + "\n"
-        logger.debug(f"Extracted CV text (first 50 chars, len={len(text)}): {text[:50]}...")
+        text = extract_pdf_text(cv_file)
+        logger.debug("Extracted CV text (first 50 chars, len=%s): %s...", len(text), text[:50])
         
         if not text.strip():
             logger.warning("No text extracted from CV")
             return {}
         
-        email_match = re.search(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}', text)
-        candidate_email = email_match.group(0) if email_match else None
+        prompt = build_cv_prompt(text)
+        try:
+            response = make_api_call(prompt)
+            result = response.text.strip() if response.text else ""
+            logger.debug("Extracted CV data: %s...", result[:100])
+        except QuotaExceededError as e:
+            logger.error("Quota exceeded after retries: %s", e)
+            return {}
+        except CircuitOpenError as e:
+            logger.warning("Skipping Gemini call: %s", e)
+            return {}
+        except Exception as e:
+            logger.error("Gemini API error in CV extraction: %s", e)
+            return {}
+        
+        return parse_cv_response(result, text)
+    except Exception as e:
+        logger.error("Error extracting CV data: %s", e)
+        return {}
+
+def summarize_jd(jd_file):
+    """Summarize a job description PDF into key requirements and extract job title."""
+    try:
+        text = extract_pdf_text(jd_file)
+        logger.debug("Extracted JD text (first 50 chars, len=%s): %s...", len(text), text[:50])
         
-        if not validate_api_key():
+        if not text.strip():
+            logger.warning("No text extracted from JD")
             return {}
         
-        model_name = get_available_model() or 'gemini-1.5-flash'
-        model = GenerativeModel(model_name)
-        prompt = (
-            "Extract the following from this CV in a structured format: "
-            "Name, Email, Skills, Experience, Education, Certifications. "
-            "Return as a valid JSON object without markdown wrappers. Ensure all string values use double quotes and escape any single quotes within strings. Example: "
-            "{\"name\": \"John Doe\", \"email\": \"john.doe@example.com\", \"summary\": \"Skills: Python, Django; Experience: 3 years as a developer; Education: B.Tech in CS; Certifications: AWS Certified Developer\"} "
-            f"CV text: {text[:4000]}"
-        )
+        prompt = build_jd_prompt(text)
         try:
-            response = make_api_call(model, prompt)
+            response = make_api_call(prompt)
             result = response.text.strip() if response.text else ""
-            logger.debug(f"Extracted CV data: {result[:100]}...")
+            logger.debug("Summarized JD: %s...", result[:100])
         except QuotaExceededError as e:
-            logger.error(f"Quota exceeded after retries: {str(e)}")
+            logger.error("Quota exceeded after retries: %s", e)
+            return {}
+        except CircuitOpenError as e:
+            logger.warning("Skipping Gemini call: %s", e)
             return {}
         except Exception as e:
-            logger.error(f"Gemini API error in CV extraction: {str(e)}")
+            logger.error("Gemini API error in JD summarization: %s", e)
+            return {}
+        
+        return parse_jd_response(result, text)
+    except Exception as e:
+        logger.error("Error summarizing JD: %s", e)
+        return {}
+
+async def extract_cv_data_from_text_async(text):
+    """Extract structured CV data from already extracted CV text.
+
+    QuotaExceededError and CircuitOpenError propagate: Gemini being briefly
+    unavailable is worth a retry, unlike a CV it could not read.
+    """
+    try:
+        logger.debug("Extracted CV text (first 50 chars, len=%s): %s...", len(text), text[:50])
+        
+        if not text.strip():
+            logger.warning("No text extracted from CV")
             return {}
         
         try:
-            cleaned_result = clean_json_response(result)
-            data = json.loads(cleaned_result)
-            if not data.get('email') and candidate_email:
-                data['email'] = candidate_email
-            return data
-        except json.JSONDecodeError as e:
-            logger.error(f"Invalid JSON response: {str(e)}. Raw response: {result}")
+            response = await make_api_call_async(build_cv_prompt(text))
+            result = response.text.strip() if response.text else ""
+            logger.debug("Extracted CV data: %s...", result[:100])
+        except (QuotaExceededError, CircuitOpenError):
+            raise
+        except Exception as e:
+            logger.error("Gemini API error in CV extraction: %s", e)
             return {}
+        
+        return parse_cv_response(result, text)
+    except (QuotaExceededError, CircuitOpenError):
+        raise
     except Exception as e:
-        logger.error(f"Error extracting CV data: {str(e)}")
+        logger.error("Error extracting CV data: %s", e)
         return {}
 
-def summarize_jd(jd_file):
-    """Summarize a job description PDF into key requirements and extract job title."""
+async def summarize_jd_from_text_async(text):
+    """Summarize already extracted JD text."""
     try:
-        pdf_reader = PyPDF2.PdfReader(jd_file)
-        text = ""
-        for page in pdf_reader.pages:
-            extracted = page.extract_text() or ""
-            text += extracted + "\n"
-        logger.debug(f"Extracted JD text (first 50 chars, len={len(text)}): {text[:50]}...")
+        logger.debug("Extracted JD text (first 50 chars, len=%s): %s...", len(text), text[:50])
         
         if not text.strip():
             logger.warning("No text extracted from JD")
             return {}
         
-        if not validate_api_key():
-            return {}
-        
-        model_name = get_available_model() or 'gemini-1.5-flash'
-        model = GenerativeModel(model_name)
-        prompt = (
-            "Summarize this job description into a concise string of key requirements and extract the job title. "
-            "Return as a valid JSON object without markdown wrappers. Ensure all string values use double quotes and escape any single quotes within strings. Example: "
-            "{\"job_title\": \"Software Engineer\", \"summary\": \"Skills: Python, Django; Experience: 3+ years; Qualifications: B.Tech; Responsibilities: Develop web applications\"} "
-            f"Job description: {text[:4000]}"
-        )
         try:
-            response = make_api_call(model, prompt)
+            response = await make_api_call_async(build_jd_prompt(text))
             result = response.text.strip() if response.text else ""
-            logger.debug(f"Summarized JD: {result[:100]}...")
+            logger.debug("Summarized JD: %s...", result[:100])
         except QuotaExceededError as e:
-            logger.error(f"Quota exceeded after retries: {str(e)}")
+            logger.error("Quota exceeded after retries: %s", e)
+            return {}
+        except CircuitOpenError as e:
+            logger.warning("Skipping Gemini call: %s", e)
             return {}
         except Exception as e:
-            logger.error(f"Gemini API error in JD summarization: {str(e)}")
+            logger.error("Gemini API error in JD summarization: %s", e)
             return {}
         
-        try:
-            cleaned_result = clean_json_response(result)
-            # Validate JSON before parsing
-            try:
-                json.loads(cleaned_result)
-            except json.JSONDecodeError as e:
-                logger.error(f"Cleaned JSON is invalid: {str(e)}. Cleaned response: {cleaned_result}")
-                return {}
-            data = json.loads(cleaned_result)
-            return data
-        except json.JSONDecodeError as e:
-            logger.error(f"Invalid JSON response: {str(e)}. Raw response: {result}")
-            return {}
+        return parse_jd_response(result, text)
     except Exception as e:
-        logger.error(f"Error summarizing JD: {str(e)}")
+        logger.error("Error summarizing JD: %s", e)
         return {}
 
 def calculate_match_score(cv_data, jd_summary):
@@ -201,7 +364,7 @@ def calculate_match_score(cv_data, jd_summary):
         required_keys = ['summary']
         for data in [cv_data, jd_summary]:
             if not all(key in data for key in required_keys):
-                logger.error(f"Missing required keys in data: {data}")
+                logger.error("Missing required keys in data: %s", data)
                 return 0.0
         cv_summary = cv_data.get('summary', '').lower()
         jd_summary_str = jd_summary.get('summary', '').lower()
@@ -209,34 +372,79 @@ def calculate_match_score(cv_data, jd_summary):
         jd_words = set(jd_summary_str.split())
         common_words = cv_words.intersection(jd_words)
         score = (len(common_words) / len(jd_words) * 100) if jd_words else 0.0
-        logger.debug(f"Match score: {score}")
+        # Blend in coverage of the JD's normalized skill set when both sides have one
+        cv_skills = cv_data.get('skills')
+        jd_skills = jd_summary.get('skills')
+        if isinstance(cv_skills, (set, frozenset)) and isinstance(jd_skills, (set, frozenset)) and jd_skills:
+            skill_score = len(cv_skills & jd_skills) / len(jd_skills) * 100
+            score = (score + skill_score) / 2
+        logger.debug("Match score: %s", score)
         return round(score, 2)
     except Exception as e:
-        logger.error(f"Error calculating match score: {str(e)}")
+        logger.error("Error calculating match score: %s", e)
         return 0.0
 
+def stored_jd_summary(job_description):
+    """Build the JD summary dict used for scoring from a stored job description."""
+    return {
+        'job_title': job_description.title,
+        'summary': job_description.summary,
+        'skills': extract_skills(job_description.required_skills) or extract_skills(job_description.summary),
+    }
+
+def score_stored_match(candidate, jd_summary):
+    """Score a stored candidate against a stored_jd_summary() locally, without an LLM call."""
+    cv_data = {
+        'summary': candidate.cv_text,
+        'skills': extract_skills(candidate.skills) or extract_skills(candidate.cv_text),
+    }
+    return calculate_match_score(cv_data, jd_summary)
+
+def _interview_message(candidate_email, candidate_name, job_title, connection=None):
+    """Build the interview invitation email for a candidate."""
+    context = {
+        'candidate_name': candidate_name,
+        'job_title': job_title,
+        'interview_times': [
+            "Monday, June 16, 2025, 10:00 AM IST",
+            "Tuesday, June 17, 2025, 2:00 PM IST",
+        ],
+    }
+    return EmailMessage(
+        subject=f"Interview Invitation for {job_title}",
+        body=render_to_string('emails/interview_invitation.txt', context),
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[candidate_email],
+        connection=connection,
+    )
+
 def send_interview_email(candidate_email, candidate_name, job_title):
     """Send an interview invitation email to the candidate."""
     try:
-        context = {
-            'candidate_name': candidate_name,
-            'job_title': job_title,
-            'interview_times': [
-                "Monday, June 16, 2025, 10:00 AM IST",
-                "Tuesday, June 17, 2025, 2:00 PM IST",
-            ],
-        }
-        message = render_to_string('emails/interview_invitation.txt', context)
-        send_mail(
-            subject=f"Interview Invitation for {job_title}",
-            message=message,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[candidate_email],
-            fail_silently=False,
-        )
-        logger.info(f"Email sent to {candidate_email}")
+        _interview_message(candidate_email, candidate_name, job_title).send(fail_silently=False)
+        logger.info("Email sent to %s", candidate_email)
+    except Exception as e:
+        logger.error("Failed to send email to %s: %s", candidate_email, e)
+
+def send_interview_emails(recipients):
+    """Send interview invitations for (email, name, job title) tuples over one SMTP connection.
+
+    A failed message does not stop the rest. Returns (sent, failed) counts.
+    """
+    sent = failed = 0
+    try:
+        with get_connection(fail_silently=False) as connection:
+            for email, name, job_title in recipients:
+                try:
+                    sent += _interview_message(email, name, job_title, connection=connection).send()
+                except Exception as e:
+                    failed += 1
+                    logger.error("Failed to send interview email to %s: %s", email, e)
     except Exception as e:
-        logger.error(f"Failed to send email to {candidate_email}: {str(e)}")
+        # Opening or closing the connection failed; messages sent before that still count
+        logger.error("Failed to send interview emails: %s", e)
+    logger.info("Sent %s interview emails, %s failed", sent, failed)
+    return sent, failed
 
 def send_custom_email(candidate_email, candidate_name, subject, message):
     """Send a custom email to a candidate."""
@@ -252,6 +460,6 @@ def send_custom_email(candidate_email, candidate_name, subject, message):
             recipient_list=[candidate_email],
             fail_silently=False,
         )
-        logger.info(f"Custom email sent to {candidate_email}")
+        logger.info("Custom email sent to %s", candidate_email)
     except Exception as e:
-        logger.error(f"Failed to send custom email to {candidate_email}: {str(e)}")
\ No newline at end of file
+        logger.error("Failed to send custom email to %s: %s", candidate_email, e)
\ No newline at end of file
@@ -1,10 +1,18 @@
 from django.shortcuts import render, redirect
 
-from django.contrib.auth import authenticate, login, logout
+from django.contrib.auth import authenticate, aauthenticate, login, logout
 
 from django.contrib.auth.forms import UserCreationForm
 
-from django.core.files.storage import FileSystemStorage
+from django.core.files.storage import FileSystemStorage, default_storage
+
+from django.core.files import File
+
+from django.core.exceptions import SuspiciousFileOperation
+
+from django.views.decorators.csrf import csrf_exempt
+
+from django.views.decorators.http import require_POST, require_safe
 
 from django.contrib import messages
 
@@ -12,10 +20,22 @@ from django.contrib.auth.decorators import login_required
 
 import os
 
+import asyncio
+
+import base64
+
+import json
+
+import hashlib
+
+from asgiref.sync import sync_to_async
+
+
+from .models import Candidate, JobDescription
 
-from .models import Candidate
+from . import utils
 
-from .utils import summarize_jd, extract_cv_data, calculate_match_score, send_interview_email, send_custom_email
+from .utils import summarize_jd_from_text_async, extract_cv_data_from_text_async, extract_pdf_text, calculate_match_score, send_interview_email, stored_jd_summary, QuotaExceededError
 
 
 from django.conf import settings
@@ -24,6 +44,36 @@ from .models import UserProfile
 
 from django.contrib.auth.views import LoginView
 
+from django.contrib.admin.views.decorators import staff_member_required
+
+from django.http import JsonResponse, StreamingHttpResponse, HttpResponseBadRequest, Http404
+
+from django.core.handlers.asgi import ASGIRequest
+
+from django.utils.dateparse import parse_date
+
+from .llm_pool import get_gemini_pool
+
+from .llm_limits import get_llm_limiter, get_circuit_breaker, CircuitOpenError
+
+from .compaction import compaction_stats
+
+from .log_handlers import logging_stats
+
+from .skills import format_skills
+
+from .search import search_candidates
+
+from .downloads import serve_file
+
+from .exports import EXPORT_FORMATS, export_queryset, export_chunks, aexport_chunks
+
+from .idempotency import IdempotencyConflict, request_fingerprint, aclaim_key, acomplete_key, arelease_key
+
+from .dedup import MinHashLSH, minhash_signature, signature_to_bytes, afind_duplicate_candidate, aindex_candidate
+
+from .matching import askill_ids
+
 import logging
 
 
@@ -36,7 +86,7 @@ class CustomLoginView(LoginView):
 
     def form_invalid(self, form):
 
-        logger.error(f"Login failed: {form.errors}")
+        logger.error("Login failed: %s", form.errors)
 
         return super().form_invalid(form)
 
@@ -58,7 +108,7 @@ def register(request):
 
             messages.success(request, f'Account created for {username}! Please log in.')
 
-            return redirect('login')
+            return redirect('recruitment:login')
 
         else:
 
@@ -92,7 +142,7 @@ def user_login(request):
 
             login(request, user)
 
-            return redirect('upload')  # Redirect to upload page after login
+            return redirect('recruitment:upload')  # Redirect to upload page after login
 
         else:
 
@@ -108,14 +158,129 @@ def user_logout(request):
 
     messages.success(request, 'You have been logged out.')
 
-    return redirect('login')
+    return redirect('recruitment:login')
 
 
 
-@login_required
+def _read_cv(cv_file):
+    """Extract CV text and its MinHash signature (CPU-bound, run in a worker thread)."""
+    try:
+        cv_text = extract_pdf_text(cv_file)
+    except Exception as e:
+        logger.error("Error reading CV %s: %s", cv_file.name, e)
+        return "", None
+    return cv_text, minhash_signature(cv_text)
+
+async def _screen_cv(cv_file, cv_text, signature, jd_result, job_title):
+    """Extract, score and persist a single CV; returns a result row, a retryable error row, or None."""
+    try:
+        # Skip CVs already screened for this job under a slightly different file
+        if signature is not None:
+            duplicate = await afind_duplicate_candidate(signature, job_title)
+            if duplicate is not None:
+                logger.info("Skipping %s: near-duplicate of candidate %s", cv_file.name, duplicate.id)
+                return {
+                    'file': cv_file.name,
+                    'candidate_id': duplicate.id,
+                    'name': duplicate.name,
+                    'email': duplicate.email,
+                    'match_score': duplicate.match_score,
+                    'is_shortlisted': duplicate.is_shortlisted,
+                    'is_duplicate': True
+                }
+        
+        try:
+            cv_data = await extract_cv_data_from_text_async(cv_text)
+        except (QuotaExceededError, CircuitOpenError) as e:
+            logger.warning("Gemini unavailable for %s: %s", cv_file.name, e)
+            return {'file': cv_file.name, 'error': 'Gemini is temporarily unavailable', 'retryable': True}
+        logger.debug("CV data for %s: %s", cv_file.name, cv_data)
+        
+        if not cv_data or not cv_data.get('name') or not cv_data.get('email'):
+            logger.warning("Invalid CV data for %s", cv_file.name)
+            return None
+        
+        # Calculate match score
+        match_score = calculate_match_score(cv_data, jd_result)
+        logger.debug("Match score for %s: %s", cv_data['name'], match_score)
+        
+        # Save CV file (storage API is synchronous)
+        fs = FileSystemStorage(location=os.path.join(settings.MEDIA_ROOT, 'cvs'))
+        cv_filename = await sync_to_async(fs.save, thread_sensitive=False)(cv_file.name, cv_file)
+        
+        # Save candidate to database
+        candidate = await Candidate.objects.acreate(
+            name=cv_data['name'],
+            email=cv_data['email'],
+            cv_text=cv_text,
+            skills=format_skills(cv_data['skills']),
+            experience=cv_data.get('experience', 0.0),
+            education=cv_data.get('education', ''),
+            certifications=cv_data.get('certifications', ''),
+            cv_file=os.path.join('cvs', cv_filename),
+            job_title=job_title,
+            match_score=match_score,
+            is_shortlisted=match_score >= 70,  # Threshold for shortlisting
+            minhash=signature_to_bytes(signature) if signature is not None else None
+        )
+        if cv_data['skills']:
+            await candidate.normalized_skills.aset(await askill_ids(sorted(cv_data['skills'])))
+        if signature is not None:
+            await aindex_candidate(candidate, signature)
+        
+        # Send interview email if shortlisted (SMTP backend is synchronous)
+        if candidate.is_shortlisted:
+            try:
+                await sync_to_async(send_interview_email, thread_sensitive=False)(candidate.email, candidate.name, job_title)
+                logger.info("Interview email sent to %s", candidate.email)
+            except Exception as e:
+                logger.error("Failed to send interview email to %s: %s", candidate.email, e)
+        
+        return {
+            'file': cv_file.name,
+            'candidate_id': candidate.id,
+            'name': candidate.name,
+            'email': candidate.email,
+            'match_score': match_score,
+            'is_shortlisted': candidate.is_shortlisted,
+            'is_duplicate': False
+        }
+    
+    except Exception as e:
+        logger.error("Error processing CV %s: %s", cv_file.name, e)
+        return None
+
+async def _screen_batch(cv_files, jd_result, job_title):
+    """Screen a batch of CVs concurrently; returns one result row (or None on failure) per file.
+
+    Rows with a candidate_id were screened now or before; rows with
+    'retryable' failed only because Gemini was unavailable.
+    """
+    # Fingerprint CVs up front so near-duplicates never reach the LLM
+    cv_reads = await asyncio.gather(*(
+        sync_to_async(_read_cv, thread_sensitive=False)(cv_file) for cv_file in cv_files
+    ))
+    batch_index = MinHashLSH(settings.CV_DUPLICATE_THRESHOLD)
+    screenings = {}
+    results = [None] * len(cv_files)
+    for index, (cv_file, (cv_text, signature)) in enumerate(zip(cv_files, cv_reads)):
+        if signature is not None:
+            earlier = batch_index.query(signature)
+            if earlier:
+                logger.info("Skipping %s: near-duplicate within this upload", cv_file.name)
+                results[index] = {'file': cv_file.name, 'duplicate_of': cv_files[earlier[0]].name, 'is_duplicate': True}
+                continue
+            batch_index.add(index, signature)
+        screenings[index] = _screen_cv(cv_file, cv_text, signature, jd_result, job_title)
+    
+    # Process CVs concurrently; Gemini calls are bounded by the adaptive limiter
+    for index, result in zip(screenings, await asyncio.gather(*screenings.values())):
+        results[index] = result
+    return results
 
-def upload(request):
-    """Handle JD and CV uploads, process files, and shortlist candidates."""
+@login_required
+async def upload(request):
+    """Handle JD and CV uploads, process files concurrently, and shortlist candidates."""
     if request.method == 'POST':
         try:
             jd_file = request.FILES.get('jd_file')
@@ -130,68 +295,26 @@ def upload(request):
                 return render(request, 'recruitment/upload.html', {'error': 'Please upload at least one CV file'})
             
             # Process JD
-            jd_result = summarize_jd(jd_file)
-            logger.debug(f"JD result: {jd_result}")
+            jd_text = await sync_to_async(extract_pdf_text, thread_sensitive=False)(jd_file)
+            jd_result = await summarize_jd_from_text_async(jd_text)
+            logger.debug("JD result: %s", jd_result)
             
             if not jd_result or 'summary' not in jd_result or not jd_result.get('summary'):
                 logger.warning("Empty JD summary")
                 return render(request, 'recruitment/upload.html', {'error': 'Failed to process job description'})
             
             job_title = jd_result.get('job_title', 'Unknown Job Title')
-            jd_summary = jd_result.get('summary', '')
             
-            # Process CVs
-            candidates = []
-            for cv_file in cv_files:
-                try:
-                    cv_data = extract_cv_data(cv_file)
-                    logger.debug(f"CV data for {cv_file.name}: {cv_data}")
-                    
-                    if not cv_data or not cv_data.get('name') or not cv_data.get('email'):
-                        logger.warning(f"Invalid CV data for {cv_file.name}")
-                        continue
-                    
-                    # Calculate match score
-                    match_score = calculate_match_score(cv_data, jd_summary)
-                    logger.debug(f"Match score for {cv_data['name']}: {match_score}")
-                    
-                    # Save CV file
-                    fs = FileSystemStorage(location=os.path.join(settings.MEDIA_ROOT, 'cvs'))
-                    cv_filename = fs.save(cv_file.name, cv_file)
-                    
-                    # Save candidate to database
-                    candidate = Candidate(
-                        name=cv_data['name'],
-                        email=cv_data['email'],
-                        cv_file=os.path.join('cvs', cv_filename),
-                        job_title=job_title,
-                        match_score=match_score,
-                        is_shortlisted=match_score >= 70  # Threshold for shortlisting
-                    )
-                    candidate.save()
-                    
-                    # Send interview email if shortlisted
-                    if candidate.is_shortlisted:
-                        try:
-                            send_interview_email(candidate.email, candidate.name, job_title)
-                            logger.info(f"Interview email sent to {candidate.email}")
-                        except Exception as e:
-                            logger.error(f"Failed to send interview email to {candidate.email}: {str(e)}")
-                    
-                    candidates.append({
-                        'name': candidate.name,
-                        'email': candidate.email,
-                        'match_score': match_score,
-                        'is_shortlisted': candidate.is_shortlisted
-                    })
-                
-                except Exception as e:
-                    logger.error(f"Error processing CV {cv_file.name}: {str(e)}")
-                    continue
+            results = await _screen_batch(cv_files, jd_result, job_title)
+            candidates = [result for result in results if result is not None and 'candidate_id' in result]
             
             if not candidates:
                 logger.warning("No valid candidates processed")
-                return render(request, 'recruitment/upload.html', {'error': 'No valid CVs processed'})
+                if any(result is not None and result.get('retryable') for result in results):
+                    error = 'The AI service is temporarily unavailable, please try again in a minute'
+                else:
+                    error = 'No valid CVs processed'
+                return render(request, 'recruitment/upload.html', {'error': error})
             
             context = {
                 'job_title': job_title,
@@ -201,46 +324,325 @@ def upload(request):
             return render(request, 'recruitment/upload.html', context)
         
         except Exception as e:
-            logger.error(f"Error in upload view: {str(e)}")
+            logger.error("Error in upload view: %s", e)
             return render(request, 'recruitment/upload.html', {'error': 'An unexpected error occurred'})
     
     return render(request, 'recruitment/upload.html')
 
+def _api_error(message, status):
+    return JsonResponse({'error': message}, status=status)
+
+async def _api_user(request):
+    """Authenticate an API client from HTTP Basic credentials."""
+    scheme, _, encoded = request.headers.get('Authorization', '').partition(' ')
+    if scheme.lower() != 'basic' or not encoded:
+        return None
+    try:
+        username, _, password = base64.b64decode(encoded).decode('utf-8').partition(':')
+    except ValueError:
+        return None
+    user = await aauthenticate(request, username=username, password=password)
+    return user if user is not None and user.is_active else None
+
+def _api_payload(request):
+    """Read the JD reference and CV sources from a multipart form or a JSON body."""
+    if request.content_type == 'application/json':
+        data = json.loads(request.body or b'{}')
+        if not isinstance(data, dict):
+            raise ValueError('Request body must be a JSON object')
+        jd_id, jd_file, cv_files, cv_paths = data.get('job_description_id'), None, [], data.get('cv_paths') or []
+    else:
+        jd_id = request.POST.get('job_description_id')
+        jd_file = request.FILES.get('jd_file')
+        cv_files = request.FILES.getlist('cv_files')
+        cv_paths = request.POST.getlist('cv_paths')
+    if not isinstance(cv_paths, list) or not all(isinstance(path, str) for path in cv_paths):
+        raise ValueError('cv_paths must be a list of storage paths')
+    if jd_id not in (None, ''):
+        try:
+            jd_id = int(jd_id)
+        except (TypeError, ValueError):
+            raise ValueError('job_description_id must be an integer')
+    else:
+        jd_id = None
+    return jd_id, jd_file, cv_files, cv_paths
+
+def _open_stored_cvs(cv_paths):
+    """Open CVs already in media storage; missing files map to None."""
+    opened = []
+    for path in cv_paths:
+        if not default_storage.exists(path):
+            opened.append(None)
+            continue
+        opened.append(File(default_storage.open(path, 'rb'), name=path))
+    return opened
+
+def _payload_fingerprint(jd_id, jd_file, cv_files):
+    """Hash the JD reference and CV contents, so a reused idempotency key can be checked."""
+    parts = [f'jd:{jd_id}']
+    for upload in [jd_file, *cv_files]:
+        if upload is None:
+            parts.append('missing')
+            continue
+        digest = hashlib.sha256()
+        for chunk in upload.chunks():
+            digest.update(chunk)
+        parts.append(f'{upload.name}:{digest.hexdigest()}')
+    return request_fingerprint(parts)
+
+def _api_result(cv_name, row):
+    if row is None:
+        return {'file': cv_name, 'status': 'failed'}
+    if row.get('retryable'):
+        return {**row, 'status': 'failed'}
+    return {**row, 'status': 'duplicate' if row['is_duplicate'] else 'screened'}
+
+async def _run_screening_request(jd_description, jd_file, cv_names, cv_files):
+    """Resolve the JD and screen the CVs; returns (status code, response body)."""
+    if jd_description is None:
+        jd_text = await sync_to_async(extract_pdf_text, thread_sensitive=False)(jd_file)
+        jd_result = await summarize_jd_from_text_async(jd_text)
+        if not jd_result or not jd_result.get('summary'):
+            return 502, {'error': 'Failed to process job description'}
+        # Keep the summary so later batches can reference it by id without another LLM call
+        jd_description = await JobDescription.objects.acreate(
+            title=jd_result.get('job_title', 'Unknown Job Title'),
+            original_text=jd_text,
+            summary=jd_result['summary'],
+            required_skills=format_skills(jd_result.get('skills', set())),
+            required_experience=jd_result.get('required_experience', 0.0),
+            required_qualifications=jd_result.get('required_qualifications', ''),
+        )
+        if jd_result.get('must_have_skills'):
+            await jd_description.must_have_skills.aset(await askill_ids(sorted(jd_result['must_have_skills'])))
+    else:
+        jd_result = stored_jd_summary(jd_description)
+    
+    present = [index for index, cv_file in enumerate(cv_files) if cv_file is not None]
+    rows = await _screen_batch([cv_files[index] for index in present], jd_result, jd_description.title)
+    results = [{'file': name, 'status': 'failed', 'error': 'File not found'} for name in cv_names]
+    for index, row in zip(present, rows):
+        results[index] = _api_result(cv_names[index], row)
+    body = {
+        'job_description': {'id': jd_description.id, 'title': jd_description.title},
+        'results': results,
+    }
+    if any(row is not None and row.get('retryable') for row in rows):
+        # Not a final answer: the retry screens the rest, and CVs saved now come back as duplicates
+        return 503, {'error': 'Gemini is temporarily unavailable; retry with the same Idempotency-Key', **body}
+    return 200, body
+
+@csrf_exempt
+@require_POST
+async def api_screen(request):
+    """JSON batch screening API for ATS integrations.
+
+    Accepts a stored JD id or a JD upload plus CV uploads and/or media storage
+    paths, authenticated with HTTP Basic. A repeated Idempotency-Key header
+    replays the stored response without new LLM calls or emails.
+    """
+    user = await _api_user(request)
+    if user is None:
+        response = _api_error('Authentication required', 401)
+        response['WWW-Authenticate'] = 'Basic realm="api"'
+        return response
+    
+    key = request.headers.get('Idempotency-Key', '').strip()
+    if len(key) > 255:
+        return _api_error('Idempotency-Key must be at most 255 characters', 400)
+    try:
+        jd_id, jd_file, cv_uploads, cv_paths = _api_payload(request)
+    except ValueError as e:
+        return _api_error(str(e), 400)
+    if jd_id is None and jd_file is None:
+        return _api_error('Provide job_description_id or jd_file', 400)
+    if not cv_uploads and not cv_paths:
+        return _api_error('Provide cv_files or cv_paths', 400)
+    if len(cv_uploads) + len(cv_paths) > settings.SCREENING_API_MAX_CVS:
+        return _api_error(f'At most {settings.SCREENING_API_MAX_CVS} CVs per request', 400)
+    jd_description = None
+    if jd_id is not None:
+        jd_description = await JobDescription.objects.filter(pk=jd_id).afirst()
+        if jd_description is None:
+            return _api_error(f'Job description {jd_id} not found', 404)
+    
+    try:
+        stored_cvs = await sync_to_async(_open_stored_cvs, thread_sensitive=False)(cv_paths)
+    except SuspiciousFileOperation:
+        return _api_error('cv_paths must point inside media storage', 400)
+    cv_files = [*cv_uploads, *stored_cvs]
+    cv_names = [upload.name for upload in cv_uploads] + cv_paths
+    claimed = completed = False
+    try:
+        if key:
+            fingerprint = await sync_to_async(_payload_fingerprint, thread_sensitive=False)(
+                jd_id, jd_file, cv_files
+            )
+            try:
+                stored = await aclaim_key(user, key, fingerprint)
+            except IdempotencyConflict as e:
+                return _api_error(str(e), e.status_code)
+            if stored is not None:
+                response = JsonResponse(stored.response, status=stored.status_code)
+                response['Idempotent-Replayed'] = 'true'
+                return response
+            claimed = True
+        
+        try:
+            status, body = await _run_screening_request(jd_description, jd_file, cv_names, cv_files)
+        except Exception as e:
+            logger.error("Error in screening API request: %s", e)
+            status, body = 500, {'error': 'An unexpected error occurred'}
+        
+        if claimed and status == 200:
+            await acomplete_key(user, key, status, body)
+            completed = True
+        response = JsonResponse(body, status=status)
+        if status == 503:
+            response['Retry-After'] = str(settings.GEMINI_BREAKER_RESET_TIMEOUT)
+        return response
+    finally:
+        if claimed and not completed:
+            # Failures are not stored, so the client can retry with the same key. This also runs when
+            # the request is cancelled (an ASGI client disconnect), which `except Exception` never sees
+            await asyncio.shield(arelease_key(user, key))
+        for stored_cv in stored_cvs:
+            if stored_cv is not None:
+                stored_cv.close()
+
+@login_required
 def shortlisted_candidates(request):
     """Display shortlisted candidates."""
     try:
-        candidates = Candidate.objects.filter(is_shortlisted=True).order_by('-match_score')
+        candidates = Candidate.objects.filter(is_shortlisted=True).order_by('-match_score').only(
+            'id', 'name', 'email', 'match_score'
+        )
         context = {
             'candidates': candidates,
         }
         return render(request, 'recruitment/shortlisted.html', context)
     except Exception as e:
-        logger.error(f"Error in shortlisted_candidates view: {str(e)}")
+        logger.error("Error in shortlisted_candidates view: %s", e)
         return render(request, 'recruitment/shortlisted.html', {'error': 'Failed to load shortlisted candidates'})
 
+@login_required
+@require_safe
+def download_cv(request, candidate_id):
+    """Serve a candidate's CV to signed-in users, with caching validators, byte ranges and optional proxy offload."""
+    candidate = Candidate.objects.filter(pk=candidate_id).only('id', 'cv_file').first()
+    if candidate is None or not candidate.cv_file:
+        raise Http404("CV not found")
+    try:
+        return serve_file(request, candidate.cv_file.path, candidate.cv_file.name)
+    except (FileNotFoundError, SuspiciousFileOperation):
+        logger.warning("CV file for candidate %s is missing or outside MEDIA_ROOT", candidate_id)
+        raise Http404("CV not found")
+
+@login_required
+def candidate_search(request):
+    """Full-text search over past candidates, ranked and filtered by job title and score."""
+    query = request.GET.get('q', '').strip()
+    job_title = request.GET.get('job_title', '').strip()
+    context = {
+        'query': query,
+        'job_title': job_title,
+        'min_score': request.GET.get('min_score', ''),
+        'max_score': request.GET.get('max_score', ''),
+        'job_titles': Candidate.objects.order_by('job_title').values_list('job_title', flat=True).distinct(),
+    }
+    if not query:
+        return render(request, 'recruitment/search.html', context)
+    try:
+        min_score = float(context['min_score']) if context['min_score'] else None
+        max_score = float(context['max_score']) if context['max_score'] else None
+    except ValueError:
+        context['error'] = 'Scores must be numbers'
+        return render(request, 'recruitment/search.html', context)
+    try:
+        context['page'] = search_candidates(
+            query,
+            job_title=job_title or None,
+            min_score=min_score,
+            max_score=max_score,
+            page=request.GET.get('page', 1),
+        )
+    except Exception as e:
+        logger.error("Error in candidate_search view: %s", e)
+        context['error'] = 'Search failed'
+    return render(request, 'recruitment/search.html', context)
+
+def _query_date(request, name):
+    value = request.GET.get(name, '').strip()
+    if not value:
+        return None
+    parsed = parse_date(value)
+    if parsed is None:
+        raise ValueError(f"Invalid date: {value}")
+    return parsed
+
+@login_required
+def export_candidates(request, export_format):
+    """Stream candidates as CSV or JSONL, filtered by job title, creation date and shortlist status."""
+    if export_format not in EXPORT_FORMATS:
+        raise Http404(f"Unknown export format: {export_format}")
+    try:
+        since = _query_date(request, 'since')
+        until = _query_date(request, 'until')
+    except ValueError:
+        return HttpResponseBadRequest('Dates must be in YYYY-MM-DD format')
+    shortlisted = request.GET.get('shortlisted', '').lower()
+    queryset = export_queryset(
+        job_title=request.GET.get('job_title', '').strip() or None,
+        since=since,
+        until=until,
+        shortlisted={'1': True, 'true': True, '0': False, 'false': False}.get(shortlisted),
+    )
+    chunks = export_chunks(queryset, export_format)
+    if isinstance(request, ASGIRequest):
+        # A synchronous iterator would be read into memory in full before an ASGI response starts
+        chunks = aexport_chunks(chunks)
+    response = StreamingHttpResponse(chunks, content_type=EXPORT_FORMATS[export_format])
+    response['Content-Disposition'] = f'attachment; filename="candidates.{export_format}"'
+    return response
+
+@login_required
 def send_custom_email(request):
-    """Handle sending custom emails to candidates."""
+    """Handle sending custom emails to shortlisted candidates."""
+    candidates = Candidate.objects.filter(is_shortlisted=True).order_by('-match_score').only(
+        'id', 'name', 'email', 'match_score'
+    )
     if request.method == 'POST':
         try:
-            candidate_email = request.POST.get('candidate_email')
-            candidate_name = request.POST.get('candidate_name')
+            candidate_emails = request.POST.getlist('candidate_emails')
             subject = request.POST.get('subject')
             message = request.POST.get('message')
             
-            if not all([candidate_email, candidate_name, subject, message]):
+            if not all([candidate_emails, subject, message]):
                 logger.error("Missing required email fields")
                 messages.error(request, 'All fields are required')
-                return render(request, 'recruitment/send_email.html')
+                return render(request, 'recruitment/send_email.html', {'candidates': candidates})
             
-            send_custom_email(candidate_email, candidate_name, subject, message)
-            logger.info(f"Custom email sent to {candidate_email}")
+            recipients = candidates.filter(email__in=candidate_emails).values_list('email', 'name')
+            for candidate_email, candidate_name in recipients:
+                utils.send_custom_email(candidate_email, candidate_name, subject, message)
+                logger.info("Custom email sent to %s", candidate_email)
             messages.success(request, 'Email sent successfully')
-            return redirect('send_custom_email')
+            return redirect('recruitment:send_custom_email')
         
         except Exception as e:
-            logger.error(f"Error sending custom email: {str(e)}")
+            logger.error("Error sending custom email: %s", e)
             messages.error(request, 'Failed to send email')
-            return render(request, 'recruitment/send_email.html')
+            return render(request, 'recruitment/send_email.html', {'candidates': candidates})
     
-    return render(request, 'recruitment/send_email.html')
-
+    return render(request, 'recruitment/send_email.html', {'candidates': candidates})
+
+@staff_member_required
+def llm_status(request):
+    """Expose Gemini pool, concurrency limiter, circuit breaker, token savings and logging overhead for monitoring."""
+    return JsonResponse({
+        'circuit_breaker': get_circuit_breaker().state(),
+        'concurrency': get_llm_limiter().state(),
+        'keys': get_gemini_pool().stats(),
+        'prompt_compaction': compaction_stats(),
+        'logging': logging_stats(),
+    })
@@ -0,0 +1,142 @@
+import logging
+import threading
+import time
+
+from django.apps import apps
+from django.core.signals import request_finished, request_started
+from django.db import connections
+from django.template.loader import get_template
+from django.urls import get_resolver
+
+logger = logging.getLogger(__name__)
+
+WARMUP_TEMPLATES = (
+    'emails/interview_invitation.txt',
+    'emails/custom_email.txt',
+    'recruitment/login.html',
+    'recruitment/upload.html',
+    'recruitment/shortlisted.html',
+    'recruitment/send_email.html',
+    'recruitment/search.html',
+)
+
+
+def _import_sdks():
+    import google.ai.generativelanguage  # noqa: F401
+    import google.generativeai  # noqa: F401
+    import PyPDF2  # noqa: F401
+
+
+def _open_gemini_clients():
+    from .llm_pool import GeminiPool, get_gemini_pool
+
+    pool = get_gemini_pool()
+    if not isinstance(pool, GeminiPool):
+        return
+    for state in pool.keys:
+        state.client()  # gRPC channel setup
+
+
+def _compile_templates():
+    for name in WARMUP_TEMPLATES:
+        get_template(name)
+
+
+def _compile_patterns():
+    from .compaction import CV_SECTION_PRIORITY, JD_SECTION_PRIORITY, heading_patterns
+    from .dedup import minhash_signature
+    from .skills import get_skill_matcher
+    from .utils import clean_json_response
+
+    get_skill_matcher()
+    heading_patterns(CV_SECTION_PRIORITY)
+    heading_patterns(JD_SECTION_PRIORITY)
+    # Fill the re module cache for patterns compiled inline
+    clean_json_response('{"summary": "warm up"}')
+    minhash_signature('warm up')
+
+
+def _load_urls():
+    # Imports the views and their dependencies, which Django otherwise does on the first request
+    get_resolver().url_patterns
+
+
+def _open_connections():
+    for connection in connections.all():
+        connection.ensure_connection()
+
+
+def warm_up(database=True):
+    """Pay one-off startup costs before the first request.
+
+    Returns (step, seconds, error) tuples; a failing step is logged and skipped.
+    """
+    steps = [
+        ('import_sdks', _import_sdks),
+        ('gemini_clients', _open_gemini_clients),
+        ('compile_templates', _compile_templates),
+        ('compile_patterns', _compile_patterns),
+        ('load_urls', _load_urls),
+    ]
+    if database:
+        steps.append(('open_db_connections', _open_connections))
+    timings = []
+    for name, step in steps:
+        started = time.monotonic()
+        error = None
+        try:
+            step()
+        except Exception as e:
+            error = str(e)
+            logger.error("Warm-up step %s failed: %s", name, error)
+        timings.append((name, time.monotonic() - started, error))
+    total = sum(seconds for _, seconds, _ in timings)
+    logger.info(
+        "Warm-up finished in %.0f ms: %s",
+        total * 1000, ', '.join(f"{name} {seconds * 1000:.0f} ms" for name, seconds, _ in timings),
+    )
+    return timings
+
+
+def _background_warm_up():
+    apps.ready_event.wait()
+    try:
+        warm_up()
+    finally:
+        # Connections are per thread; this one only proved the database is reachable
+        connections.close_all()
+
+
+def start_background_warm_up():
+    """Warm up in a daemon thread so startup is not blocked."""
+    threading.Thread(target=_background_warm_up, name='recruitment-warmup', daemon=True).start()
+
+
+class FirstRequestTimer:
+    """Log how long after startup the first request arrived, and how long it took."""
+
+    def __init__(self, loading_started):
+        self.loading_started = loading_started
+        self.request_started = None
+        self._lock = threading.Lock()
+
+    def connect(self):
+        request_started.connect(self.on_request_started, dispatch_uid='recruitment_first_request_started', weak=False)
+        request_finished.connect(self.on_request_finished, dispatch_uid='recruitment_first_request_finished', weak=False)
+
+    def on_request_started(self, **kwargs):
+        with self._lock:
+            if self.request_started is None:
+                self.request_started = time.monotonic()
+        request_started.disconnect(dispatch_uid='recruitment_first_request_started')
+
+    def on_request_finished(self, **kwargs):
+        with self._lock:
+            if self.request_started is None:
+                return
+            started, self.request_started = self.request_started, None
+        request_finished.disconnect(dispatch_uid='recruitment_first_request_finished')
+        logger.info(
+            "First request served in %.0f ms, %.2f s after app loading started",
+            (time.monotonic() - started) * 1000, started - self.loading_started,
+        )
@@ -0,0 +1,16 @@
+"""
+Settings for servers started by `manage.py loadtest --serve`.
+
+The settings the command ran with (LOADTEST_BASE_SETTINGS), pointed at the
+throwaway database and media directory it created for the run.
+"""
+
+import json
+import os
+from importlib import import_module
+
+_base = import_module(os.environ.get('LOADTEST_BASE_SETTINGS', 'recruitment_system.settings'))
+globals().update({name: value for name, value in vars(_base).items() if name.isupper()})
+
+DATABASES = json.loads(os.environ['LOADTEST_DATABASES'])
+MEDIA_ROOT = os.environ['LOADTEST_MEDIA_ROOT']
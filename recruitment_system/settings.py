@@ -1,6 +1,6 @@
 
 from pathlib import Path
-from decouple import config
+from decouple import config, Csv
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -107,7 +107,7 @@ MEDIA_ROOT = BASE_DIR / 'media'
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # Email settings
-EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+EMAIL_BACKEND = config('EMAIL_BACKEND', default='django.core.mail.backends.smtp.EmailBackend')
 EMAIL_HOST = 'smtp.gmail.com'
 EMAIL_PORT = 587
 EMAIL_USE_TLS = True
@@ -118,6 +118,54 @@ DEFAULT_FROM_EMAIL = 'sahuaniket095@gmail.com'
 # Google API Key
 GOOGLE_API_KEY = config('GOOGLE_API_KEY')
 
+# Gemini key/model pool: comma-separated keys, models in preference order
+GOOGLE_API_KEYS = config('GOOGLE_API_KEYS', default=GOOGLE_API_KEY, cast=Csv())
+GEMINI_MODELS = config('GEMINI_MODELS', default='gemini-1.5-flash,gemini-1.5-pro', cast=Csv())
+GEMINI_KEY_REQUESTS_PER_MINUTE = config('GEMINI_KEY_REQUESTS_PER_MINUTE', default=15, cast=int)
+GEMINI_KEY_COOLDOWN = config('GEMINI_KEY_COOLDOWN', default=60, cast=int)
+# Seconds an invalid, revoked or unauthorized key stays out of rotation
+GEMINI_KEY_AUTH_COOLDOWN = config('GEMINI_KEY_AUTH_COOLDOWN', default=3600, cast=int)
+
+# Load testing: answer Gemini calls with canned responses after a simulated delay
+GEMINI_FAKE = config('GEMINI_FAKE', default=False, cast=bool)
+GEMINI_FAKE_LATENCY = config('GEMINI_FAKE_LATENCY', default=0.5, cast=float)
+
+# Warm up (SDK imports, Gemini clients, templates, regexes, DB) in a background
+# thread at startup; enable for server processes. No Gemini API calls are made.
+WARMUP_ON_STARTUP = config('WARMUP_ON_STARTUP', default=False, cast=bool)
+
+# Token budgets for document text in Gemini prompts (estimated locally)
+CV_PROMPT_TOKEN_BUDGET = config('CV_PROMPT_TOKEN_BUDGET', default=1000, cast=int)
+JD_PROMPT_TOKEN_BUDGET = config('JD_PROMPT_TOKEN_BUDGET', default=1000, cast=int)
+
+# Estimated Jaccard similarity above which two CVs count as the same candidate
+CV_DUPLICATE_THRESHOLD = config('CV_DUPLICATE_THRESHOLD', default=0.8, cast=float)
+
+# Adaptive (AIMD) limit on in-flight Gemini calls per process
+GEMINI_INITIAL_CONCURRENCY = config('GEMINI_INITIAL_CONCURRENCY', default=4, cast=int)
+GEMINI_MIN_CONCURRENCY = config('GEMINI_MIN_CONCURRENCY', default=1, cast=int)
+GEMINI_MAX_CONCURRENCY = config('GEMINI_MAX_CONCURRENCY', default=32, cast=int)
+GEMINI_LATENCY_TARGET = config('GEMINI_LATENCY_TARGET', default=10.0, cast=float)  # Seconds
+
+# Circuit breaker for Gemini calls
+GEMINI_BREAKER_ERROR_RATE = config('GEMINI_BREAKER_ERROR_RATE', default=0.5, cast=float)
+GEMINI_BREAKER_MIN_CALLS = config('GEMINI_BREAKER_MIN_CALLS', default=10, cast=int)
+GEMINI_BREAKER_WINDOW = config('GEMINI_BREAKER_WINDOW', default=50, cast=int)
+GEMINI_BREAKER_RESET_TIMEOUT = config('GEMINI_BREAKER_RESET_TIMEOUT', default=30, cast=int)
+
+# Batch screening API: CVs per request, and seconds before an unfinished
+# idempotency key is treated as abandoned and may be retried
+SCREENING_API_MAX_CVS = config('SCREENING_API_MAX_CVS', default=100, cast=int)
+SCREENING_IDEMPOTENCY_LOCK_TIMEOUT = config('SCREENING_IDEMPOTENCY_LOCK_TIMEOUT', default=900, cast=int)
+
+# CV downloads: '' streams files from Django; 'x-accel-redirect' (nginx, with an
+# internal location at CV_DOWNLOAD_ACCEL_PREFIX aliased to MEDIA_ROOT) or
+# 'x-sendfile' (Apache mod_xsendfile, lighttpd) lets the proxy send the bytes
+CV_DOWNLOAD_OFFLOAD = config('CV_DOWNLOAD_OFFLOAD', default='')
+CV_DOWNLOAD_ACCEL_PREFIX = config('CV_DOWNLOAD_ACCEL_PREFIX', default='/protected-media/')
+CV_DOWNLOAD_MAX_AGE = config('CV_DOWNLOAD_MAX_AGE', default=3600, cast=int)
+
+
 # Authentication settings
 LOGIN_URL = '/login/'
 LOGIN_REDIRECT_URL = '/'
@@ -126,32 +174,58 @@ LOGIN_REDIRECT_URL = '/'
 DATA_UPLOAD_MAX_NUMBER_FILES = 500
 
 # Logging configuration
+# Records go through a queue to a background writer thread. LOG_PROFILE
+# 'production' writes JSON lines at INFO and never logs SQL; 'development'
+# writes plain text at DEBUG, with SQL queries only if LOG_SQL is set.
+# LOG_DEBUG_SAMPLE_RATES keeps a share of DEBUG records per logger, e.g.
+# 'recruitment.utils=0.01,recruitment.views=0.1'.
+LOG_PROFILE = config('LOG_PROFILE', default='development' if DEBUG else 'production')
+LOG_LEVEL = config('LOG_LEVEL', default='DEBUG' if LOG_PROFILE == 'development' else 'INFO')
+LOG_SQL = LOG_PROFILE == 'development' and config('LOG_SQL', default=False, cast=bool)
+LOG_DEBUG_SAMPLE_RATES = config('LOG_DEBUG_SAMPLE_RATES', default='')
+
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
+    'formatters': {
+        'plain': {
+            'format': '%(asctime)s %(levelname)s %(name)s: %(message)s',
+        },
+        'json': {
+            '()': 'recruitment.log_handlers.JSONFormatter',
+        },
+    },
+    'filters': {
+        'sample_debug': {
+            '()': 'recruitment.log_handlers.SamplingFilter',
+            'rates': LOG_DEBUG_SAMPLE_RATES,
+        },
+    },
     'handlers': {
-        'console': {
-            'class': 'logging.StreamHandler',
+        'queue': {
+            'class': 'recruitment.log_handlers.QueueStreamHandler',
+            'formatter': 'json' if LOG_PROFILE == 'production' else 'plain',
+            'filters': ['sample_debug'],
         },
     },
     'root': {
-        'handlers': ['console'],
-        'level': 'DEBUG',
+        'handlers': ['queue'],
+        'level': 'WARNING',
     },
     'loggers': {
         'django': {
-            'handlers': ['console'],
-            'level': 'DEBUG',
-            'propagate': True,
+            'handlers': ['queue'],
+            'level': 'INFO' if LOG_PROFILE == 'development' else 'WARNING',
+            'propagate': False,
         },
-        'recruitment': {
-            'handlers': ['console'],
-            'level': 'DEBUG',
+        'django.db.backends': {
+            'handlers': ['queue'],
+            'level': 'DEBUG' if LOG_SQL else 'WARNING',
             'propagate': False,
         },
-        'recruitment.utils': {
-            'handlers': ['console'],
-            'level': 'DEBUG',
+        'recruitment': {
+            'handlers': ['queue'],
+            'level': LOG_LEVEL,
             'propagate': False,
         },
     },